@@ -0,0 +1,113 @@
+import random
+
+from dfa.dfa import DFA
+from nfa.nfa import NFA
+
+EPSILON = 'ε'
+
+
+def _alphabet(size):
+    return [chr(ord('a') + i) for i in range(size)] if size <= 26 else [f"s{i}" for i in range(size)]
+
+
+def random_nfa(n_states, alphabet_size=2, density=1.5, epsilon_ratio=0.1,
+               final_ratio=0.2, seed=None):
+    """Random NFA with ``density`` expected targets per (state, symbol).
+
+    ``epsilon_ratio`` is the expected number of ε-edges per state, as a
+    fraction of ``density``.
+    """
+    rng = random.Random(seed)
+    states = [f"q{i}" for i in range(n_states)]
+    alphabet = _alphabet(alphabet_size)
+    transition = {}
+    for state in states:
+        moves = {}
+        for symbol in alphabet + [EPSILON]:
+            mean = density * epsilon_ratio if symbol == EPSILON else density
+            k = min(n_states, int(mean) + (rng.random() < mean - int(mean)))
+            if k:
+                moves[symbol] = set(rng.sample(states, k))
+        transition[state] = moves
+    finals = {s for s in states if rng.random() < final_ratio} or {states[-1]}
+    return NFA(set(states), set(alphabet), transition, states[0], finals)
+
+
+def random_dfa(n_states, alphabet_size=2, completeness=1.0, final_ratio=0.2, seed=None):
+    """Random DFA where each (state, symbol) has a target with probability ``completeness``."""
+    rng = random.Random(seed)
+    states = [f"q{i}" for i in range(n_states)]
+    alphabet = _alphabet(alphabet_size)
+    transition = {
+        state: {sym: rng.choice(states) for sym in alphabet if rng.random() < completeness}
+        for state in states
+    }
+    finals = {s for s in states if rng.random() < final_ratio} or {states[-1]}
+    return DFA(set(states), set(alphabet), transition, states[0], finals)
+
+
+def nth_from_last(n):
+    """NFA for "the n-th symbol from the end is 'a'" over {a, b}.
+
+    ``n + 1`` states; its minimal DFA has ``2 ** n`` states.
+    """
+    states = [f"q{i}" for i in range(n + 1)]
+    transition = {states[0]: {'a': {states[0], states[1]}, 'b': {states[0]}}}
+    for i in range(1, n):
+        transition[states[i]] = {'a': {states[i + 1]}, 'b': {states[i + 1]}}
+    transition[states[n]] = {}
+    return NFA(set(states), {'a', 'b'}, transition, states[0], {states[n]})
+
+
+def epsilon_chain(n):
+    """``n`` states linked by ε in a chain, each looping on its own symbol.
+
+    Every closure walks the remaining chain, which stresses ε-closure work.
+    """
+    states = [f"e{i}" for i in range(n)]
+    alphabet = _alphabet(min(n, 26))
+    transition = {}
+    for i, state in enumerate(states):
+        moves = {alphabet[i % len(alphabet)]: {state}}
+        if i + 1 < n:
+            moves[EPSILON] = {states[i + 1]}
+        transition[state] = moves
+    return NFA(set(states), set(alphabet), transition, states[0], {states[-1]})
+
+
+def nondet_cycle(n):
+    """Cycle of ``n`` states where 'a' may stay or advance and 'b' advances.
+
+    Reachable subsets grow to every non-empty arc of the cycle.
+    """
+    states = [f"c{i}" for i in range(n)]
+    transition = {
+        state: {'a': {state, states[(i + 1) % n]}, 'b': {states[(i + 1) % n]}}
+        for i, state in enumerate(states)
+    }
+    return NFA(set(states), {'a', 'b'}, transition, states[0], {states[0]})
+
+
+def random_strings(alphabet, count, length, seed=None):
+    """``count`` uniform random strings of exactly ``length`` symbols."""
+    rng = random.Random(seed)
+    symbols = sorted(s for s in alphabet if s != EPSILON)
+    return ["".join(rng.choice(symbols) for _ in range(length)) for _ in range(count)]
+
+
+def to_json(automaton):
+    """JSON document (as accepted by ``dfa.loader``) describing ``automaton``."""
+    transition = {
+        state: {
+            sym: sorted(tgt) if isinstance(tgt, (set, frozenset)) else [tgt]
+            for sym, tgt in moves.items()
+        }
+        for state, moves in automaton.transition.items()
+    }
+    return {
+        "states": sorted(automaton.states),
+        "alphabet": sorted(automaton.alphabet),
+        "transition": transition,
+        "start_state": automaton.start_state,
+        "final_states": sorted(automaton.final_states),
+    }
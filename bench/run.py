@@ -0,0 +1,144 @@
+"""Benchmark suite: ``python -m bench.run [--quick] [--output F] [--baseline F]``.
+
+Each case is timed as the best of ``--repeat`` runs and re-run once under
+``tracemalloc`` for peak memory. Results are written as JSON; with
+``--baseline`` any case slower than the baseline by more than
+``--threshold`` (a fraction) is reported and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench import generators
+from dfa.from_nfa import nfa_to_dfa
+from dfa.loader import clear_cache, load_automaton
+from dfa.regex import regex_to_nfa
+from dfa.search import search
+
+
+def build_cases(scale, workdir):
+    """Return ``[(name, fn)]``; ``fn()`` runs one measured iteration."""
+    cases = []
+
+    def nfa_cases(name, nfa):
+        cases.append((f"nfa_to_dfa/{name}", lambda: nfa_to_dfa(nfa)))
+
+    n = 10 + 2 * scale
+    nfa_cases(f"nth_from_last_{n}", generators.nth_from_last(n))
+    nfa_cases(f"epsilon_chain_{60 * scale}", generators.epsilon_chain(60 * scale))
+    nfa_cases(f"nondet_cycle_{8 + scale}", generators.nondet_cycle(8 + scale))
+    nfa_cases(
+        f"random_nfa_{25 * scale}",
+        generators.random_nfa(25 * scale, alphabet_size=3, density=1.2,
+                              epsilon_ratio=0.2, seed=1)
+    )
+
+    nfa = generators.random_nfa(40 * scale, alphabet_size=2, density=1.5,
+                                epsilon_ratio=0.1, seed=2)
+    nfa_strings = generators.random_strings(nfa.alphabet, 200, 50 * scale, seed=3)
+    cases.append(("nfa_accepts/random", lambda: [nfa.accepts(s) for s in nfa_strings]))
+
+    dfa = generators.random_dfa(1000 * scale, alphabet_size=4, seed=4)
+    dfa.compile()
+    dfa_strings = generators.random_strings(dfa.alphabet, 2000, 100 * scale, seed=5)
+    cases.append(("dfa_accepts/random", lambda: [dfa.accepts(s) for s in dfa_strings]))
+
+    # Every "a" is a match and the (a|b)*c branch stays alive to the end of
+    # the text: anchored scans that ran until the DFA died were quadratic here
+    live = regex_to_nfa("(a|b)*c|a", alphabet="abc")
+    live_text = "ab" * (2000 * scale)
+    cases.append((f"search/live_run_{len(live_text)}", lambda: search(live, live_text)))
+
+    big = generators.random_dfa(5000 * scale, alphabet_size=8, seed=6)
+    path = os.path.join(workdir, "big_dfa.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generators.to_json(big), f)
+
+    def load():
+        clear_cache()
+        return load_automaton(path)
+    cases.append(("load/random_dfa", load))
+
+    if shutil.which("dot"):
+        from dfa.visualize import visualize_dfa
+        small = generators.random_dfa(30, alphabet_size=3, seed=7)
+        out = os.path.join(workdir, "graph")
+        cases.append(("visualize/random_dfa_30",
+                      lambda: visualize_dfa(small, filename=out, large=False)))
+    return cases
+
+
+def measure(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def compare(results, baseline, threshold):
+    """Return ``[(name, old, new)]`` for cases slower than ``old * (1 + threshold)``."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old and result["seconds"] > old["seconds"] * (1 + threshold):
+            regressions.append((name, old["seconds"], result["seconds"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="automata-tool benchmarks")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against a previous results JSON")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown vs baseline (fraction, default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="automata-bench-") as workdir:
+        for name, fn in build_cases(1 if args.quick else 3, workdir):
+            if args.filter not in name:
+                continue
+            results[name] = r = measure(fn, args.repeat)
+            print(f"{name:40s} {r['seconds'] * 1000:10.2f} ms "
+                  f"{r['peak_bytes'] / 1024:10.0f} KiB")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new in regressions:
+            print(f"[REGRESSION] {name}: {old * 1000:.2f} ms → {new * 1000:.2f} ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import multiprocessing
+from itertools import islice
+from multiprocessing import shared_memory
+
+from dfa.compiled import CompiledDFA
+
+# Per-worker compiled DFA attached to the parent's shared memory block
+_worker_dfa = None
+_worker_shm = None
+
+
+def share_compiled(compiled):
+    """Copy the transition table and accept bitmap into one shared memory block.
+
+    Returns ``(shm, spec)`` where ``spec`` is the small, picklable description
+    a worker needs to attach to the block (see ``attach_compiled``).
+    """
+    table_bytes = len(compiled.table) * compiled.table.itemsize
+    size = max(table_bytes + len(compiled.accept_bitmap), 1)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    shm.buf[:table_bytes] = compiled.table.tobytes()
+    shm.buf[table_bytes:table_bytes + len(compiled.accept_bitmap)] = compiled.accept_bitmap
+    spec = {
+        "name": shm.name,
+        "state_names": compiled.state_names,
+        "symbols": compiled.symbols,
+        "table_bytes": table_bytes,
+        "bitmap_bytes": len(compiled.accept_bitmap),
+    }
+    return shm, spec
+
+
+def attach_compiled(spec):
+    """Rebuild a ``CompiledDFA`` whose table is a view on shared memory."""
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    end = spec["table_bytes"]
+    table = shm.buf[:end].cast("i")
+    bitmap = shm.buf[end:end + spec["bitmap_bytes"]]
+    return shm, CompiledDFA(spec["state_names"], spec["symbols"], table, bitmap)
+
+
+def _init_worker(spec):
+    global _worker_dfa, _worker_shm
+    _worker_shm, _worker_dfa = attach_compiled(spec)
+
+
+def evaluate_shard(compiled, start, strings):
+    """Return ``[(index, accepted, error)]`` for one shard of inputs."""
+    accepted, invalid = compiled.accepts_many(strings, return_invalid=True)
+    results = []
+    for offset, s in enumerate(strings):
+        error = None
+        ok = bool(accepted[offset])
+        if invalid[offset]:
+            # Re-run the row to keep DFA.accepts semantics and its message
+            try:
+                ok = compiled.accepts(s)
+            except ValueError as e:
+                ok, error = False, str(e)
+        results.append((start + offset, ok, error))
+    return results
+
+
+def _run_shard(task):
+    start, strings = task
+    return evaluate_shard(_worker_dfa, start, strings)
+
+
+def _shards(strings, shard_size):
+    it = iter(strings)
+    start = 0
+    while True:
+        shard = list(islice(it, shard_size))
+        if not shard:
+            return
+        yield start, shard
+        start += len(shard)
+
+
+def evaluate_batch(dfa, strings, workers=None, shard_size=10000):
+    """Yield ``(index, accepted, error)`` for every input string, in order.
+
+    Inputs are split into shards of ``shard_size`` and scored by a process
+    pool. The compiled transition table lives in shared memory that every
+    worker maps once, so only the input strings travel per task.
+    ``dfa`` may also be a ``CompiledDFA`` (e.g. from ``dfa.store``).
+    """
+    if isinstance(dfa, CompiledDFA):
+        compiled = dfa
+    else:
+        compiled = dfa._compiled or dfa.compile()
+    workers = workers or multiprocessing.cpu_count()
+    if workers <= 1:
+        for start, shard in _shards(strings, shard_size):
+            yield from evaluate_shard(compiled, start, shard)
+        return
+
+    shm, spec = share_compiled(compiled)
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(spec,)) as pool:
+            for results in pool.imap(_run_shard, _shards(strings, shard_size)):
+                yield from results
+    finally:
+        shm.close()
+        shm.unlink()
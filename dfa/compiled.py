@@ -0,0 +1,317 @@
+from array import array
+
+from dfa.symbols import CharClass, SymbolClasses, has_ranges, is_char_label
+
+
+class CompiledDFA:
+    """Integer-indexed form of a DFA used for fast matching.
+
+    States are numbered 0..n-1 (the start state is always 0), symbols map to
+    table columns, and transitions live in one flat ``array('i')`` where
+    ``table[state * n_symbols + column]`` is the next state id, or -1 when the
+    original DFA has no transition (treated as reject, like ``DFA.accepts``).
+    Accepting states are kept in a packed little-endian bitmap.
+
+    When the DFA has range labels (``dfa.symbols.CharClass``), columns are
+    alphabet equivalence classes instead of symbols: ``symbols[column]`` is
+    the class label, ``classes`` maps input symbols to columns, and classes
+    whose columns are identical in every state share one column.
+    """
+
+    MISSING = -1
+    # accepts_many: rows longer than this run through the scalar loop
+    LONG_ROW = 4096
+
+    def __init__(self, state_names, symbols, table, accept_bitmap, classes=None):
+        self.state_names = state_names                  # List[state id] = state name
+        self.state_index = {s: i for i, s in enumerate(state_names)}
+        self.symbols = symbols                          # List[column] = symbol or class label
+        self.symbol_index = {sym: i for i, sym in enumerate(symbols)}
+        if classes is None and has_ranges(symbols):
+            classes = SymbolClasses(symbols)
+        self.classes = classes                          # SymbolClasses, or None without ranges
+        self.table = table                              # array('i'), row-major
+        self.accept_bitmap = accept_bitmap              # bytearray, 1 bit per state
+        self.n_states = len(state_names)
+        self.n_symbols = len(symbols)
+        self.start = 0
+
+    @classmethod
+    def from_dfa(cls, dfa):
+        """Build the compact form of ``dfa``."""
+        names = [dfa.start_state]
+        seen = {dfa.start_state}
+
+        def add(state):
+            if state not in seen:
+                seen.add(state)
+                names.append(state)
+
+        for state in sorted(dfa.states, key=str):
+            add(state)
+        for src in sorted(dfa.transition, key=str):
+            add(src)
+            for sym in sorted(dfa.transition[src], key=str):
+                add(dfa.transition[src][sym])
+
+        index = {s: i for i, s in enumerate(names)}
+        accept_bitmap = bytearray((len(names) + 7) // 8)
+        for state in dfa.final_states:
+            if state in index:
+                i = index[state]
+                accept_bitmap[i >> 3] |= 1 << (i & 7)
+
+        labels = set(dfa.alphabet)
+        for moves in dfa.transition.values():
+            labels.update(moves)
+        if has_ranges(labels):
+            return cls._from_ranged(dfa, names, index, labels, accept_bitmap)
+
+        symbols = sorted(dfa.alphabet, key=str)
+        columns = {sym: i for i, sym in enumerate(symbols)}
+        n_symbols = len(symbols)
+
+        table = array('i', [cls.MISSING]) * (len(names) * n_symbols)
+        for src, moves in dfa.transition.items():
+            base = index[src] * n_symbols
+            for sym, dst in moves.items():
+                if sym in columns:
+                    table[base + columns[sym]] = index[dst]
+
+        return cls(names, symbols, table, accept_bitmap)
+
+    @classmethod
+    def _from_ranged(cls, dfa, names, index, labels, accept_bitmap):
+        """Tabulate over the minimal symbol classes of ``labels``."""
+        classes = SymbolClasses.from_labels(labels)
+        width = classes.n_classes
+        table = array('i', [cls.MISSING]) * (len(names) * width)
+        for src, moves in dfa.transition.items():
+            base = index[src] * width
+            for label, dst in moves.items():
+                for cid in classes.by_label[label]:
+                    if table[base + cid] not in (cls.MISSING, index[dst]):
+                        raise ValueError(
+                            f"State '{src}' has overlapping transitions on '{label}'."
+                        )
+                    table[base + cid] = index[dst]
+
+        # Character classes with identical columns share one merged column
+        groups = {}
+        for cid in range(width):
+            column = tuple(table[cid::width])
+            key = column if is_char_label(classes.members[cid]) else (cid,)
+            groups.setdefault(key, []).append(cid)
+        merged = sorted(groups.values(), key=lambda cids: str(classes.members[cids[0]]))
+        symbols = [CharClass.union(classes.members[c] for c in cids)
+                   if is_char_label(classes.members[cids[0]]) else classes.members[cids[0]]
+                   for cids in merged]
+        n_symbols = len(symbols)
+        compact = array('i', [cls.MISSING]) * (len(names) * n_symbols)
+        for col, cids in enumerate(merged):
+            compact[col::n_symbols] = table[cids[0]::width]
+        return cls(names, symbols, compact, accept_bitmap, SymbolClasses(symbols))
+
+    def to_dfa(self):
+        """Rebuild a ``DFA`` (sharing this table as its compiled form)."""
+        from dfa.dfa import DFA
+
+        names = self.state_names
+        symbols = self.symbols
+        table = self.table
+        width = self.n_symbols
+        transition = {}
+        for i, name in enumerate(names):
+            row = table[i * width:(i + 1) * width]
+            transition[name] = {
+                symbols[col]: names[dst] for col, dst in enumerate(row) if dst >= 0
+            }
+        dfa = DFA(
+            states=set(names),
+            alphabet=set(symbols),
+            transition=transition,
+            start_state=names[self.start],
+            final_states={names[i] for i in range(self.n_states) if self.is_accepting(i)}
+        )
+        dfa._compiled = self
+        return dfa
+
+    def is_accepting(self, state_id):
+        """Return True if the integer state id is accepting."""
+        return bool(self.accept_bitmap[state_id >> 3] >> (state_id & 7) & 1)
+
+    def column(self, symbol):
+        """Return the table column for an input symbol, or None if not in the alphabet."""
+        col = self.symbol_index.get(symbol)
+        if col is None and self.classes is not None:
+            col = self.classes.classify(symbol)
+        return col
+
+    def step(self, state_id, symbol):
+        """Return the next state id, or -1 if there is no transition."""
+        col = self.column(symbol)
+        if col is None:
+            raise ValueError(f"Symbol '{symbol}' not in DFA alphabet.")
+        return self.table[state_id * self.n_symbols + col]
+
+    def accepts(self, input_string):
+        """Return True if the compiled DFA accepts the given string."""
+        table = self.table
+        columns = self.symbol_index
+        width = self.n_symbols
+        state = self.start
+        for symbol in input_string:
+            col = columns.get(symbol)
+            if col is None:
+                col = self.column(symbol)
+                if col is None:
+                    raise ValueError(f"Symbol '{symbol}' not in DFA alphabet.")
+            state = table[state * width + col]
+            if state < 0:
+                return False
+        return bool(self.accept_bitmap[state >> 3] >> (state & 7) & 1)
+
+    def accepts_many(self, strings, invalid="reject", return_invalid=False,
+                     batch_size=65536):
+        """Vectorized acceptance test over a batch of strings.
+
+        Each batch is sorted by length and split into groups whose lengths
+        are within a factor of two; a group is encoded into a padded
+        (rows x max_len) matrix of symbol columns, so padding never exceeds
+        the input itself, and at step ``t`` only the prefix of still-running
+        rows is advanced with one fancy-indexing lookup into the transition
+        table. Rows longer than ``LONG_ROW`` take the scalar loop instead.
+        Returns a NumPy boolean array.
+
+        Rows containing a symbol outside the alphabet are rejected, or raise
+        ``ValueError`` when ``invalid="raise"``. With ``return_invalid=True``
+        the per-row invalid mask is returned as a second array.
+        """
+        import numpy as np
+
+        if invalid not in ("reject", "raise"):
+            raise ValueError("invalid must be 'reject' or 'raise'")
+        strings = list(strings)
+        n = len(strings)
+        accepted = np.zeros(n, dtype=bool)
+        bad = np.zeros(n, dtype=bool)
+
+        dead = self.n_states                    # absorbing row for missing/invalid
+        bad_col = self.n_symbols                # column for out-of-alphabet symbols
+        table = np.full((self.n_states + 1, self.n_symbols + 1), dead, dtype=np.int32)
+        if self.n_symbols:
+            flat = np.frombuffer(self.table, dtype=np.int32).reshape(
+                self.n_states, self.n_symbols
+            )
+            table[:-1, :-1] = np.where(flat < 0, dead, flat)
+        accept = np.zeros(self.n_states + 1, dtype=bool)
+        accept[:-1] = np.unpackbits(
+            np.frombuffer(bytes(self.accept_bitmap), dtype=np.uint8),
+            bitorder="little"
+        )[:self.n_states].astype(bool)
+
+        # Sorted code points of single-character symbols -> column lookup,
+        # closed by a sentinel above any valid code point. With symbol
+        # classes the keys are interval starts and a code point maps to the
+        # interval it falls in.
+        if self.classes is not None:
+            keys = np.array(self.classes.starts, dtype=np.uint32)
+            cols = np.array([bad_col if c < 0 else c for c in self.classes.ids],
+                            dtype=np.int32)
+        else:
+            single = sorted((ord(sym), col) for sym, col in self.symbol_index.items()
+                            if len(sym) == 1)
+            single.append((0xFFFFFFFF, bad_col))
+            keys = np.array([c for c, _ in single], dtype=np.uint32)
+            cols = np.array([col for _, col in single], dtype=np.int32)
+
+        long_rows = [i for i, s in enumerate(strings) if len(s) > self.LONG_ROW]
+        for i in long_rows:
+            accepted[i], bad[i] = self._accepts_row(strings[i])
+        if long_rows:
+            skip = set(long_rows)
+            index = np.array([i for i in range(n) if i not in skip], dtype=np.int64)
+        else:
+            index = np.arange(n)
+
+        for lo in range(0, len(index), batch_size):
+            rows_index = index[lo:lo + batch_size]
+            chunk = [strings[i] for i in rows_index]
+            m = len(chunk)
+            lengths = np.fromiter((len(s) for s in chunk), dtype=np.int64, count=m)
+            order = np.argsort(-lengths, kind="stable")
+            lengths = lengths[order]
+
+            codes = np.frombuffer(
+                "".join(chunk[i] for i in order).encode("utf-32-le"),
+                dtype=np.uint32
+            )
+            if self.classes is not None:
+                pos = np.searchsorted(keys, codes, side="right") - 1
+                symbol_cols = np.where(pos >= 0, cols[np.maximum(pos, 0)], bad_col)
+                found = symbol_cols != bad_col
+            else:
+                pos = np.searchsorted(keys, codes)
+                found = keys[pos] == codes
+                symbol_cols = np.where(found, cols[pos], bad_col)
+
+            ends = np.cumsum(lengths)
+            result = np.zeros(m, dtype=bool)
+            row_bad = np.zeros(m, dtype=bool)
+            first = 0
+            while first < m:
+                # Rows first..last-1 are longer than half of row ``first``
+                if lengths[first]:
+                    last = int(np.searchsorted(-lengths, -(lengths[first] // 2), side="left"))
+                else:
+                    last = m
+                begin = int(ends[first - 1]) if first else 0
+                end = int(ends[last - 1])
+                result[first:last], row_bad[first:last] = self._run_group(
+                    table, accept, bad_col, lengths[first:last],
+                    symbol_cols[begin:end], found[begin:end]
+                )
+                first = last
+
+            accepted[rows_index[order]] = result
+            bad[rows_index[order]] = row_bad
+
+        if invalid == "raise" and bad.any():
+            i = int(np.argmax(bad))
+            raise ValueError(f"String {i} contains a symbol not in DFA alphabet.")
+        if return_invalid:
+            return accepted, bad
+        return accepted
+
+    @staticmethod
+    def _run_group(table, accept, bad_col, lengths, symbol_cols, found):
+        """Advance rows sorted by decreasing ``lengths`` through one padded matrix."""
+        import numpy as np
+
+        m = len(lengths)
+        max_len = int(lengths[0])
+        rows = np.repeat(np.arange(m), lengths)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        positions = np.arange(len(symbol_cols)) - np.repeat(offsets, lengths)
+        matrix = np.full((m, max_len), bad_col, dtype=np.int32)
+        matrix[rows, positions] = symbol_cols
+
+        row_bad = np.zeros(m, dtype=bool)
+        row_bad[rows[~found]] = True
+
+        # Rows are sorted by decreasing length: active rows form a prefix
+        active = np.searchsorted(-lengths, -np.arange(1, max_len + 1), side="right")
+        state = np.zeros(m, dtype=np.int32)
+        for t in range(max_len):
+            k = active[t]
+            state[:k] = table[state[:k], matrix[:k, t]]
+        return accept[state] & ~row_bad, row_bad
+
+    def _accepts_row(self, input_string):
+        """Scalar ``(accepted, invalid)`` for one row, as ``accepts_many`` reports it."""
+        try:
+            if self.accepts(input_string):
+                return True, False
+        except ValueError:
+            return False, True
+        return False, any(self.column(sym) is None for sym in set(input_string))
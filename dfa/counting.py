@@ -0,0 +1,216 @@
+import heapq
+import random
+from itertools import count
+
+from dfa.symbols import CharClass
+
+
+class LanguageCounter:
+    """Count, enumerate and sample the strings a DFA accepts, by length.
+
+    Works on the compiled table restricted to live states (reachable from
+    the start and able to reach an accepting state), so dead branches are
+    never explored. ``counts[k][s]`` is the number of strings of length
+    ``k`` accepted from state ``s``; rows are built on demand by dynamic
+    programming over the table, O(k·transitions) big-int additions, and
+    kept for later calls. A column with a range label (``CharClass``)
+    weighs as many symbols as the class holds.
+    """
+
+    def __init__(self, dfa):
+        compiled = dfa._compiled or dfa.compile()
+        self.compiled = compiled
+        width = compiled.n_symbols
+        table = compiled.table
+        labels = compiled.symbols
+        self.weights = [label.size() if isinstance(label, CharClass) else 1 for label in labels]
+
+        successors = [[] for _ in range(compiled.n_states)]
+        predecessors = [[] for _ in range(compiled.n_states)]
+        for s in range(compiled.n_states):
+            for col in range(width):
+                t = table[s * width + col]
+                if t >= 0:
+                    successors[s].append((col, t))
+                    predecessors[t].append(s)
+        reachable = self._closure([compiled.start], successors, forward=True)
+        accepting = [s for s in range(compiled.n_states) if compiled.is_accepting(s)]
+        useful = self._closure(accepting, predecessors, forward=False)
+        self.live = reachable & useful
+
+        # moves[s] = [(column, target)] in symbol order, live targets only
+        order = sorted(range(width), key=lambda col: str(labels[col]))
+        rank = {col: i for i, col in enumerate(order)}
+        self.moves = {
+            s: sorted(((col, t) for col, t in successors[s] if t in self.live),
+                      key=lambda move: rank[move[0]])
+            for s in self.live
+        }
+        # edges[s] = [(target, number of symbols)] for counting
+        self.edges = {}
+        for s, moves in self.moves.items():
+            weight = {}
+            for col, t in moves:
+                weight[t] = weight.get(t, 0) + self.weights[col]
+            self.edges[s] = list(weight.items())
+        # Count rows are lists over all state ids (0 for states that are not
+        # live); single-symbol edges are summed with one C-level map call
+        self._plan = []
+        for s, edges in self.edges.items():
+            single = [t for t, weight in edges if weight == 1]
+            weighted = [(t, weight) for t, weight in edges if weight != 1]
+            self._plan.append((s, single, weighted))
+        self.counts = [[int(s in self.live and compiled.is_accepting(s))
+                        for s in range(compiled.n_states)]]
+        self.finite = self._acyclic()
+
+    @staticmethod
+    def _closure(roots, adjacent, forward):
+        seen = set(roots)
+        stack = list(roots)
+        while stack:
+            state = stack.pop()
+            for item in adjacent[state]:
+                nxt = item[1] if forward else item
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+
+    def _acyclic(self):
+        """Return True if the live part has no cycle, i.e. the language is finite."""
+        indegree = {s: 0 for s in self.live}
+        for s in self.live:
+            for t, _ in self.edges[s]:
+                indegree[t] += 1
+        ready = [s for s, d in indegree.items() if d == 0]
+        removed = 0
+        while ready:
+            s = ready.pop()
+            removed += 1
+            for t, _ in self.edges[s]:
+                indegree[t] -= 1
+                if indegree[t] == 0:
+                    ready.append(t)
+        return removed == len(self.live)
+
+    def _extend(self, length):
+        counts = self.counts
+        n = self.compiled.n_states
+        while len(counts) <= length:
+            previous = counts[-1]
+            get = previous.__getitem__
+            row = [0] * n
+            for s, single, weighted in self._plan:
+                total = sum(map(get, single))
+                for t, weight in weighted:
+                    total += weight * previous[t]
+                row[s] = total
+            counts.append(row)
+
+    def count(self, length, up_to=False):
+        """Number of accepted strings of exactly ``length`` (or ``<= length``) symbols."""
+        if length < 0:
+            raise ValueError("length must be non-negative")
+        start = self.compiled.start
+        if start not in self.live:
+            return 0
+        self._extend(length)
+        if up_to:
+            return sum(row[start] for row in self.counts[:length + 1])
+        return self.counts[length][start]
+
+    def _symbol(self, col, index):
+        """The ``index``-th symbol of column ``col``, in symbol order."""
+        label = self.compiled.symbols[col]
+        if not isinstance(label, CharClass):
+            return label
+        for lo, hi in label.intervals:
+            if index <= hi - lo:
+                return chr(lo + index)
+            index -= hi - lo + 1
+        raise IndexError(index)
+
+    def _column_moves(self, col, target):
+        label = self.compiled.symbols[col]
+        if not isinstance(label, CharClass):
+            yield label, target
+            return
+        for lo, hi in label.intervals:
+            for c in range(lo, hi + 1):
+                yield chr(c), target
+
+    def _ordered(self, state, remaining):
+        """Yield ``(symbol, target)`` in symbol order for targets that can still
+        accept in exactly ``remaining - 1`` more symbols."""
+        after = self.counts[remaining - 1]
+        streams = [self._column_moves(col, t) for col, t in self.moves[state] if after[t]]
+        if len(streams) == 1:
+            return streams[0]
+        return heapq.merge(*streams, key=lambda move: str(move[0]))
+
+    def _of_length(self, length):
+        start = self.compiled.start
+        if not self.counts[length][start]:
+            return
+        if length == 0:
+            yield ""
+            return
+        path = []
+        stack = [self._ordered(start, length)]
+        while stack:
+            move = next(stack[-1], None)
+            if move is None:
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+            symbol, target = move
+            path.append(symbol)
+            remaining = length - len(path)
+            if remaining == 0:
+                yield "".join(path)
+                path.pop()
+            else:
+                stack.append(self._ordered(target, remaining))
+
+    def enumerate(self, max_length=None):
+        """Yield accepted strings in shortlex order (by length, then symbol order).
+
+        Infinite languages need ``max_length`` to terminate; a finite
+        language ends on its own, as no accepted string is longer than the
+        number of live states.
+        """
+        if self.compiled.start not in self.live:
+            return
+        for length in count():
+            if max_length is not None and length > max_length:
+                return
+            if self.finite and length >= len(self.live):
+                return
+            self._extend(length)
+            yield from self._of_length(length)
+
+    def sample(self, length, rng=None):
+        """Return an accepted string of ``length`` symbols drawn uniformly, or None.
+
+        Each symbol is chosen with probability proportional to the number of
+        accepted completions through it, using exact big-int arithmetic.
+        """
+        rng = rng or random
+        start = self.compiled.start
+        if self.count(length) == 0:
+            return None
+        state = start
+        path = []
+        for remaining in range(length, 0, -1):
+            after = self.counts[remaining - 1]
+            pick = rng.randrange(self.counts[remaining][state])
+            for col, target in self.moves[state]:
+                block = self.weights[col] * after[target]
+                if pick < block:
+                    path.append(self._symbol(col, pick // after[target]))
+                    state = target
+                    break
+                pick -= block
+        return "".join(path)
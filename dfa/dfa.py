@@ -1,3 +1,6 @@
+from dfa.compiled import CompiledDFA
+
+
 class DFA:
     def __init__(self, states, alphabet, transition, start_state, final_states):
         self.states = states                          # Set of states
@@ -5,13 +8,58 @@ class DFA:
         self.transition = transition                  # Dict[state][symbol] = next_state
         self.start_state = start_state
         self.final_states = final_states
+        self._compiled = None
+        self._counter = None
+
+    def compile(self):
+        """Build (and cache) the integer-indexed form used by ``accepts``.
+
+        Call again after mutating ``transition``/``final_states`` in place to
+        refresh the cached table.
+        """
+        self._compiled = CompiledDFA.from_dfa(self)
+        self._counter = None
+        return self._compiled
+
+    def minimize(self):
+        """Return an equivalent DFA with unreachable and equivalent states removed."""
+        from dfa.minimize import minimize_dfa
+        return minimize_dfa(self)
+
+    def accepts(self, input_string, stats=None):
+        compiled = self._compiled or self.compile()
+        if stats is None:
+            return compiled.accepts(input_string)
+        with stats.phase("dfa match"):
+            result = compiled.accepts(input_string)
+        stats.count("dfa_strings")
+        stats.count("dfa_symbols", len(input_string))
+        return result
+
+    def accepts_many(self, strings, **kwargs):
+        """Test a batch of strings at once; returns a NumPy boolean array."""
+        compiled = self._compiled or self.compile()
+        return compiled.accepts_many(strings, **kwargs)
+
+    def _language(self):
+        from dfa.counting import LanguageCounter
+        compiled = self._compiled or self.compile()
+        if self._counter is None or self._counter.compiled is not compiled:
+            self._counter = LanguageCounter(self)
+        return self._counter
+
+    def count_accepted(self, length, up_to=False):
+        """Number of accepted strings of length ``length`` (all lengths ``<= length``
+        with ``up_to=True``), as an exact int."""
+        return self._language().count(length, up_to)
+
+    def enumerate_accepted(self, max_length=None):
+        """Lazily yield accepted strings in shortlex order, up to ``max_length``."""
+        return self._language().enumerate(max_length)
+
+    def sample_accepted(self, length, rng=None):
+        """Return a uniformly random accepted string of ``length`` symbols, or None.
 
-    def accepts(self, input_string):
-        current_state = self.start_state
-        for symbol in input_string:
-            if symbol not in self.alphabet:
-                raise ValueError(f"Symbol '{symbol}' not in DFA alphabet.")
-            if current_state not in self.transition or symbol not in self.transition[current_state]:
-                return False
-            current_state = self.transition[current_state][symbol]
-        return current_state in self.final_states
+        ``rng`` is a ``random.Random`` (default: the ``random`` module).
+        """
+        return self._language().sample(length, rng)
@@ -0,0 +1,244 @@
+from collections import deque
+
+from dfa.dfa import DFA
+from dfa.symbols import SymbolClasses, has_ranges
+from nfa.bitset import BitsetNFA
+from nfa.nfa import NFA
+
+
+def _find(parent, x):
+    root = x
+    while parent[root] != root:
+        root = parent[root]
+    while parent[x] != root:                            # path compression
+        parent[x], x = root, parent[x]
+    return root
+
+
+def _path(parents, node):
+    symbols = []
+    while parents[node] is not None:
+        node, symbol = parents[node]
+        symbols.append(symbol)
+    return "".join(reversed(symbols))
+
+
+def _step_symbols(labels, alphabet=None):
+    """One concrete symbol per joint class of ``labels``, in a stable order.
+
+    Without range labels these are the labels themselves. With them, the
+    labels of every operand are split into joint ``SymbolClasses`` and each
+    class is stepped once on its smallest character, so engines whose
+    labels cut the alphabet differently still read the same symbols. With
+    ``alphabet`` only the classes it covers are kept.
+    """
+    labels = set(labels)
+    if alphabet is not None:
+        labels |= set(alphabet)
+    if not has_ranges(labels):
+        return sorted(alphabet if alphabet is not None else labels, key=str)
+    joint = SymbolClasses.from_labels(labels)
+    wanted = None if alphabet is None else set(alphabet)
+    return [joint.representative(cid) for cid in range(joint.n_classes)
+            if wanted is None or wanted.intersection(joint.covering[cid])]
+
+
+def dfa_counterexample(left, right):
+    """Return a shortest string accepted by exactly one DFA, or None if equivalent.
+
+    Hopcroft–Karp: state pairs are explored breadth-first from the start
+    pair and merged in a union-find over the disjoint union of both state
+    sets, so each state is merged at most once and the check is near-linear
+    in the total number of states times the alphabet size. Missing
+    transitions and symbols outside a DFA's alphabet go to a shared
+    rejecting sink, matching ``DFA.accepts``. With range labels the pairs
+    are stepped once per joint symbol class and the witness uses each
+    class's smallest character.
+    """
+    a = left._compiled or left.compile()
+    b = right._compiled or right.compile()
+    offset = a.n_states
+    sink = a.n_states + b.n_states
+    symbols = _step_symbols(list(a.symbols) + list(b.symbols))
+    cols_a = [a.column(sym) for sym in symbols]
+    cols_b = [b.column(sym) for sym in symbols]
+
+    def accepting(x):
+        if x == sink:
+            return False
+        return a.is_accepting(x) if x < offset else b.is_accepting(x - offset)
+
+    def successor(x, i):
+        if x == sink:
+            return sink
+        if x < offset:
+            col = cols_a[i]
+            nxt = -1 if col is None else a.table[x * a.n_symbols + col]
+            return sink if nxt < 0 else nxt
+        col = cols_b[i]
+        nxt = -1 if col is None else b.table[(x - offset) * b.n_symbols + col]
+        return sink if nxt < 0 else nxt + offset
+
+    parent = list(range(sink + 1))
+    start = (a.start, b.start + offset)
+    parents = {start: None}
+    queue = deque([start])
+    parent[_find(parent, start[0])] = _find(parent, start[1])
+    while queue:
+        pair = queue.popleft()
+        p, q = pair
+        if accepting(p) != accepting(q):
+            return _path(parents, pair)
+        for i, symbol in enumerate(symbols):
+            np, nq = successor(p, i), successor(q, i)
+            rp, rq = _find(parent, np), _find(parent, nq)
+            if rp != rq:
+                parent[rp] = rq
+                nxt = (np, nq)
+                parents[nxt] = (pair, symbol)
+                queue.append(nxt)
+    return None
+
+
+def dfa_equivalent(left, right):
+    """Return True if both DFAs accept the same language."""
+    return dfa_counterexample(left, right) is None
+
+
+def _bitset(automaton):
+    if isinstance(automaton, BitsetNFA):
+        return automaton
+    if isinstance(automaton, DFA):
+        automaton = NFA(
+            states=set(automaton.states),
+            alphabet=set(automaton.alphabet),
+            transition={
+                s: {sym: {dst} for sym, dst in moves.items()}
+                for s, moves in automaton.transition.items()
+            },
+            start_state=automaton.start_state,
+            final_states=set(automaton.final_states)
+        )
+    return BitsetNFA.from_nfa(automaton)
+
+
+def _bits(mask):
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        yield low.bit_length() - 1
+
+
+class _Antichain:
+    """Per key, the ⊆-minimal bitmasks seen so far."""
+
+    def __init__(self):
+        self.sets = {}
+
+    def add(self, key, mask):
+        """Insert ``mask`` unless a subset of it is present; return True if inserted."""
+        kept = self.sets.setdefault(key, [])
+        for other in kept:
+            if other & mask == other:
+                return False
+        kept[:] = [other for other in kept if other & mask != mask]
+        kept.append(mask)
+        return True
+
+
+def _successor(engine, mask, symbol):
+    row = engine.successors.get(symbol)
+    if row is None and engine.classes is not None:
+        cid = engine.classes.classify(symbol)
+        if cid is not None:
+            row = engine.successors[engine.symbols[cid]]
+    if row is None:
+        return 0
+    result = 0
+    for i in _bits(mask):
+        result |= row[i]
+    return result
+
+
+def inclusion_counterexample(left, right):
+    """Return a string in L(left) but not in L(right), or None if L(left) ⊆ L(right).
+
+    Works on NFAs (or DFAs) without determinizing ``left`` or ``right``.
+    The search runs over pairs (left state, ε-closed right subset) and keeps
+    only ⊆-minimal right subsets per left state (antichain pruning): if
+    (p, S) cannot reach a counterexample, nor can (p, S') for S ⊆ S'. The
+    witness is found breadth-first but pruning may skip the very shortest
+    one.
+    """
+    a = _bitset(left)
+    b = _bitset(right)
+    symbols = _step_symbols(list(a.symbols) + list(b.symbols))
+    antichain = _Antichain()
+    parents = {}
+    queue = deque()
+    for p in _bits(a.initial()):
+        node = (p, b.initial())
+        if antichain.add(p, node[1]):
+            parents[node] = None
+            queue.append(node)
+    while queue:
+        node = queue.popleft()
+        p, s = node
+        if a.final_mask >> p & 1 and not b.is_accepting(s):
+            return _path(parents, node)
+        for symbol in symbols:
+            targets = _successor(a, 1 << p, symbol)
+            if not targets:
+                continue
+            t = _successor(b, s, symbol)
+            for q in _bits(targets):
+                nxt = (q, t)
+                if nxt not in parents and antichain.add(q, t):
+                    parents[nxt] = (node, symbol)
+                    queue.append(nxt)
+    return None
+
+
+def is_included(left, right):
+    """Return True if every string accepted by ``left`` is accepted by ``right``."""
+    return inclusion_counterexample(left, right) is None
+
+
+def universality_counterexample(automaton, alphabet=None):
+    """Return a string over ``alphabet`` the automaton rejects, or None if universal.
+
+    Explores ε-closed subsets breadth-first, keeping only ⊆-minimal ones:
+    a smaller subset rejects whatever a larger one rejects.
+    """
+    engine = _bitset(automaton)
+    symbols = _step_symbols(engine.symbols, alphabet)
+    antichain = _Antichain()
+    start = engine.initial()
+    parents = {start: None}
+    antichain.add(None, start)
+    queue = deque([start])
+    while queue:
+        s = queue.popleft()
+        if not engine.is_accepting(s):
+            return _path(parents, s)
+        for symbol in symbols:
+            t = _successor(engine, s, symbol)
+            if t not in parents and antichain.add(None, t):
+                parents[t] = (s, symbol)
+                queue.append(t)
+    return None
+
+
+def is_universal(automaton, alphabet=None):
+    """Return True if the automaton accepts every string over ``alphabet``."""
+    return universality_counterexample(automaton, alphabet) is None
+
+
+def equivalent(left, right):
+    """Language equivalence for any mix of DFAs and NFAs.
+
+    Two DFAs use Hopcroft–Karp; otherwise inclusion is checked both ways.
+    """
+    if isinstance(left, DFA) and isinstance(right, DFA):
+        return dfa_equivalent(left, right)
+    return is_included(left, right) and is_included(right, left)
@@ -1,85 +1,361 @@
+import sys
+import time
+from collections import namedtuple
+
 from dfa.dfa import DFA
+from dfa.stats import no_phase
+from dfa.symbols import CharClass, SymbolClasses, has_ranges, is_char_label
+from nfa.reduce import reduce_nfa
 
+# Part of the compiled-cache key (dfa.store): bump it whenever nfa_to_dfa
+# can produce a different DFA for the same NFA and options
+CONVERTER_VERSION = 1
 
-def epsilon_closure(nfa, states):
-    """Compute the ε-closure for a set of NFA states."""
-    closure = set(states)
-    stack = list(states)
+# Snapshot passed to progress callbacks and attached to ConversionAborted
+ConversionProgress = namedtuple("ConversionProgress", "subsets frontier elapsed")
 
-    while stack:
-        state = stack.pop()
-        for next_state in nfa.transition.get(state, {}).get('ε', set()):
-            if next_state not in closure:
-                closure.add(next_state)
-                stack.append(next_state)
-    return closure
 
+class ConversionAborted(Exception):
+    """Raised when ``nfa_to_dfa`` stops early because of a budget or cancellation.
 
-def move(nfa, states, symbol):
-    """Move from a set of states on a given symbol."""
-    result = set()
-    for state in states:
-        result.update(nfa.transition.get(state, {}).get(symbol, set()))
-    return result
+    ``reason`` is one of ``"states"``, ``"memory"``, ``"time"`` or
+    ``"cancelled"``; ``progress`` is the ``ConversionProgress`` reached.
+    """
 
+    def __init__(self, reason, progress):
+        self.reason = reason
+        self.progress = progress
+        super().__init__(
+            f"NFA → DFA conversion aborted ({reason}) after {progress.subsets} subsets, "
+            f"{progress.frontier} pending, {progress.elapsed:.2f}s"
+        )
 
-def nfa_to_dfa(nfa):
-    """Convert NFA (with optional ε-transitions) to DFA."""
-    start_closure = epsilon_closure(nfa, {nfa.start_state})
-    unmarked = [frozenset(start_closure)]
-    dfa_states = set()
-    dfa_transitions = {}
-    dfa_final_states = set()
-    state_map = {}  # frozenset → state name
-    state_count = 0
 
-    dead_state = "DEAD"
-    dead_needed = False
+def _state_universe(nfa):
+    """Declared states plus every transition source and target, on any symbol."""
+    states = set(nfa.states) | set(nfa.transition) | {nfa.start_state}
+    for trans in nfa.transition.values():
+        for targets in trans.values():
+            states.update(targets)
+    return states
 
-    while unmarked:
-        current = unmarked.pop()
-        if current not in state_map:
-            state_map[current] = f"S{state_count}"
-            state_count += 1
 
-        current_name = state_map[current]
-        dfa_states.add(current_name)
-        dfa_transitions[current_name] = {}
+def epsilon_closure_table(nfa):
+    """Precompute the ε-closure of every NFA state.
 
-        for symbol in nfa.alphabet:
-            if symbol == 'ε':
-                continue  # DFA cannot have ε transitions
+    ε-cycles are collapsed into strongly connected components (iterative
+    Tarjan), so each component's closure is computed once, as its members
+    plus the closures of the components it reaches. Tarjan emits components
+    in reverse topological order, so successors are always ready.
+    """
+    states = _state_universe(nfa)
 
-            move_set = move(nfa, current, symbol)
-            closure_set = epsilon_closure(nfa, move_set)
+    def successors(state):
+        return nfa.transition.get(state, {}).get('ε', ())
 
-            if not closure_set:
-                dfa_transitions[current_name][symbol] = dead_state
-                dead_needed = True
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    component_of = {}
+    closures = []                                     # closure per component id
+    counter = 0
+
+    for root in states:
+        if root in index:
+            continue
+        work = [(root, iter(successors(root)))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            state, it = work[-1]
+            advanced = False
+            for nxt in it:
+                if nxt not in index:
+                    index[nxt] = lowlink[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(successors(nxt))))
+                    advanced = True
+                    break
+                if nxt in on_stack:
+                    lowlink[state] = min(lowlink[state], index[nxt])
+            if advanced:
                 continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[state])
+            if lowlink[state] == index[state]:
+                members = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    members.add(member)
+                    if member == state:
+                        break
+                comp = len(closures)
+                closure = set(members)
+                for member in members:
+                    for nxt in successors(member):
+                        other = component_of.get(nxt)
+                        if other is not None:
+                            closure |= closures[other]
+                closure = frozenset(closure)
+                closures.append(closure)
+                for member in members:
+                    component_of[member] = comp
+
+    return {state: closures[comp] for state, comp in component_of.items()}
+
+
+def symbol_columns(nfa):
+    """Group the NFA's symbols into the columns subset construction runs over.
+
+    The units are the symbols of the alphabet or, when transitions use range
+    labels (``dfa.symbols.CharClass``), the minimal alphabet equivalence
+    classes of all labels. Units on which every NFA state has the same
+    targets are merged into one column, so each subset is stepped once per
+    column instead of once per symbol. Returns ``(labels, outputs)``: per
+    column, the NFA labels whose targets it follows and the DFA transition
+    labels it is written out as.
+    """
+    labels = {s for s in nfa.alphabet if s != 'ε'}
+    for moves in nfa.transition.values():
+        labels.update(s for s in moves if s != 'ε')
+    ranged = has_ranges(labels)
+    if ranged:
+        classes = SymbolClasses.from_labels(labels)
+        units = list(zip(classes.covering, classes.members))
+        by_label = classes.by_label
+    else:
+        symbols = sorted((s for s in nfa.alphabet if s != 'ε'), key=str)
+        units = [((sym,), sym) for sym in symbols]
+        by_label = {sym: [u] for u, sym in enumerate(symbols)}
+
+    signatures = [[] for _ in units]
+    for state, moves in nfa.transition.items():
+        reached = {}
+        for label, targets in moves.items():
+            if targets:
+                for u in by_label.get(label, ()):
+                    reached.setdefault(u, set()).update(targets)
+        for u, targets in reached.items():
+            signatures[u].append((state, frozenset(targets)))
+    groups = {}
+    for u, signature in enumerate(signatures):
+        groups.setdefault(frozenset(signature), []).append(u)
 
-            closure_frozen = frozenset(closure_set)
-            if closure_frozen not in state_map:
-                state_map[closure_frozen] = f"S{state_count}"
-                unmarked.append(closure_frozen)
-                state_count += 1
-
-            target_name = state_map[closure_frozen]
-            dfa_transitions[current_name][symbol] = target_name
-
-    # Final states: if any NFA final state is in the DFA subset
-    for subset, name in state_map.items():
-        if any(s in nfa.final_states for s in subset):
-            dfa_final_states.add(name)
-
-    if dead_needed:
-        dfa_states.add(dead_state)
-        dfa_transitions[dead_state] = {sym: dead_state for sym in nfa.alphabet if sym != 'ε'}
-
-    return DFA(
-        states=dfa_states,
-        alphabet={s for s in nfa.alphabet if s != 'ε'},
-        transition=dfa_transitions,
-        start_state=state_map[frozenset(start_closure)],
-        final_states=dfa_final_states
+    column_labels, column_outputs = [], []
+    for members in groups.values():
+        column_labels.append(units[members[0]][0])
+        outputs = [units[u][1] for u in members]
+        if ranged:
+            chars = [label for label in outputs if is_char_label(label)]
+            outputs = [label for label in outputs if not is_char_label(label)]
+            if chars:
+                outputs.append(CharClass.union(chars))
+        column_outputs.append(outputs)
+    return column_labels, column_outputs
+
+
+def nfa_to_dfa(nfa, minimize=False, reduce=False, keep_subsets=False,
+               max_states=None, max_memory=None, max_seconds=None,
+               progress=None, progress_every=1000, cancel=None, stats=None):
+    """Convert NFA (with optional ε-transitions) to DFA.
+
+    Construction can be bounded: ``max_states`` caps discovered subsets,
+    ``max_memory`` caps the estimated bytes held by the subset tables and
+    ``max_seconds`` caps wall time. ``cancel`` is any object with an
+    ``is_set()`` method (e.g. ``threading.Event``). Exceeding a budget or
+    cancelling raises ``ConversionAborted``. ``progress`` is called with a
+    ``ConversionProgress`` every ``progress_every`` expanded subsets.
+
+    Subset construction runs on integer NFA state ids: every subset is one
+    int bitmask, interned once in a mask → DFA-state-id table. With
+    ``keep_subsets=True`` the result carries ``dfa.subsets`` (DFA state name
+    → frozenset of NFA state names); otherwise the masks are dropped as
+    soon as construction finishes.
+
+    With ``reduce=True`` the NFA first goes through ``nfa.reduce.reduce_nfa``
+    (ε-removal, trimming, bisimulation merging). With ``minimize=True`` the
+    subset automaton is passed through Hopcroft minimization before it is
+    returned.
+
+    ``stats`` (a ``dfa.stats.Stats``) collects subset, closure and step-cache
+    counters, the NFA size before and after reduction and the states each
+    reduction pass removed, plus per-phase timings; without it no
+    bookkeeping is done.
+    """
+    started = time.monotonic()
+    phase = stats.phase if stats is not None else no_phase
+    if reduce:
+        with phase("reduce"):
+            before = len(set(nfa.states) | set(nfa.transition))
+            nfa, report = reduce_nfa(nfa)
+        if stats is not None:
+            stats.count("reduced_states_before", before)
+            stats.count("reduced_states_after", len(nfa.states))
+            for name, removed in report:
+                stats.count(f"reduce_{name.replace('-', '_')}_removed", removed)
+    with phase("closure table"):
+        closure_of = epsilon_closure_table(nfa)
+    with phase("symbol classes"):
+        column_labels, column_outputs = symbol_columns(nfa)  # DFA cannot have ε transitions
+
+    dfa = _subset_construction(
+        nfa, closure_of, column_labels, column_outputs, keep_subsets,
+        max_states, max_memory, max_seconds, progress, progress_every, cancel,
+        stats, phase, started
     )
+    if minimize:
+        with phase("minimize"):
+            dfa = dfa.minimize()
+    return dfa
+
+
+def _subset_construction(nfa, closure_of, column_labels, column_outputs, keep_subsets,
+                         max_states, max_memory, max_seconds, progress, progress_every,
+                         cancel, stats, phase, started):
+    """Subset construction for ``nfa_to_dfa``; its tables are freed on return."""
+    n_columns = len(column_labels)
+
+    # Integer ids for NFA states; closures become bitmasks
+    names = sorted(_state_universe(nfa), key=str)
+    index = {s: i for i, s in enumerate(names)}
+    closure_mask = []
+    for s in names:
+        mask = 0
+        for member in closure_of[s]:
+            mask |= 1 << index[member]
+        closure_mask.append(mask)
+    final_mask = 0
+    for s in nfa.final_states:
+        if s in index:
+            final_mask |= 1 << index[s]
+
+    # step_cache[col][state id] → ε-closed successor mask, filled on first use
+    step_cache = [[None] * len(names) for _ in range(n_columns)]
+
+    def step(state_id, col):
+        result = step_cache[col][state_id]
+        if result is None:
+            result = 0
+            moves = nfa.transition.get(names[state_id], {})
+            for label in column_labels[col]:
+                for target in moves.get(label, ()):
+                    result |= closure_mask[index[target]]
+            step_cache[col][state_id] = result
+        return result
+
+    start_mask = closure_mask[index[nfa.start_state]]
+    subset_ids = {start_mask: 0}                       # interned subset mask → DFA state id
+    subsets = [start_mask]                             # DFA state id → subset mask
+    rows = [None]                                      # DFA state id → list of target ids
+    unmarked = [0]
+    dead_needed = False
+    row_bytes = sys.getsizeof([None] * n_columns) + 100  # row + interning entry
+    memory_used = sys.getsizeof(start_mask) + row_bytes
+    expanded = 0
+    member_steps = 0                                   # (subset, member) pairs stepped
+
+    def snapshot():
+        return ConversionProgress(len(subsets), len(unmarked), time.monotonic() - started)
+
+    with phase("subset construction"):
+        while unmarked:
+            if cancel is not None and cancel.is_set():
+                raise ConversionAborted("cancelled", snapshot())
+            if max_seconds is not None and time.monotonic() - started > max_seconds:
+                raise ConversionAborted("time", snapshot())
+            if progress is not None and expanded % progress_every == 0:
+                progress(snapshot())
+            expanded += 1
+
+            current = unmarked.pop()
+            mask = subsets[current]
+            members = []
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                members.append(low.bit_length() - 1)
+
+            row = [None] * n_columns
+            for col in range(n_columns):
+                target = 0
+                for state_id in members:
+                    target |= step(state_id, col)
+
+                if not target:
+                    dead_needed = True                     # None marks the DEAD state
+                    continue
+
+                target_id = subset_ids.get(target)
+                if target_id is None:
+                    target_id = len(subsets)
+                    subset_ids[target] = target_id
+                    subsets.append(target)
+                    rows.append(None)
+                    unmarked.append(target_id)
+                    memory_used += sys.getsizeof(target) + row_bytes
+                    if max_states is not None and len(subsets) > max_states:
+                        raise ConversionAborted("states", snapshot())
+                    if max_memory is not None and memory_used > max_memory:
+                        raise ConversionAborted("memory", snapshot())
+                row[col] = target_id
+            rows[current] = row
+            member_steps += len(members)
+    if progress is not None:
+        progress(snapshot())
+
+    with phase("build DFA"):
+        dead_state = "DEAD"
+        state_names = [f"S{i}" for i in range(len(subsets))]
+        dfa_transitions = {
+            state_names[i]: {
+                sym: dead_state if target is None else state_names[target]
+                for outputs, target in zip(column_outputs, row)
+                for sym in outputs
+            }
+            for i, row in enumerate(rows)
+        }
+        symbols = [sym for outputs in column_outputs for sym in outputs]
+        # Final states: if any NFA final state is in the DFA subset
+        dfa_final_states = {
+            state_names[i] for i, mask in enumerate(subsets) if mask & final_mask
+        }
+        dfa_states = set(state_names)
+
+        if dead_needed:
+            dfa_states.add(dead_state)
+            dfa_transitions[dead_state] = {sym: dead_state for sym in symbols}
+
+        dfa = DFA(
+            states=dfa_states,
+            alphabet=set(symbols),
+            transition=dfa_transitions,
+            start_state=state_names[0],
+            final_states=dfa_final_states
+        )
+    if keep_subsets:
+        dfa.subsets = {}
+        for i, mask in enumerate(subsets):
+            members = set()
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                members.add(names[low.bit_length() - 1])
+            dfa.subsets[state_names[i]] = frozenset(members)
+    if stats is not None:
+        misses = sum(len(column) - column.count(None) for column in step_cache)
+        stats.count("nfa_states", len(names))
+        stats.count("closure_entries", len(closure_of))
+        stats.count("subsets_created", len(subsets))
+        stats.count("subsets_expanded", expanded)
+        stats.count("step_cache_misses", misses)
+        stats.count("symbol_columns", n_columns)
+        stats.count("step_cache_hits", member_steps * n_columns - misses)
+    return dfa
@@ -0,0 +1,314 @@
+from collections import deque, namedtuple
+
+from dfa.dfa import DFA
+from dfa.symbols import has_ranges
+from nfa.nfa import NFA
+
+EPSILON = 'ε'
+
+# DFA state names created, dropped, and kept but with a new row or accept flag
+DFAChange = namedtuple("DFAChange", "added removed changed")
+NO_CHANGE = DFAChange(frozenset(), frozenset(), frozenset())
+
+
+class EditableNFA:
+    """An NFA that can be edited in place while its subset DFA is kept up to date.
+
+    The derived DFA has one state per reachable ε-closed subset, as in
+    ``nfa_to_dfa``, but missing transitions are left out instead of going
+    to a ``DEAD`` state. Each edit recomputes only the DFA rows whose move
+    set touches the edited state: a non-ε edge out of ``q`` dirties the rows
+    on that symbol of the subsets containing ``q``; an ε edit first
+    recomputes the closures passing through its source, then dirties the
+    rows whose move set holds a state whose closure changed. New target
+    subsets are explored and subsets no longer reachable are dropped. DFA
+    state names (``S0``, ``S1``, …) are stable across edits.
+
+    Every edit returns a ``DFAChange`` naming the DFA states added, removed
+    and changed. Range labels are not supported.
+    """
+
+    def __init__(self, automaton):
+        if isinstance(automaton, DFA):
+            transition = {s: {sym: {dst} for sym, dst in moves.items()}
+                          for s, moves in automaton.transition.items()}
+        else:
+            transition = {s: {sym: set(targets) for sym, targets in moves.items() if targets}
+                          for s, moves in automaton.transition.items()}
+        self.states = set(automaton.states) | set(transition)
+        self.alphabet = {sym for sym in automaton.alphabet if sym != EPSILON}
+        self.transition = {s: moves for s, moves in transition.items() if moves}
+        self.start_state = automaton.start_state
+        self.final_states = set(automaton.final_states)
+        labels = set(self.alphabet)
+        for moves in self.transition.values():
+            labels.update(moves)
+        if has_ranges(labels):
+            raise ValueError("Range labels are not supported by EditableNFA; use nfa_to_dfa.")
+
+        # NFA state → {(source, symbol)} over non-ε edges into it
+        self._incoming = {}
+        for src, moves in self.transition.items():
+            for sym, targets in moves.items():
+                if sym != EPSILON:
+                    for dst in targets:
+                        self._incoming.setdefault(dst, set()).add((src, sym))
+        self._closure = {s: self._close(s) for s in self.states}
+
+        self._ids = {}                                  # subset → DFA state name
+        self._subsets = {}                              # DFA state name → subset
+        self._rows = {}                                 # DFA state name → {symbol: name}
+        self._containing = {}                           # NFA state → DFA state names
+        self._accepting = set()
+        self._counter = 0
+        self.start, _ = self._intern(self._closure[self.start_state])
+        self._explore([self.start])
+
+    # ---- subset bookkeeping ----
+
+    def _close(self, state):
+        closure = {state}
+        stack = [state]
+        while stack:
+            for nxt in self.transition.get(stack.pop(), {}).get(EPSILON, ()):
+                if nxt not in closure:
+                    closure.add(nxt)
+                    stack.append(nxt)
+        return frozenset(closure)
+
+    def _target(self, subset, symbol):
+        target = set()
+        for state in subset:
+            for dst in self.transition.get(state, {}).get(symbol, ()):
+                target |= self._closure[dst]
+        return frozenset(target)
+
+    def _intern(self, subset):
+        name = self._ids.get(subset)
+        if name is not None:
+            return name, False
+        name = f"S{self._counter}"
+        self._counter += 1
+        self._ids[subset] = name
+        self._subsets[name] = subset
+        self._rows[name] = {}
+        for state in subset:
+            self._containing.setdefault(state, set()).add(name)
+        if subset & self.final_states:
+            self._accepting.add(name)
+        return name, True
+
+    def _explore(self, queue):
+        """Fill the rows of newly interned states; return every state created."""
+        added = set(queue)
+        queue = deque(queue)
+        while queue:
+            name = queue.popleft()
+            subset = self._subsets[name]
+            row = self._rows[name]
+            for symbol in self.alphabet:
+                target = self._target(subset, symbol)
+                if not target:
+                    continue
+                dst, created = self._intern(target)
+                row[symbol] = dst
+                if created:
+                    added.add(dst)
+                    queue.append(dst)
+        return added
+
+    def _drop(self, name):
+        subset = self._subsets.pop(name)
+        del self._ids[subset]
+        del self._rows[name]
+        self._accepting.discard(name)
+        for state in subset:
+            names = self._containing.get(state)
+            if names is not None:
+                names.discard(name)
+
+    def _collect(self):
+        """Drop DFA states unreachable from the start; return their names."""
+        seen = {self.start}
+        queue = deque([self.start])
+        while queue:
+            for dst in self._rows[queue.popleft()].values():
+                if dst not in seen:
+                    seen.add(dst)
+                    queue.append(dst)
+        removed = set(self._subsets) - seen
+        for name in removed:
+            self._drop(name)
+        return removed
+
+    def _reclose(self, source):
+        """Recompute the closures that pass through ``source``; return states whose closure changed."""
+        changed = set()
+        for state, closure in list(self._closure.items()):
+            if source in closure:
+                new = self._close(state)
+                if new != closure:
+                    self._closure[state] = new
+                    changed.add(state)
+        return changed
+
+    def _refresh(self, dirty=(), reclosed=(), recheck=()):
+        """Recompute ``dirty`` (name, symbol) rows and the rows moving into ``reclosed``."""
+        dirty = set(dirty)
+        for state in reclosed:
+            for src, symbol in self._incoming.get(state, ()):
+                for name in self._containing.get(src, ()):
+                    dirty.add((name, symbol))
+
+        changed = set()
+        queue = []
+        rewired = False
+        start_subset = self._closure[self.start_state]
+        if self._subsets[self.start] != start_subset:
+            self.start, created = self._intern(start_subset)
+            if created:
+                queue.append(self.start)
+            rewired = True
+        for name, symbol in dirty:
+            if name not in self._subsets:
+                continue
+            target = self._target(self._subsets[name], symbol)
+            row = self._rows[name]
+            old = row.get(symbol)
+            if target:
+                new, created = self._intern(target)
+                if created:
+                    queue.append(new)
+                row[symbol] = new
+            else:
+                row.pop(symbol, None)
+                new = None
+            if new != old:
+                changed.add(name)
+                rewired = rewired or old is not None
+        added = self._explore(queue) if queue else set()
+
+        for name in set(recheck) & set(self._subsets):
+            accepting = bool(self._subsets[name] & self.final_states)
+            if accepting != (name in self._accepting):
+                (self._accepting.add if accepting else self._accepting.discard)(name)
+                changed.add(name)
+
+        removed = self._collect() if rewired else set()
+        return DFAChange(
+            frozenset(added - removed),
+            frozenset(removed),
+            frozenset(changed - added - removed)
+        )
+
+    def _check(self, *states):
+        for state in states:
+            if state not in self.states:
+                raise ValueError(f"Unknown state '{state}'.")
+
+    # ---- edits ----
+
+    def add_state(self, state):
+        """Add an isolated state (it joins the DFA once something reaches it)."""
+        if state in self.states:
+            raise ValueError(f"State '{state}' already exists.")
+        self.states.add(state)
+        self._closure[state] = frozenset([state])
+        return NO_CHANGE
+
+    def add_transition(self, src, symbol, dst):
+        """Add ``src --symbol--> dst`` (``'ε'`` for an ε-transition)."""
+        self._check(src, dst)
+        targets = self.transition.setdefault(src, {}).setdefault(symbol, set())
+        if dst in targets:
+            return NO_CHANGE
+        targets.add(dst)
+        if symbol == EPSILON:
+            return self._refresh(reclosed=self._reclose(src))
+        self._incoming.setdefault(dst, set()).add((src, symbol))
+        if symbol not in self.alphabet:
+            self.alphabet.add(symbol)
+        return self._refresh(dirty={(name, symbol) for name in self._containing.get(src, ())})
+
+    def remove_transition(self, src, symbol, dst):
+        """Remove ``src --symbol--> dst``; raises ``ValueError`` if it does not exist."""
+        targets = self.transition.get(src, {}).get(symbol)
+        if not targets or dst not in targets:
+            raise ValueError(f"No transition {src} --{symbol}--> {dst}.")
+        self._unlink(src, symbol, dst)
+        if symbol == EPSILON:
+            return self._refresh(reclosed=self._reclose(src))
+        return self._refresh(dirty={(name, symbol) for name in self._containing.get(src, ())})
+
+    def _unlink(self, src, symbol, dst):
+        targets = self.transition[src][symbol]
+        targets.discard(dst)
+        if not targets:
+            del self.transition[src][symbol]
+            if not self.transition[src]:
+                del self.transition[src]
+        if symbol != EPSILON:
+            self._incoming[dst].discard((src, symbol))
+
+    def remove_state(self, state):
+        """Remove a state and every transition into or out of it (not the start state)."""
+        self._check(state)
+        if state == self.start_state:
+            raise ValueError("Cannot remove the start state.")
+        dirty = set()
+        eps_sources = set()
+        for symbol, targets in list(self.transition.get(state, {}).items()):
+            for dst in list(targets):
+                self._unlink(state, symbol, dst)
+        for src, moves in list(self.transition.items()):
+            for symbol, targets in list(moves.items()):
+                if state in targets:
+                    if symbol == EPSILON:
+                        eps_sources.add(src)
+                    else:
+                        dirty.update((name, symbol) for name in self._containing.get(src, ()))
+                    self._unlink(src, symbol, state)
+        # Subsets holding the state become unreachable once the rows and
+        # closures leading into them are recomputed, and are dropped
+        reclosed = set()
+        for src in eps_sources:
+            reclosed |= self._reclose(src)
+        self.states.discard(state)
+        self.final_states.discard(state)
+        self._incoming.pop(state, None)
+        del self._closure[state]
+        reclosed.discard(state)
+        return self._refresh(dirty, reclosed)
+
+    def set_final(self, state, final=True):
+        """Mark (or with ``final=False`` unmark) ``state`` as accepting."""
+        self._check(state)
+        if (state in self.final_states) == final:
+            return NO_CHANGE
+        (self.final_states.add if final else self.final_states.discard)(state)
+        return self._refresh(recheck=self._containing.get(state, ()))
+
+    # ---- views ----
+
+    def to_nfa(self):
+        """Return a copy of the current NFA."""
+        return NFA(
+            states=set(self.states),
+            alphabet=set(self.alphabet),
+            transition={s: {sym: set(t) for sym, t in moves.items()}
+                        for s, moves in self.transition.items()},
+            start_state=self.start_state,
+            final_states=set(self.final_states)
+        )
+
+    def to_dfa(self):
+        """Return the current subset DFA; ``dfa.subsets`` maps names to NFA state sets."""
+        dfa = DFA(
+            states=set(self._subsets),
+            alphabet=set(self.alphabet),
+            transition={name: dict(row) for name, row in self._rows.items()},
+            start_state=self.start,
+            final_states=set(self._accepting)
+        )
+        dfa.subsets = dict(self._subsets)
+        return dfa
@@ -0,0 +1,90 @@
+import shlex
+from collections import namedtuple
+
+# Geometry in points (1/72 in), origin at the top-left corner
+NodeGeometry = namedtuple("NodeGeometry", "x y width height shape")
+EdgeGeometry = namedtuple("EdgeGeometry", "tail head label points label_pos")
+
+POINTS_PER_INCH = 72
+
+
+class DFALayout:
+    """Graphviz layout of a DFA, computed once and reused for every highlight.
+
+    ``nodes`` maps state name → ``NodeGeometry``; ``edges`` is a list of
+    ``EdgeGeometry`` in the order Graphviz emitted them. The start arrow's
+    invisible tail node is named ``""``. ``edge_index`` maps
+    ``(src_state, symbol)`` to the position of the edge carrying it, so a
+    highlight is a dictionary lookup rather than a new ``dot`` run.
+    Transitions into hidden sink states have no entry.
+    """
+
+    def __init__(self, width, height, nodes, edges):
+        self.width = width
+        self.height = height
+        self.nodes = nodes
+        self.edges = edges
+        self.edge_index = {}
+        for i, edge in enumerate(edges):
+            if edge.label is not None:
+                self.edge_index[(edge.tail, edge.label)] = i
+
+    @classmethod
+    def from_dfa(cls, dfa):
+        """Lay out the DFA's graph once (``-Tplain``) and parse the geometry.
+
+        Parallel edges are merged; above the ``visualize`` size thresholds
+        sinks are hidden and the faster ``sfdp`` engine is used.
+        """
+        from dfa.visualize import dfa_digraph, is_large
+        large = is_large(dfa)
+        dot = dfa_digraph(dfa, merge_edges=True, hide_sinks=large,
+                          engine="sfdp" if large else "dot")
+        layout = cls.from_plain(dot.pipe(format="plain", encoding="utf-8"))
+        layout.index_transitions(dfa)
+        return layout
+
+    def index_transitions(self, dfa):
+        """Point every ``(src_state, symbol)`` at the (possibly merged) edge drawn for it."""
+        by_pair = {(edge.tail, edge.head): i for i, edge in enumerate(self.edges)}
+        self.edge_index = {}
+        for src, transitions in dfa.transition.items():
+            for symbol, dst in transitions.items():
+                i = by_pair.get((src, dst))
+                if i is not None:
+                    self.edge_index[(src, symbol)] = i
+
+    @classmethod
+    def from_plain(cls, text):
+        """Parse Graphviz ``plain`` output (inches, origin bottom-left)."""
+        width = height = 0.0
+        nodes = {}
+        edges = []
+        for line in text.splitlines():
+            fields = shlex.split(line, posix=True)
+            if not fields:
+                continue
+            kind = fields[0]
+            if kind == "graph":
+                width = float(fields[2]) * POINTS_PER_INCH
+                height = float(fields[3]) * POINTS_PER_INCH
+            elif kind == "node":
+                name = fields[1]
+                x, y, w, h = (float(v) * POINTS_PER_INCH for v in fields[2:6])
+                nodes[name] = NodeGeometry(x, height - y, w, h, fields[8])
+            elif kind == "edge":
+                tail, head, n = fields[1], fields[2], int(fields[3])
+                coords = [float(v) * POINTS_PER_INCH for v in fields[4:4 + 2 * n]]
+                points = [(coords[i], height - coords[i + 1])
+                          for i in range(0, len(coords), 2)]
+                rest = fields[4 + 2 * n:]
+                label = label_pos = None
+                # Labelled edges carry "label xl yl" before style and color
+                if len(rest) >= 5:
+                    label = rest[0]
+                    label_pos = (float(rest[1]) * POINTS_PER_INCH,
+                                 height - float(rest[2]) * POINTS_PER_INCH)
+                edges.append(EdgeGeometry(tail, head, label, points, label_pos))
+            elif kind == "stop":
+                break
+        return cls(width, height, nodes, edges)
@@ -0,0 +1,132 @@
+import sys
+
+from nfa.bitset import BitsetNFA
+
+
+class LazyDFA:
+    """On-the-fly determinization of an NFA with a bounded state cache.
+
+    DFA states (ε-closed NFA state sets, as ``BitsetNFA`` masks) are only
+    created when an input reaches them, and each subset transition is cached
+    after it is first computed. When the estimated cache size exceeds
+    ``max_cache_bytes`` the whole cache is flushed and rebuilt from the
+    current state, as RE2 does. If flushes keep happening with little
+    progress in between (fewer than ``min_progress`` symbols per cached
+    state, ``max_bad_flushes`` times in a row), the rest of that input is
+    matched by direct bitset NFA simulation instead.
+
+    With range labels, cache columns are the engine's symbol classes.
+    """
+
+    MISSING = -1
+
+    def __init__(self, nfa, max_cache_bytes=8 * 1024 * 1024, min_progress=10,
+                 max_bad_flushes=3):
+        self.engine = nfa if isinstance(nfa, BitsetNFA) else BitsetNFA.from_nfa(nfa)
+        self.symbols = self.engine.symbols
+        self.symbol_index = {sym: i for i, sym in enumerate(self.symbols)}
+        self.max_cache_bytes = max_cache_bytes
+        self.min_progress = min_progress
+        self.max_bad_flushes = max_bad_flushes
+
+        self.flushes = 0
+        self.fallbacks = 0
+        self._bad_flushes = 0
+        self._progress = 0                              # symbols since last flush
+        self._clear()
+
+    def _clear(self):
+        self._masks = []                                # List[state id] = subset mask
+        self._ids = {}                                  # subset mask → state id
+        self._next = []                                 # flat [id * n_symbols + col]
+        self._cache_bytes = 0
+
+    @property
+    def cache_states(self):
+        """Number of DFA states currently cached."""
+        return len(self._masks)
+
+    def _intern(self, mask):
+        sid = self._ids.get(mask)
+        if sid is None:
+            sid = len(self._masks)
+            self._masks.append(mask)
+            self._ids[mask] = sid
+            self._next.extend([self.MISSING] * len(self.symbols))
+            # mask stored twice (list + dict key) plus its row of pointers
+            self._cache_bytes += 2 * sys.getsizeof(mask) + 8 * len(self.symbols) + 64
+        return sid
+
+    def _flush(self):
+        """Drop every cached state; return True if the cache is thrashing."""
+        thrashing = self._progress < self.min_progress * len(self._masks)
+        self._bad_flushes = self._bad_flushes + 1 if thrashing else 0
+        self.flushes += 1
+        self._progress = 0
+        self._clear()
+        return self._bad_flushes >= self.max_bad_flushes
+
+    def initial(self):
+        """Return the start subset mask."""
+        return self.engine.initial()
+
+    def column(self, symbol):
+        """Return the cache column for an input symbol, or None if not in the alphabet."""
+        col = self.symbol_index.get(symbol)
+        if col is None and self.engine.classes is not None:
+            col = self.engine.classes.classify(symbol)
+        return col
+
+    def step(self, mask, symbol):
+        """Advance the subset ``mask`` on ``symbol`` through the cache."""
+        col = self.column(symbol)
+        if col is None:
+            raise ValueError(f"Symbol '{symbol}' not in NFA alphabet.")
+        self._progress += 1
+        sid = self._intern(mask)
+        nxt = self._next[sid * len(self.symbols) + col]
+        if nxt == self.MISSING:
+            return self._extend(sid, col)[1]
+        return self._masks[nxt]
+
+    def _extend(self, sid, col):
+        """Compute and cache the uncached transition; return (id, mask) or (None, mask)."""
+        mask = self._masks[sid]
+        target = self.engine.step(mask, self.symbols[col])
+        if self._cache_bytes > self.max_cache_bytes:
+            if self._flush():
+                self._bad_flushes = 0
+                return None, target
+            sid = self._intern(mask)
+        nid = self._intern(target)
+        self._next[sid * len(self.symbols) + col] = nid
+        return nid, target
+
+    def is_accepting(self, mask):
+        """Return True if the subset contains a final NFA state."""
+        return self.engine.is_accepting(mask)
+
+    def accepts(self, input_string):
+        """Return True if the NFA accepts the given string."""
+        columns = self.symbol_index
+        width = len(self.symbols)
+        sid = self._intern(self.engine.initial())
+        for pos, symbol in enumerate(input_string):
+            col = columns.get(symbol)
+            if col is None:
+                col = self.column(symbol)
+                if col is None:
+                    raise ValueError(f"Symbol '{symbol}' not in NFA alphabet.")
+            self._progress += 1
+            nxt = self._next[sid * width + col]
+            if nxt == self.MISSING:
+                nxt, mask = self._extend(sid, col)
+                if nxt is None:
+                    # Cache thrashes on this input: finish with NFA simulation
+                    self.fallbacks += 1
+                    engine = self.engine
+                    for rest in input_string[pos + 1:]:
+                        mask = engine.step(mask, rest)
+                    return engine.is_accepting(mask)
+            sid = nxt
+        return self.engine.is_accepting(self._masks[sid])
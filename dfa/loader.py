@@ -0,0 +1,146 @@
+import json
+import os
+from collections import OrderedDict
+
+from dfa.dfa import DFA
+from dfa.symbols import CharClass, has_ranges, is_char_label, parse_label
+from nfa.nfa import NFA
+
+EPSILON = 'ε'
+REQUIRED_KEYS = ("states", "alphabet", "transition", "start_state", "final_states")
+
+# (absolute path, kind) → (mtime_ns, size, automaton), least recently used first
+CACHE_SIZE = 32
+_cache = OrderedDict()
+
+
+def parse_automaton(f, kind=None, source="<stream>"):
+    """Parse, validate and normalize one automaton JSON document from ``f``.
+
+    The file is decoded once. Transition rows are consumed from the raw map
+    as they are normalized, so the raw and normalized tables are never both
+    held in full. A single-element list ``["q1"]`` and a bare ``"q1"`` both
+    mean one target. The document is an NFA if it uses ``ε`` or has a symbol
+    with several targets; otherwise a DFA. Pass ``kind="dfa"``/``"nfa"`` to
+    force the result type (a nondeterministic document cannot be a DFA).
+
+    Alphabet symbols and transition labels may be ranges such as ``"a-z"``
+    or ``"\u0000-\u00ff"`` (see ``dfa.symbols.parse_label``); a label must
+    lie inside the alphabet, and overlapping labels out of one state make
+    the document nondeterministic.
+
+    Returns a ``DFA`` or ``NFA``; raises ``ValueError`` on invalid input.
+    """
+    if kind not in (None, "dfa", "nfa"):
+        raise ValueError("kind must be None, 'dfa' or 'nfa'")
+    data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{source}: top level must be an object")
+    missing = [key for key in REQUIRED_KEYS if key not in data]
+    if missing:
+        raise ValueError(f"{source}: missing {', '.join(missing)}")
+
+    states = set(data["states"])
+    try:
+        alphabet = {parse_label(sym) for sym in data["alphabet"]}
+    except ValueError as e:
+        raise ValueError(f"{source}: {e}") from None
+    ranged = has_ranges(alphabet)
+    if ranged:
+        alphabet_chars = CharClass.union(sym for sym in alphabet if is_char_label(sym))
+    start_state = data["start_state"]
+    final_states = set(data["final_states"])
+    if start_state not in states:
+        raise ValueError(f"{source}: start state '{start_state}' not in states")
+    if not final_states <= states:
+        unknown = ", ".join(sorted(map(str, final_states - states)))
+        raise ValueError(f"{source}: final states not in states: {unknown}")
+
+    raw = data.pop("transition")
+    if not isinstance(raw, dict):
+        raise ValueError(f"{source}: transition must be an object")
+    nondeterministic = False
+    transition = {}
+    for state in list(raw):
+        row = raw.pop(state)
+        if state not in states:
+            raise ValueError(f"{source}: transition from unknown state '{state}'")
+        moves = {}
+        for symbol, targets in row.items():
+            if symbol != EPSILON:
+                try:
+                    symbol = parse_label(symbol)
+                except ValueError as e:
+                    raise ValueError(f"{source}: {e}") from None
+            if symbol != EPSILON and symbol not in alphabet and not (
+                    ranged and is_char_label(symbol)
+                    and CharClass.union([symbol]).issubset(alphabet_chars)):
+                raise ValueError(f"{source}: symbol '{symbol}' from '{state}' not in alphabet")
+            if not isinstance(targets, list):
+                targets = [targets]
+            for target in targets:
+                if target not in states:
+                    raise ValueError(
+                        f"{source}: '{state}' --'{symbol}'--> unknown state '{target}'"
+                    )
+            if not targets:
+                continue
+            if symbol == EPSILON or len(targets) > 1:
+                nondeterministic = True
+                moves[symbol] = set(targets)
+            else:
+                moves[symbol] = targets[0]
+        if ranged and not nondeterministic and _overlapping(moves):
+            nondeterministic = True
+        transition[state] = moves
+
+    if kind is None:
+        kind = "nfa" if nondeterministic else "dfa"
+    if kind == "dfa":
+        if nondeterministic:
+            raise ValueError(f"{source}: automaton is nondeterministic, not a DFA")
+        return DFA(states, alphabet, transition, start_state, final_states)
+
+    for moves in transition.values():
+        for symbol, targets in moves.items():
+            if not isinstance(targets, set):
+                moves[symbol] = {targets}
+    return NFA(states, alphabet, transition, start_state, final_states)
+
+
+def _overlapping(moves):
+    """Return True if two character labels of one transition row share a symbol."""
+    intervals = sorted(
+        interval
+        for label in moves if label != EPSILON and is_char_label(label)
+        for interval in CharClass.union([label]).intervals
+    )
+    return any(lo <= prev_hi for (_, prev_hi), (lo, _) in zip(intervals, intervals[1:]))
+
+
+def load_automaton(path, kind=None):
+    """Load an automaton JSON file through an LRU cache keyed by path and mtime.
+
+    See ``parse_automaton`` for ``kind`` and the accepted format. Repeat
+    calls for an unchanged file return the same object, so callers must not
+    mutate it.
+    """
+    key = (os.path.abspath(path), kind)
+    st = os.stat(path)
+    hit = _cache.get(key)
+    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        _cache.move_to_end(key)
+        return hit[2]
+
+    with open(path, "r", encoding="utf-8") as f:
+        automaton = parse_automaton(f, kind, source=path)
+    _cache[key] = (st.st_mtime_ns, st.st_size, automaton)
+    _cache.move_to_end(key)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return automaton
+
+
+def clear_cache():
+    """Forget every cached automaton."""
+    _cache.clear()
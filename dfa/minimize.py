@@ -0,0 +1,132 @@
+from collections import deque
+
+from dfa.compiled import CompiledDFA
+from dfa.dfa import DFA
+
+
+def reachable_states(compiled):
+    """Return the set of state ids reachable from the start state."""
+    width = compiled.n_symbols
+    table = compiled.table
+    seen = {compiled.start}
+    queue = deque([compiled.start])
+    while queue:
+        state = queue.popleft()
+        base = state * width
+        for col in range(width):
+            nxt = table[base + col]
+            if nxt >= 0 and nxt not in seen:
+                seen.add(nxt)
+                queue.append(nxt)
+    return seen
+
+
+def hopcroft_partition(compiled, states):
+    """Refine ``states`` into Myhill–Nerode classes (Hopcroft's algorithm).
+
+    Missing transitions are routed to an implicit sink with id
+    ``compiled.n_states`` so the automaton is complete during refinement.
+    Returns a list of blocks (sets of state ids, possibly containing the sink).
+    """
+    width = compiled.n_symbols
+    table = compiled.table
+    sink = compiled.n_states
+    universe = set(states) | {sink}
+
+    # inverse[col][dst] = list of src with src --col--> dst
+    inverse = [dict() for _ in range(width)]
+    for src in universe:
+        for col in range(width):
+            dst = sink if src == sink else table[src * width + col]
+            if dst < 0:
+                dst = sink
+            inverse[col].setdefault(dst, []).append(src)
+
+    accepting = {s for s in universe if s != sink and compiled.is_accepting(s)}
+    blocks = [b for b in (accepting, universe - accepting) if b]
+    block_of = {}
+    for i, block in enumerate(blocks):
+        for state in block:
+            block_of[state] = i
+
+    smallest = min(range(len(blocks)), key=lambda i: len(blocks[i]))
+    worklist = {(smallest, col) for col in range(width)}
+
+    while worklist:
+        splitter, col = worklist.pop()
+        preds = inverse[col]
+        hit = {}
+        for dst in blocks[splitter]:
+            for src in preds.get(dst, ()):
+                hit.setdefault(block_of[src], set()).add(src)
+
+        for b, members in hit.items():
+            if len(members) == len(blocks[b]):
+                continue
+            blocks[b] -= members
+            new = len(blocks)
+            blocks.append(members)
+            for state in members:
+                block_of[state] = new
+            for c in range(width):
+                if (b, c) in worklist:
+                    worklist.add((new, c))
+                elif len(members) <= len(blocks[b]):
+                    worklist.add((new, c))
+                else:
+                    worklist.add((b, c))
+
+    return blocks
+
+
+def minimize_dfa(dfa):
+    """Return the minimal DFA equivalent to ``dfa``.
+
+    Unreachable states are removed first, then states are merged with
+    Hopcroft's O(n·|Σ|·log n) partition refinement. Each merged state keeps
+    the name of one of its members (the start state's block keeps the start
+    name). Missing transitions stay missing; an explicit sink such as
+    ``DEAD`` is kept as a single state.
+    """
+    compiled = CompiledDFA.from_dfa(dfa)
+    reachable = reachable_states(compiled)
+    blocks = hopcroft_partition(compiled, reachable)
+
+    sink = compiled.n_states
+    names = compiled.state_names
+    block_name = {}
+    block_of = {}
+    for i, block in enumerate(blocks):
+        real = [s for s in block if s != sink]
+        if not real:
+            continue                                  # the implicit sink alone
+        if compiled.start in block:
+            rep = compiled.start
+        else:
+            rep = min(real, key=lambda s: str(names[s]))
+        block_name[i] = names[rep]
+        for state in block:
+            block_of[state] = i
+
+    width = compiled.n_symbols
+    transition = {}
+    for i, name in block_name.items():
+        rep = compiled.state_index[name]
+        moves = {}
+        for col, symbol in enumerate(compiled.symbols):
+            dst = compiled.table[rep * width + col]
+            target = block_of.get(sink if dst < 0 else dst)
+            if target is not None:
+                moves[symbol] = block_name[target]
+        transition[name] = moves
+
+    return DFA(
+        states=set(block_name.values()),
+        alphabet=set(dfa.alphabet),
+        transition=transition,
+        start_state=names[compiled.start],
+        final_states={
+            name for name in block_name.values()
+            if compiled.is_accepting(compiled.state_index[name])
+        }
+    )
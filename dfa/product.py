@@ -0,0 +1,281 @@
+from collections import deque
+
+from dfa.dfa import DFA
+from dfa.from_nfa import ConversionAborted, ConversionProgress
+from dfa.lazy import LazyDFA
+from dfa.symbols import CharClass, SymbolClasses, has_ranges
+
+# Operands are adapted to one protocol: initial(), step(state, symbol) and
+# is_accepting(state), with None as the dead state (it rejects forever).
+
+
+class _DFAOperand:
+    def __init__(self, dfa):
+        self.compiled = dfa._compiled or dfa.compile()
+        self.alphabet = set(dfa.alphabet)
+
+    def initial(self):
+        return self.compiled.start
+
+    def step(self, state, symbol):
+        col = self.compiled.column(symbol)
+        if col is None:
+            return None
+        nxt = self.compiled.table[state * self.compiled.n_symbols + col]
+        return None if nxt < 0 else nxt
+
+    def is_accepting(self, state):
+        return self.compiled.is_accepting(state)
+
+
+class _NFAOperand:
+    def __init__(self, nfa):
+        self.lazy = LazyDFA(nfa)
+        self.alphabet = set(self.lazy.symbols)
+
+    def initial(self):
+        return self.lazy.initial() or None
+
+    def step(self, state, symbol):
+        if self.lazy.column(symbol) is None:
+            return None
+        return self.lazy.step(state, symbol) or None
+
+    def is_accepting(self, state):
+        return self.lazy.is_accepting(state)
+
+
+def _operand(automaton):
+    if isinstance(automaton, ProductDFA):
+        return automaton
+    if isinstance(automaton, DFA):
+        return _DFAOperand(automaton)
+    return _NFAOperand(automaton)
+
+
+class ProductDFA:
+    """Lazy boolean combination of DFAs, NFAs or other ``ProductDFA`` objects.
+
+    A product state is the tuple of operand states and is only created when
+    an input (or ``to_dfa``'s BFS from the start tuple) reaches it, so
+    unreachable pairs of the |Q1|×|Q2|… grid are never built. ``accept``
+    maps the tuple of operand acceptance flags to a bool. A missing
+    transition, or a symbol outside an operand's alphabet, sends that
+    operand to a dead state that rejects forever; this is what lets
+    ``complement`` handle partial transition tables.
+
+    ``hopeless``, given the tuple of operand liveness flags, returns True
+    when no continuation can be accepted any more (e.g. a dead operand of
+    an intersection). Such states, and the all-dead tuple when it rejects,
+    are never created: ``step`` returns None for them.
+
+    With range labels the operands' labels are split into joint symbol
+    classes (``classes``); ``symbols`` holds one representative character
+    per class, operands are stepped on it, and input symbols are first
+    mapped to their class.
+    """
+
+    def __init__(self, operands, accept, alphabet=None, hopeless=None):
+        self.operands = [_operand(a) for a in operands]
+        self.accept = accept
+        self.hopeless = hopeless
+        self._dead_rejects = not accept((False,) * len(self.operands))
+        labels = set().union(*(op.alphabet for op in self.operands))
+        self.alphabet = set(alphabet) if alphabet is not None else labels
+        self.classes = None                             # SymbolClasses, or None without ranges
+        if has_ranges(self.alphabet | labels):
+            self.classes = SymbolClasses.from_labels(self.alphabet | labels)
+            kept = [cid for cid in range(self.classes.n_classes)
+                    if self.alphabet.intersection(self.classes.covering[cid])]
+            self.symbols = [self.classes.representative(cid) for cid in kept]
+            self._labels = [self.classes.members[cid] for cid in kept]
+        else:
+            self.symbols = sorted(self.alphabet, key=str)
+            self._labels = self.symbols
+        self.symbol_index = {sym: i for i, sym in enumerate(self.symbols)}
+        self._tuples = []                               # List[state id] = operand states
+        self._ids = {}                                  # operand states → state id
+        self._next = {}                                 # (state id, symbol) → state id or None
+        self._start = self._intern(tuple(op.initial() for op in self.operands))
+
+    @property
+    def cache_states(self):
+        """Number of product states created so far."""
+        return len(self._tuples)
+
+    def _intern(self, states):
+        live = tuple(s is not None for s in states)
+        if not any(live) and self._dead_rejects:
+            return None
+        if self.hopeless is not None and self.hopeless(live):
+            return None
+        sid = self._ids.get(states)
+        if sid is None:
+            sid = len(self._tuples)
+            self._tuples.append(states)
+            self._ids[states] = sid
+        return sid
+
+    def initial(self):
+        return self._start
+
+    def _symbol(self, symbol):
+        """The symbol operands are stepped on for ``symbol``, or None if not in the alphabet.
+
+        With classes this is the representative of the class ``symbol`` (a
+        character, or a range label inside one class) falls in.
+        """
+        if symbol in self.symbol_index or self.classes is None:
+            return symbol if symbol in self.symbol_index else None
+        cid = self.classes.classify(symbol)
+        if cid is None and isinstance(symbol, CharClass):
+            cid = self.classes.classify(chr(symbol.intervals[0][0]))
+            if cid is not None and not symbol.issubset(CharClass.union([self.classes.members[cid]])):
+                raise ValueError(f"Label '{symbol}' spans several symbol classes.")
+        if cid is None:
+            return None
+        representative = self.classes.representative(cid)
+        return representative if representative in self.symbol_index else None
+
+    def step(self, state, symbol):
+        """Return the successor product state id, or None if it can never accept."""
+        if state is None:
+            return None
+        if symbol not in self.symbol_index:
+            symbol = self._symbol(symbol)
+        key = (state, symbol)
+        nxt = self._next.get(key, -1)
+        if nxt == -1:
+            if symbol is None:
+                nxt = None
+            else:
+                nxt = self._intern(tuple(
+                    None if s is None else op.step(s, symbol)
+                    for op, s in zip(self.operands, self._tuples[state])
+                ))
+            self._next[key] = nxt
+        return nxt
+
+    def is_accepting(self, state):
+        if state is None:
+            return False
+        flags = tuple(s is not None and op.is_accepting(s)
+                      for op, s in zip(self.operands, self._tuples[state]))
+        return bool(self.accept(flags))
+
+    def accepts(self, input_string):
+        """Return True if the combined language contains ``input_string``."""
+        state = self.initial()
+        for symbol in input_string:
+            if self._symbol(symbol) is None:
+                raise ValueError(f"Symbol '{symbol}' not in DFA alphabet.")
+            state = self.step(state, symbol)
+            if state is None:
+                return False
+        return self.is_accepting(state)
+
+    def _explore(self, max_states=None):
+        """BFS over reachable product states; yields (id, symbol, next id) edges."""
+        start = self.initial()
+        if start is None:
+            return
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            for symbol in self.symbols:
+                nxt = self.step(state, symbol)
+                if nxt is None:
+                    continue
+                if nxt not in seen:
+                    seen.add(nxt)
+                    queue.append(nxt)
+                    if max_states is not None and len(seen) > max_states:
+                        raise ConversionAborted(
+                            "states", ConversionProgress(len(seen), len(queue), 0.0)
+                        )
+                yield state, symbol, nxt
+
+    def shortest_accepted(self):
+        """Return a shortest accepted string, or None if the language is empty."""
+        start = self.initial()
+        if start is None:
+            return None
+        if self.is_accepting(start):
+            return ""
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            for symbol in self.symbols:
+                nxt = self.step(state, symbol)
+                if nxt is None or nxt in parent:
+                    continue
+                parent[nxt] = (state, symbol)
+                if self.is_accepting(nxt):
+                    path = []
+                    while parent[nxt] is not None:
+                        nxt, symbol = parent[nxt]
+                        path.append(symbol)
+                    return "".join(reversed(path))
+                queue.append(nxt)
+        return None
+
+    def is_empty(self):
+        return self.shortest_accepted() is None
+
+    def to_dfa(self, max_states=None):
+        """Materialize the reachable part as a ``DFA`` (states ``P0``, ``P1``, …).
+
+        Raises ``ConversionAborted`` once more than ``max_states`` states are
+        reached. Transitions into states that can never accept are omitted.
+        With range labels the transitions are labelled by symbol class.
+        """
+        start = self.initial()
+        if start is None:
+            return DFA({"P0"}, set(self.alphabet), {"P0": {}}, "P0", set())
+        names = {start: "P0"}
+        transition = {"P0": {}}
+        label_of = dict(zip(self.symbols, self._labels))
+        for state, symbol, nxt in self._explore(max_states):
+            if nxt not in names:
+                names[nxt] = f"P{len(names)}"
+                transition[names[nxt]] = {}
+            transition[names[state]][label_of[symbol]] = names[nxt]
+        return DFA(
+            states=set(names.values()),
+            alphabet=set(self.alphabet),
+            transition=transition,
+            start_state="P0",
+            final_states={name for sid, name in names.items() if self.is_accepting(sid)}
+        )
+
+
+def intersection(*automata):
+    """Strings accepted by every automaton."""
+    return ProductDFA(automata, all, hopeless=lambda live: not all(live))
+
+
+def union(*automata):
+    """Strings accepted by at least one automaton."""
+    return ProductDFA(automata, any)
+
+
+def difference(left, right):
+    """Strings accepted by ``left`` but not by ``right``."""
+    return ProductDFA([left, right], lambda flags: flags[0] and not flags[1],
+                      hopeless=lambda live: not live[0])
+
+
+def symmetric_difference(left, right):
+    """Strings accepted by exactly one of the two automata."""
+    return ProductDFA([left, right], lambda flags: flags[0] != flags[1])
+
+
+def complement(automaton, alphabet=None):
+    """Strings over ``alphabet`` (default: the automaton's) it rejects.
+
+    Missing transitions count as rejection, so partial DFAs are completed
+    implicitly.
+    """
+    return ProductDFA([automaton], lambda flags: not flags[0], alphabet)
@@ -0,0 +1,272 @@
+from dfa.dfa import DFA
+from nfa.nfa import NFA
+
+EPSILON = 'ε'
+METACHARS = set("|*+?()[].\\")
+
+# AST nodes are tuples:
+#   ("empty",)                       matches ε
+#   ("set", chars, negated)          one symbol in (or, if negated, not in) chars
+#   ("cat", left, right) / ("alt", left, right) / ("star", inner) / ("plus", inner)
+
+
+class _Parser:
+    """Recursive-descent parser for ``|``, concatenation, ``* + ?``, groups,
+    ``.`` and bracket classes (``[abc]``, ``[a-z]``, ``[^ab]``)."""
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.pos = 0
+        self.literals = set()
+
+    def error(self, message):
+        raise ValueError(f"Invalid regex at position {self.pos}: {message}")
+
+    def peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def take(self):
+        ch = self.peek()
+        if ch is None:
+            self.error("unexpected end of pattern")
+        self.pos += 1
+        return ch
+
+    def parse(self):
+        node = self.alternation()
+        if self.peek() is not None:
+            self.error(f"unexpected '{self.peek()}'")
+        return node
+
+    def alternation(self):
+        node = self.concatenation()
+        while self.peek() == "|":
+            self.pos += 1
+            node = ("alt", node, self.concatenation())
+        return node
+
+    def concatenation(self):
+        node = ("empty",)
+        while self.peek() not in (None, "|", ")"):
+            item = self.repetition()
+            node = item if node == ("empty",) else ("cat", node, item)
+        return node
+
+    def repetition(self):
+        node = self.atom()
+        while self.peek() in ("*", "+", "?"):
+            op = self.take()
+            if op == "*":
+                node = ("star", node)
+            elif op == "+":
+                node = ("plus", node)
+            else:
+                node = ("alt", node, ("empty",))
+        return node
+
+    def atom(self):
+        ch = self.take()
+        if ch == "(":
+            node = self.alternation()
+            if self.peek() != ")":
+                self.error("missing ')'")
+            self.pos += 1
+            return node
+        if ch == "[":
+            return self.bracket()
+        if ch == ".":
+            return ("set", frozenset(), True)
+        if ch == "\\":
+            ch = self.take()
+        elif ch in METACHARS:
+            self.error(f"unexpected '{ch}'")
+        self.literals.add(ch)
+        return ("set", frozenset(ch), False)
+
+    def bracket(self):
+        negated = self.peek() == "^"
+        if negated:
+            self.pos += 1
+        chars = set()
+        first = True
+        while first or self.peek() != "]":
+            first = False
+            ch = self.take()
+            if ch == "\\":
+                ch = self.take()
+            if self.peek() == "-" and self.pos + 1 < len(self.pattern) \
+                    and self.pattern[self.pos + 1] != "]":
+                self.pos += 1
+                end = self.take()
+                if end == "\\":
+                    end = self.take()
+                if ord(end) < ord(ch):
+                    self.error(f"bad range {ch}-{end}")
+                chars.update(chr(c) for c in range(ord(ch), ord(end) + 1))
+            else:
+                chars.add(ch)
+        self.pos += 1
+        if not negated:
+            self.literals.update(chars)
+        return ("set", frozenset(chars), negated)
+
+
+def parse_regex(pattern, alphabet=None):
+    """Parse ``pattern`` and return ``(ast, alphabet)``.
+
+    The alphabet is ``alphabet`` if given (it must contain every literal),
+    otherwise the literals of the pattern. ``.`` and ``[^...]`` are resolved
+    against it.
+    """
+    parser = _Parser(pattern)
+    ast = parser.parse()
+    if alphabet is None:
+        alphabet = set(parser.literals)
+    else:
+        alphabet = set(alphabet)
+        missing = parser.literals - alphabet
+        if missing:
+            raise ValueError(f"Pattern symbols not in alphabet: {', '.join(sorted(missing))}")
+    return ast, alphabet
+
+
+def _symbols(node, alphabet):
+    _, chars, negated = node
+    return (alphabet - chars) if negated else (chars & alphabet)
+
+
+def regex_to_nfa(pattern, alphabet=None):
+    """Thompson construction: an ε-NFA with one start and one final state."""
+    ast, alphabet = parse_regex(pattern, alphabet)
+    transition = {}
+    counter = [0]
+
+    def new_state():
+        name = f"t{counter[0]}"
+        counter[0] += 1
+        transition[name] = {}
+        return name
+
+    def edge(src, symbol, dst):
+        transition[src].setdefault(symbol, set()).add(dst)
+
+    def build(node):
+        kind = node[0]
+        start, end = new_state(), new_state()
+        if kind == "empty":
+            edge(start, EPSILON, end)
+        elif kind == "set":
+            for symbol in _symbols(node, alphabet):
+                edge(start, symbol, end)
+        elif kind == "cat":
+            s1, e1 = build(node[1])
+            s2, e2 = build(node[2])
+            edge(start, EPSILON, s1)
+            edge(e1, EPSILON, s2)
+            edge(e2, EPSILON, end)
+        elif kind == "alt":
+            for child in node[1:]:
+                s, e = build(child)
+                edge(start, EPSILON, s)
+                edge(e, EPSILON, end)
+        else:                                             # star / plus
+            s, e = build(node[1])
+            edge(start, EPSILON, s)
+            if kind == "star":
+                edge(start, EPSILON, end)
+            edge(e, EPSILON, s)
+            edge(e, EPSILON, end)
+        return start, end
+
+    start, end = build(ast)
+    return NFA(
+        states=set(transition),
+        alphabet=set(alphabet),
+        transition=transition,
+        start_state=start,
+        final_states={end}
+    )
+
+
+def regex_to_dfa(pattern, alphabet=None, minimize=False):
+    """Build a DFA directly from ``pattern`` with the followpos construction.
+
+    Every symbol leaf is a position; ``followpos`` is computed once over the
+    pattern augmented with an end marker, and each DFA state is an interned
+    set of positions, so no ε-NFA or ε-closures are involved. Successor sets
+    are memoized by the positions that read the symbol, which different
+    states often share. Missing transitions reject, as in ``DFA.accepts``.
+    """
+    ast, alphabet = parse_regex(pattern, alphabet)
+    leaf_symbols = []                                    # position → symbol set
+    followpos = []
+
+    def annotate(node):
+        """Return (nullable, firstpos, lastpos), filling followpos on the way."""
+        kind = node[0]
+        if kind == "empty":
+            return True, frozenset(), frozenset()
+        if kind == "set":
+            pos = len(leaf_symbols)
+            leaf_symbols.append(frozenset(_symbols(node, alphabet)))
+            followpos.append(set())
+            return False, frozenset([pos]), frozenset([pos])
+        if kind in ("star", "plus"):
+            inner_nullable, first, last = annotate(node[1])
+            for pos in last:
+                followpos[pos] |= first
+            return kind == "star" or inner_nullable, first, last
+        n1, f1, l1 = annotate(node[1])
+        n2, f2, l2 = annotate(node[2])
+        if kind == "alt":
+            return n1 or n2, f1 | f2, l1 | l2
+        for pos in l1:                                    # cat
+            followpos[pos] |= f2
+        return n1 and n2, (f1 | f2) if n1 else f1, (l1 | l2) if n2 else l2
+
+    nullable, first, last = annotate(ast)
+    end_marker = len(leaf_symbols)
+    followpos.append(set())
+    for pos in last:
+        followpos[pos].add(end_marker)
+    start = frozenset(first | {end_marker}) if nullable else frozenset(first)
+    followpos = [frozenset(f) for f in followpos]
+
+    # positions that can read each symbol
+    readers = {symbol: frozenset(p for p, syms in enumerate(leaf_symbols) if symbol in syms)
+               for symbol in alphabet}
+
+    state_ids = {start: 0}
+    order = [start]
+    rows = []
+    successor_cache = {}                                 # reading positions → target set
+    for current in order:
+        row = {}
+        for symbol in alphabet:
+            movers = current & readers[symbol]
+            target = successor_cache.get(movers)
+            if target is None:
+                target = frozenset().union(*(followpos[p] for p in movers))
+                successor_cache[movers] = target
+            if not target:
+                continue
+            if target not in state_ids:
+                state_ids[target] = len(order)
+                order.append(target)
+            row[symbol] = state_ids[target]
+        rows.append(row)
+
+    names = [f"S{i}" for i in range(len(order))]
+    dfa = DFA(
+        states=set(names),
+        alphabet=set(alphabet),
+        transition={
+            names[i]: {symbol: names[j] for symbol, j in row.items()}
+            for i, row in enumerate(rows)
+        },
+        start_state=names[0],
+        final_states={names[i] for i, positions in enumerate(order) if end_marker in positions}
+    )
+    if minimize:
+        return dfa.minimize()
+    return dfa
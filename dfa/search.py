@@ -0,0 +1,227 @@
+import mmap
+from array import array
+
+from dfa.lazy import LazyDFA
+from nfa.nfa import NFA
+
+EPSILON = 'ε'
+# Stand-in for any text symbol outside the automaton's alphabet: the Σ* loop
+# reads it, the pattern itself never does
+OTHER = "\x00<other>"
+MODES = ("leftmost-longest", "all")
+
+
+def _as_nfa(automaton):
+    if isinstance(automaton, NFA):
+        return automaton
+    return NFA(
+        states=set(automaton.states),
+        alphabet=set(automaton.alphabet),
+        transition={
+            s: {sym: {dst} for sym, dst in moves.items()}
+            for s, moves in automaton.transition.items()
+        },
+        start_state=automaton.start_state,
+        final_states=set(automaton.final_states)
+    )
+
+
+def _fresh(nfa, base):
+    name = base
+    while name in nfa.states:
+        name += "'"
+    return name
+
+
+def _sigma_star(nfa):
+    """Σ*·L: a new start state loops on every symbol (and OTHER), then ε into L."""
+    loop = _fresh(nfa, "^loop")
+    alphabet = set(nfa.alphabet) | {OTHER}
+    transition = {s: dict(moves) for s, moves in nfa.transition.items()}
+    transition[loop] = {sym: {loop} for sym in alphabet if sym != EPSILON}
+    transition[loop][EPSILON] = {nfa.start_state}
+    return NFA(set(nfa.states) | {loop}, alphabet, transition, loop, set(nfa.final_states))
+
+
+def _reverse(nfa):
+    """L^R: every edge flipped, a new start with ε to the old finals."""
+    start = _fresh(nfa, "^rev")
+    transition = {s: {} for s in nfa.states}
+    transition[start] = {EPSILON: set(nfa.final_states)}
+    for src, moves in nfa.transition.items():
+        for sym, targets in moves.items():
+            for dst in targets:
+                transition.setdefault(dst, {}).setdefault(sym, set()).add(src)
+    return NFA(set(nfa.states) | {start}, set(nfa.alphabet), transition, start,
+               {nfa.start_state})
+
+
+class Searcher:
+    """Find the (start, end) spans of ``text`` whose substring the automaton accepts.
+
+    Three lazily determinized automata are built once per pattern: the
+    anchored pattern L, the Σ*-prefixed Σ*·L and the Σ*-prefixed reverse
+    Σ*·L^R. A search does one forward Σ*·L pass to find the last match end,
+    then one backward Σ*·L^R pass over the text before it that marks every
+    match start. Anchored forward scans are then started only at real match
+    starts, never at every offset, and each one stops as soon as no accepting
+    state is reachable on the rest of the text: the backward pass records,
+    per position, which NFA states can still reach a final state from there.
+
+    ``text`` may be a ``str`` or bytes-like (``bytes``, ``memoryview``,
+    ``mmap``; one symbol ``chr(byte)`` per byte). It is read in ``chunk_size``
+    slices, so a memory-mapped file is never copied whole (the per-position
+    liveness ids take 4 bytes per symbol before the last match end). Symbols
+    outside the alphabet cannot be part of a match.
+    """
+
+    def __init__(self, automaton, chunk_size=1 << 16):
+        nfa = _as_nfa(automaton)
+        self.alphabet = {sym for sym in nfa.alphabet if sym != EPSILON}
+        self.anchored = LazyDFA(nfa)
+        self.forward = LazyDFA(_sigma_star(nfa))
+        self.backward = LazyDFA(_sigma_star(_reverse(nfa)))
+        self.chunk_size = chunk_size
+
+    def _symbols(self, chunk):
+        if not isinstance(chunk, str):
+            chunk = (chr(b) for b in memoryview(chunk).cast("B"))
+        classes = self.anchored.engine.classes
+        if classes is not None:                        # range labels
+            return (OTHER if classes.classify(sym) is None else sym for sym in chunk)
+        alphabet = self.alphabet
+        return (sym if sym in alphabet else OTHER for sym in chunk)
+
+    def _slices(self, text, start, stop):
+        size = self.chunk_size
+        for lo in range(start, stop, size):
+            yield lo, text[lo:min(lo + size, stop)]
+
+    def _last_end(self, text):
+        """Forward Σ*·L pass: return the last position where a match ends, or -1."""
+        dfa = self.forward
+        state = dfa.initial()
+        last = 0 if dfa.is_accepting(state) else -1
+        for lo, chunk in self._slices(text, 0, len(text)):
+            for offset, sym in enumerate(self._symbols(chunk)):
+                state = dfa.step(state, sym)
+                if dfa.is_accepting(state):
+                    last = lo + offset + 1
+        return last
+
+    def _live_mask(self, mask):
+        """Translate a backward Σ*·L^R subset into the anchored engine's bits."""
+        names = self.backward.engine.state_names
+        index = self.anchored.engine.state_index
+        live = 0
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            bit = index.get(names[low.bit_length() - 1])
+            if bit is not None:                         # skip the added loop/start
+                live |= 1 << bit
+        return live
+
+    def _starts(self, text, stop):
+        """Backward Σ*·L^R pass over ``text[:stop]``.
+
+        Returns every match start, ascending, and the liveness table
+        ``(live, masks)``: ``masks[live[i]]`` is the anchored-engine mask of
+        the NFA states from which some ``text[i:j]`` reaches a final state.
+        """
+        dfa = self.backward
+        state = dfa.initial()
+        starts = array("q")
+        live = array("I", [0]) * (stop + 1)
+        masks, ids = [], {}
+
+        def record(pos, state):
+            lid = ids.get(state)
+            if lid is None:
+                lid = ids[state] = len(masks)
+                masks.append(self._live_mask(state))
+            live[pos] = lid
+
+        record(stop, state)
+        if dfa.is_accepting(state):
+            starts.append(stop)
+        size = self.chunk_size
+        hi = stop
+        while hi > 0:
+            lo = max(0, hi - size)
+            chunk = text[lo:hi]
+            symbols = list(self._symbols(chunk))
+            for offset in range(len(symbols) - 1, -1, -1):
+                state = dfa.step(state, symbols[offset])
+                record(lo + offset, state)
+                if dfa.is_accepting(state):
+                    starts.append(lo + offset)
+            hi = lo
+        starts.reverse()
+        return starts, (live, masks)
+
+    def _ends(self, text, start, liveness):
+        """Anchored scan from ``start``: yield every end position, ascending.
+
+        The scan stops once the current subset shares no state with the live
+        set at that position, i.e. no later end exists.
+        """
+        live, masks = liveness
+        dfa = self.anchored
+        state = dfa.initial()
+        if dfa.is_accepting(state):
+            yield start
+        for lo, chunk in self._slices(text, start, len(live) - 1):
+            for offset, sym in enumerate(self._symbols(chunk)):
+                if sym is OTHER:
+                    return
+                state = dfa.step(state, sym)
+                pos = lo + offset + 1
+                if not state & masks[live[pos]]:
+                    return
+                if dfa.is_accepting(state):
+                    yield pos
+
+    def finditer(self, text, mode="leftmost-longest"):
+        """Yield ``(start, end)`` spans in ascending order.
+
+        ``"leftmost-longest"`` gives non-overlapping POSIX-style matches;
+        ``"all"`` gives every accepted span, overlapping ones included.
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        stop = self._last_end(text)
+        if stop < 0:
+            return
+        pos = 0
+        starts, liveness = self._starts(text, stop)
+        for start in starts:
+            if mode == "all":
+                for end in self._ends(text, start, liveness):
+                    yield start, end
+                continue
+            if start < pos:
+                continue
+            end = start
+            for end in self._ends(text, start, liveness):
+                pass
+            yield start, end
+            pos = end if end > start else start + 1
+
+
+def search(automaton, text, mode="leftmost-longest"):
+    """Return the list of ``(start, end)`` match spans (see ``Searcher.finditer``)."""
+    return list(Searcher(automaton).finditer(text, mode))
+
+
+def search_file(automaton, path, mode="leftmost-longest", chunk_size=1 << 20):
+    """Yield match spans over a file (one symbol per byte), memory-mapped."""
+    searcher = Searcher(automaton, chunk_size)
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:                              # empty file cannot be mapped
+            yield from searcher.finditer(b"", mode)
+            return
+        with mapped:
+            yield from searcher.finditer(mapped, mode)
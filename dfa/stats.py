@@ -0,0 +1,56 @@
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+
+def no_phase(name):
+    """Stand-in for ``Stats.phase`` when no ``Stats`` is given."""
+    return nullcontext()
+
+
+class Stats:
+    """Opt-in counters and per-phase timings for conversion and matching.
+
+    Pass one to ``nfa_to_dfa`` or either ``accepts`` method via ``stats=``;
+    without it those functions skip all bookkeeping. The same object can collect several calls. ``on_phase``, if
+    given, is called with ``(name, seconds)`` as each phase finishes.
+    """
+
+    def __init__(self, on_phase=None):
+        self.counters = Counter()
+        self.phases = Counter()                          # phase name → seconds
+        self.on_phase = on_phase
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.phases[name] += elapsed
+            if self.on_phase is not None:
+                self.on_phase(name, elapsed)
+
+    def as_dict(self):
+        return {"counters": dict(self.counters), "phases": dict(self.phases)}
+
+    def summary(self):
+        """One-line readout, e.g. for a status bar."""
+        parts = [f"{name}={value}" for name, value in sorted(self.counters.items())]
+        parts.append(f"{sum(self.phases.values()) * 1000:.1f} ms")
+        return ", ".join(parts)
+
+    def report(self):
+        """Multi-line report of every counter and phase."""
+        lines = ["Counters:"]
+        width = max((len(n) for n in list(self.counters) + list(self.phases)), default=0)
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"  {name.ljust(width)}  {value}")
+        lines.append("Phases:")
+        for name, seconds in self.phases.items():
+            lines.append(f"  {name.ljust(width)}  {seconds * 1000:.2f} ms")
+        return "\n".join(lines)
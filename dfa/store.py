@@ -0,0 +1,138 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from dfa.compiled import CompiledDFA
+from dfa.from_nfa import CONVERTER_VERSION
+from dfa.symbols import parse_label
+
+# File layout (all integers little-endian in the header):
+#   header   MAGIC, version, flags, n_states, n_symbols, names_bytes
+#   table    n_states * n_symbols int32, native order recorded in flags
+#   bitmap   (n_states + 7) // 8 bytes, padded to a multiple of 4
+#   names    UTF-8 JSON: {"states": [...], "symbols": [...]}, range labels as text
+MAGIC = b"ADFA"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIIQ")
+FLAG_BIG_ENDIAN = 1
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "AUTOMATA_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "automata-tool")
+)
+
+
+class FormatError(ValueError):
+    """Raised when a compiled-automaton file is truncated or of another version."""
+
+
+def _padded(n):
+    return (n + 3) & ~3
+
+
+def save_compiled(compiled, path):
+    """Write ``compiled`` to ``path`` in the binary format, atomically."""
+    names = json.dumps(
+        {"states": compiled.state_names, "symbols": compiled.symbols},
+        ensure_ascii=False
+    ).encode("utf-8")
+    bitmap = bytes(compiled.accept_bitmap)
+    flags = FLAG_BIG_ENDIAN if sys.byteorder == "big" else 0
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, flags,
+                         compiled.n_states, compiled.n_symbols, len(names))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(bytes(memoryview(compiled.table).cast("B")))
+            f.write(bitmap.ljust(_padded(len(bitmap)), b"\0"))
+            f.write(names)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_compiled(path):
+    """Map a file written by ``save_compiled`` and return a ``CompiledDFA``.
+
+    The transition table and accept bitmap are views on the memory map, so
+    only the state/symbol names are decoded up front.
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise FormatError(f"{path}: empty file") from None
+    if len(mm) < HEADER.size:
+        raise FormatError(f"{path}: truncated header")
+    magic, version, flags, n_states, n_symbols, names_bytes = HEADER.unpack_from(mm)
+    if magic != MAGIC:
+        raise FormatError(f"{path}: not a compiled automaton")
+    if version != FORMAT_VERSION:
+        raise FormatError(f"{path}: format version {version}, expected {FORMAT_VERSION}")
+
+    table_start = HEADER.size
+    table_end = table_start + 4 * n_states * n_symbols
+    bitmap_len = (n_states + 7) // 8
+    names_start = table_end + _padded(bitmap_len)
+    if len(mm) != names_start + names_bytes:
+        raise FormatError(f"{path}: size does not match header")
+
+    view = memoryview(mm)
+    table = view[table_start:table_end].cast("i")
+    if bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == "big"):
+        table = array("i", table)
+        table.byteswap()
+    bitmap = view[table_end:table_end + bitmap_len]
+    names = json.loads(bytes(view[names_start:]).decode("utf-8"))
+    symbols = [parse_label(sym) for sym in names["symbols"]]
+    compiled = CompiledDFA(names["states"], symbols, table, bitmap)
+    compiled._mmap = mm                      # keep the mapping alive with the views
+    return compiled
+
+
+def cache_key(source, **options):
+    """Hex digest of the source bytes, the format and converter versions and build options."""
+    digest = hashlib.sha256()
+    digest.update(f"v{FORMAT_VERSION}\0converter={CONVERTER_VERSION}".encode())
+    for name in sorted(options):
+        digest.update(f"\0{name}={options[name]!r}".encode())
+    digest.update(b"\0")
+    digest.update(source)
+    return digest.hexdigest()
+
+
+def cached_compiled(path, build, cache_dir=None, **options):
+    """Return the ``CompiledDFA`` for automaton file ``path``, building it at most once.
+
+    The cache entry is named by ``cache_key`` of the file's bytes and
+    ``options``, which must name every conversion option that changes the
+    result (e.g. ``minimize=True``, ``reduce=True``); on a miss ``build()``
+    must return the ``DFA`` and its compiled form is stored for next time.
+    Unreadable or stale entries are rebuilt.
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    with open(path, "rb") as f:
+        key = cache_key(f.read(), **options)
+    entry = os.path.join(cache_dir, key + ".dfa")
+    try:
+        return load_compiled(entry)
+    except (OSError, ValueError):
+        pass
+
+    dfa = build()
+    compiled = dfa._compiled or dfa.compile()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        save_compiled(compiled, entry)
+    except OSError as e:
+        print(f"[WARNING] Could not write cache entry {entry}: {e}", file=sys.stderr)
+    return compiled
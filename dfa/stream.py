@@ -0,0 +1,142 @@
+import mmap
+
+from dfa.dfa import DFA
+from dfa.lazy import LazyDFA
+
+
+class StreamMatcher:
+    """Resumable matcher that consumes input in chunks.
+
+    Built from a ``DFA`` (runs on its compiled table) or an ``NFA`` (runs on
+    a ``LazyDFA``). ``feed`` accepts ``str`` chunks, or bytes-like chunks
+    (``bytes``, ``bytearray``, ``memoryview``, ``mmap``) where every byte is
+    one symbol ``chr(byte)``. Memory use is constant in the input length.
+    """
+
+    def __init__(self, automaton, **lazy_options):
+        if isinstance(automaton, DFA):
+            self.kind = "dfa"
+            self.compiled = automaton._compiled or automaton.compile()
+            self.symbol_index = self.compiled.symbol_index
+        else:
+            self.kind = "nfa"
+            self.lazy = LazyDFA(automaton, **lazy_options)
+            self.symbol_index = self.lazy.symbol_index
+        # byte value → symbol (None when the byte is not in the alphabet)
+        self.byte_symbols = [None] * 256
+        for sym in self.symbol_index:
+            if len(sym) == 1 and ord(sym) < 256:
+                self.byte_symbols[ord(sym)] = sym
+        self.reset()
+
+    def reset(self):
+        """Return to the start state."""
+        if self.kind == "dfa":
+            self.state = self.compiled.start
+        else:
+            self.state = self.lazy.initial()
+        self.consumed = 0
+
+    def _symbols(self, chunk):
+        if isinstance(chunk, str):
+            return chunk
+        table = self.byte_symbols
+        return (table[b] or chr(b) for b in memoryview(chunk).cast("B"))
+
+    def feed(self, chunk):
+        """Consume one chunk of input; raises ``ValueError`` on unknown symbols."""
+        if self.kind == "dfa":
+            self._feed_dfa(chunk)
+        else:
+            step = self.lazy.step
+            state = self.state
+            for symbol in self._symbols(chunk):
+                try:
+                    state = step(state, symbol)
+                except ValueError:
+                    self.state = state
+                    raise ValueError(
+                        f"Symbol '{symbol}' at offset {self.consumed} not in NFA alphabet."
+                    )
+                self.consumed += 1
+            self.state = state
+        return self
+
+    def _feed_dfa(self, chunk):
+        compiled = self.compiled
+        if self.state < 0:
+            self.consumed += len(chunk)                 # no transition earlier: stays rejected
+            return
+        table = compiled.table
+        width = compiled.n_symbols
+        columns = self.symbol_index
+        state = self.state
+        consumed = self.consumed
+        for symbol in self._symbols(chunk):
+            col = columns.get(symbol)
+            if col is None:
+                col = compiled.column(symbol)
+            if col is None:
+                self.state, self.consumed = state, consumed
+                raise ValueError(
+                    f"Symbol '{symbol}' at offset {consumed} not in DFA alphabet."
+                )
+            state = table[state * width + col]
+            if state < 0:
+                self.consumed += len(chunk)
+                self.state = state
+                return
+            consumed += 1
+        self.state, self.consumed = state, consumed
+
+    def is_accepting(self):
+        """Return True if the input fed so far is accepted."""
+        if self.kind == "dfa":
+            return self.state >= 0 and self.compiled.is_accepting(self.state)
+        return self.lazy.is_accepting(self.state)
+
+    def snapshot(self):
+        """Return a JSON-serializable snapshot of the matcher position."""
+        if self.kind == "dfa":
+            state = None if self.state < 0 else self.compiled.state_names[self.state]
+        else:
+            state = sorted(self.lazy.engine.states_of(self.state), key=str)
+        return {"kind": self.kind, "state": state, "consumed": self.consumed}
+
+    def restore(self, snapshot):
+        """Resume from a snapshot taken with ``snapshot``."""
+        if snapshot["kind"] != self.kind:
+            raise ValueError(f"Snapshot is for a {snapshot['kind']}, not a {self.kind}.")
+        if self.kind == "dfa":
+            name = snapshot["state"]
+            self.state = self.compiled.MISSING if name is None else self.compiled.state_index[name]
+        else:
+            index = self.lazy.engine.state_index
+            mask = 0
+            for name in snapshot["state"]:
+                mask |= 1 << index[name]
+            self.state = mask
+        self.consumed = snapshot["consumed"]
+        return self
+
+
+def match_file(automaton, path, chunk_size=1 << 20):
+    """Return True if the whole file (one symbol per byte) is accepted.
+
+    The file is memory-mapped and fed to a ``StreamMatcher`` in
+    ``chunk_size`` slices, so it is never copied into a Python ``str``.
+    """
+    matcher = StreamMatcher(automaton)
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:                              # empty file cannot be mapped
+            return matcher.is_accepting()
+        with mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(0, len(view), chunk_size):
+                    matcher.feed(view[start:start + chunk_size])
+            finally:
+                view.release()
+    return matcher.is_accepting()
@@ -0,0 +1,256 @@
+from bisect import bisect_left, bisect_right
+
+# Characters escaped inside the "[...]" form of a multi-interval class
+_SPECIAL = set("\\]-^[")
+
+
+def _normalize(intervals):
+    merged = []
+    for lo, hi in sorted(intervals):
+        if lo > hi:
+            raise ValueError(f"Bad symbol range {chr(lo)}-{chr(hi)}")
+        if merged and lo <= merged[-1][1] + 1:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return tuple(merged)
+
+
+def _escape(ch):
+    return "\\" + ch if ch in _SPECIAL else ch
+
+
+def _format(intervals):
+    if len(intervals) == 1:
+        lo, hi = intervals[0]
+        return chr(lo) if lo == hi else f"{chr(lo)}-{chr(hi)}"
+    parts = []
+    for lo, hi in intervals:
+        parts.append(_escape(chr(lo)) if lo == hi
+                     else f"{_escape(chr(lo))}-{_escape(chr(hi))}")
+    return "[" + "".join(parts) + "]"
+
+
+class CharClass(str):
+    """A transition label standing for a set of single-character symbols.
+
+    Stored as sorted, disjoint code-point ``intervals``. The label is also a
+    ``str`` whose text is ``"a-z"`` for one range, ``"a"`` for one character
+    and ``"[a-cx\\-z]"`` for several intervals, so it sorts, prints and
+    serializes like any other symbol, and a one-character class is equal to
+    (and hashes like) the plain symbol. Use ``covers`` for membership; ``in``
+    keeps its substring meaning.
+    """
+
+    def __new__(cls, intervals):
+        intervals = _normalize(intervals)
+        if not intervals:
+            raise ValueError("Empty symbol class")
+        label = super().__new__(cls, _format(intervals))
+        label.intervals = intervals
+        label._starts = [lo for lo, _ in intervals]
+        return label
+
+    def __getnewargs__(self):
+        return (self.intervals,)
+
+    @classmethod
+    def union(cls, labels):
+        """One class covering every character label (class or single character) given."""
+        intervals = []
+        for label in labels:
+            if isinstance(label, CharClass):
+                intervals.extend(label.intervals)
+            else:
+                intervals.append((ord(label), ord(label)))
+        return cls(intervals)
+
+    def covers(self, symbol):
+        """Return True if the single-character ``symbol`` belongs to this class."""
+        if not isinstance(symbol, str) or len(symbol) != 1:
+            return False
+        code = ord(symbol)
+        i = bisect_right(self._starts, code) - 1
+        return i >= 0 and code <= self.intervals[i][1]
+
+    def issubset(self, other):
+        """Return True if every character of this class is in ``other``."""
+        for lo, hi in self.intervals:
+            i = bisect_right(other._starts, lo) - 1
+            if i < 0 or hi > other.intervals[i][1]:
+                return False
+        return True
+
+    def size(self):
+        """Number of characters in the class."""
+        return sum(hi - lo + 1 for lo, hi in self.intervals)
+
+
+def _parse_bracket(body, label):
+    chars = []
+    i = 0
+    while i < len(body):
+        ch = body[i]
+        if ch == "\\":
+            i += 1
+            if i == len(body):
+                raise ValueError(f"Bad symbol class '{label}'")
+            ch = body[i]
+        chars.append(ch)
+        i += 1
+        if i + 1 < len(body) and body[i] == "-":
+            end = body[i + 1]
+            i += 2
+            if end == "\\":
+                if i == len(body):
+                    raise ValueError(f"Bad symbol class '{label}'")
+                end = body[i]
+                i += 1
+            chars[-1] = (ord(ch), ord(end))
+    return [c if isinstance(c, tuple) else (ord(c), ord(c)) for c in chars]
+
+
+def parse_label(label):
+    """Return ``label`` as a ``CharClass`` if it uses range syntax, else unchanged.
+
+    ``"a-z"`` (three characters) is the range a..z; ``"[a-cx-z]"`` is a
+    union of ranges, with ``\\`` escaping ``] - ^ [ \\``. JSON escapes give
+    byte ranges, e.g. ``"\\u0000-\\u00ff"``. Any other label is a plain symbol.
+    """
+    if not isinstance(label, str) or isinstance(label, CharClass):
+        return label
+    if len(label) == 3 and label[1] == "-":
+        if label[0] > label[2]:
+            raise ValueError(f"Bad symbol range '{label}'")
+        return CharClass([(ord(label[0]), ord(label[2]))])
+    if len(label) > 2 and label[0] == "[" and label[-1] == "]":
+        return CharClass(_parse_bracket(label[1:-1], label))
+    return label
+
+
+def is_char_label(label):
+    """Return True for labels that denote characters (a class or one character)."""
+    return isinstance(label, str) and (isinstance(label, CharClass) or len(label) == 1)
+
+
+def has_ranges(labels):
+    """Return True if any label is a ``CharClass`` with more than one character."""
+    return any(isinstance(label, CharClass) and len(label) != 1 for label in labels)
+
+
+def matching_label(labels, symbol):
+    """Return the label in ``labels`` (e.g. a DFA transition row) that matches ``symbol``.
+
+    An exact label wins; otherwise the first ``CharClass`` covering the
+    symbol. Returns None when nothing matches.
+    """
+    if symbol in labels:
+        return symbol
+    for label in labels:
+        if isinstance(label, CharClass) and label.covers(symbol):
+            return label
+    return None
+
+
+class SymbolClasses:
+    """Alphabet equivalence classes: a partition of the symbols labels denote.
+
+    Class ``i`` is ``members[i]``, a ``CharClass`` (or, for a symbol that is
+    not a single character such as ``"10"``, that symbol). ``classify`` maps
+    a concrete input symbol to its class id, or None if no label covers it,
+    by binary search over the interval starts.
+    """
+
+    def __init__(self, members, covering=None):
+        self.members = members                          # List[class id] = label
+        self.n_classes = len(members)
+        self.covering = covering                        # List[class id] = labels covering it
+        self.exact = {}                                 # non-character symbol → class id
+        bounds = []
+        for cid, label in enumerate(members):
+            if not is_char_label(label):
+                self.exact[label] = cid
+                continue
+            for lo, hi in CharClass.union([label]).intervals:
+                bounds.append((lo, hi, cid))
+        bounds.sort()
+        self.starts = []                                # interval start code points
+        self.ids = []                                   # class id of each interval, -1 = gap
+        end = None
+        for lo, hi, cid in bounds:
+            if end is not None and lo <= end:
+                raise ValueError("Symbol classes overlap")
+            if end is not None and lo > end + 1:
+                self.starts.append(end + 1)
+                self.ids.append(-1)
+            self.starts.append(lo)
+            self.ids.append(cid)
+            end = hi
+        if end is not None:
+            self.starts.append(end + 1)
+            self.ids.append(-1)
+
+    @classmethod
+    def from_labels(cls, labels):
+        """Minimal classes for ``labels``: symbols covered by exactly the same labels.
+
+        Any automaton whose transitions use only these labels treats all
+        symbols of one class alike, so it can be run, determinized and
+        tabulated per class. ``covering[i]`` lists the labels covering class
+        ``i``; ``by_label`` maps each label to the class ids it covers.
+        """
+        labels = sorted(set(labels), key=str)
+        char_labels = [label for label in labels if is_char_label(label)]
+        intervals = {label: CharClass.union([label]).intervals for label in char_labels}
+        points = sorted({p for ivs in intervals.values() for lo, hi in ivs for p in (lo, hi + 1)})
+        cover = [[] for _ in points]                    # labels over [points[i], points[i+1])
+        for label in char_labels:
+            for lo, hi in intervals[label]:
+                for i in range(bisect_left(points, lo), bisect_left(points, hi + 1)):
+                    cover[i].append(label)
+
+        members, covering, pieces = [], [], []
+        class_of = {}
+        for i, labels_here in enumerate(cover):
+            if not labels_here:
+                continue
+            key = tuple(labels_here)
+            cid = class_of.get(key)
+            if cid is None:
+                cid = class_of[key] = len(pieces)
+                pieces.append([])
+                covering.append(key)
+            pieces[cid].append((points[i], points[i + 1] - 1))
+        members = [CharClass(piece) for piece in pieces]
+        for label in labels:
+            if not is_char_label(label):
+                members.append(label)
+                covering.append((label,))
+
+        classes = cls(members, covering)
+        classes.by_label = {}
+        for cid, labels_here in enumerate(covering):
+            for label in labels_here:
+                classes.by_label.setdefault(label, []).append(cid)
+        return classes
+
+    def classify(self, symbol):
+        """Return the class id of a concrete symbol, or None if it is not covered."""
+        cid = self.exact.get(symbol)
+        if cid is not None:
+            return cid
+        if not isinstance(symbol, str) or len(symbol) != 1:
+            return None
+        i = bisect_right(self.starts, ord(symbol)) - 1
+        if i < 0:
+            return None
+        cid = self.ids[i]
+        return None if cid < 0 else cid
+
+    def representative(self, cid):
+        """A concrete symbol of class ``cid`` (its smallest character)."""
+        label = self.members[cid]
+        if is_char_label(label):
+            return chr(CharClass.union([label]).intervals[0][0])
+        return label
@@ -1,28 +1,99 @@
+from collections import deque
+
 from graphviz import Digraph
 
-def visualize_dfa(dfa, filename="dfa_graph", view=False, highlight_edges=None, highlight_nodes=None):
-    """
-    Render the given DFA to a PNG file using Graphviz.
+# Above either threshold the large-automaton mode is switched on by default:
+# merged edges, hidden sinks, SVG output and the sfdp layout engine
+LARGE_STATES = 60
+LARGE_EDGES = 300
 
-    Parameters:
-        dfa: instance of DFA with attributes states, transition, start_state, final_states
-        filename: output filename (without extension)
-        view: whether to open the image after rendering
-        highlight_edges: optional list of (src_state, symbol) tuples to draw in red
-        highlight_nodes: optional list of state names to fill with color
+
+def sink_states(dfa):
+    """Return the non-accepting, non-start states that only loop to themselves."""
+    sinks = set()
+    for state in dfa.states:
+        if state in dfa.final_states or state == dfa.start_state:
+            continue
+        if all(dst == state for dst in dfa.transition.get(state, {}).values()):
+            sinks.add(state)
+    return sinks
+
+
+def neighbourhood(dfa, center, radius):
+    """States within ``radius`` hops of ``center``, following edges both ways."""
+    adjacent = {}
+    for src, transitions in dfa.transition.items():
+        for dst in transitions.values():
+            adjacent.setdefault(src, set()).add(dst)
+            adjacent.setdefault(dst, set()).add(src)
+    seen = {center}
+    queue = deque([(center, 0)])
+    while queue:
+        state, depth = queue.popleft()
+        if depth == radius:
+            continue
+        for nxt in adjacent.get(state, ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                queue.append((nxt, depth + 1))
+    return seen
+
+
+def format_symbols(symbols):
+    """Join symbols into one edge label, collapsing runs like ``a,b,c,d`` to ``a-d``."""
+    singles = sorted(s for s in symbols if len(s) == 1)
+    parts = []
+    i = 0
+    while i < len(singles):
+        j = i
+        while j + 1 < len(singles) and ord(singles[j + 1]) == ord(singles[j]) + 1:
+            j += 1
+        if j - i >= 2:
+            parts.append(f"{singles[i]}-{singles[j]}")
+        else:
+            parts.extend(singles[i:j + 1])
+        i = j + 1
+    parts.extend(sorted(s for s in symbols if len(s) != 1))
+    return ",".join(parts)
+
+
+def is_large(dfa):
+    n_edges = sum(len(t) for t in dfa.transition.values())
+    return len(dfa.states) > LARGE_STATES or n_edges > LARGE_EDGES
+
+
+def dfa_digraph(dfa, highlight_edges=None, highlight_nodes=None, merge_edges=False,
+                hide_sinks=False, focus=None, radius=None, engine="dot", output_format="png"):
+    """Build the Graphviz ``Digraph`` for a DFA (shared by rendering and layout).
+
+    ``merge_edges`` draws one edge per (src, dst) pair labelled with its
+    symbol set; ``hide_sinks`` drops ``sink_states`` and the edges into them.
+    With ``focus`` and ``radius`` only states within ``radius`` hops of
+    ``focus`` are drawn.
     """
-    dot = Digraph(format="png")
+    dot = Digraph(format=output_format, engine=engine)
     dot.attr(rankdir="LR")
+    if engine != "dot":
+        dot.attr(overlap="false", splines="true")
 
-    highlight_edges = highlight_edges or []
+    highlight_edges = set(map(tuple, highlight_edges or []))
     highlight_nodes = set(highlight_nodes or [])
 
+    shown = set(dfa.states)
+    if hide_sinks:
+        shown -= sink_states(dfa)
+    if focus is not None and radius is not None:
+        shown &= neighbourhood(dfa, focus, radius)
+
     # Draw start arrow
-    dot.node("", shape="none")
-    dot.edge("", dfa.start_state)
+    if dfa.start_state in shown:
+        dot.node("", shape="none")
+        dot.edge("", dfa.start_state)
 
     # Draw states (doublecircle for finals, fill for current)
     for state in dfa.states:
+        if state not in shown:
+            continue
         attrs = {}
         attrs['shape'] = "doublecircle" if state in dfa.final_states else "circle"
         if state in highlight_nodes:
@@ -30,15 +101,54 @@ def visualize_dfa(dfa, filename="dfa_graph", view=False, highlight_edges=None, h
             attrs['fillcolor'] = 'lightpink'
         dot.node(state, **attrs)
 
-    # Draw transitions (red + bold for highlighted edges)
+    # Group transitions per (src, dst) so merged edges keep a stable order
+    groups = {}
     for src, transitions in dfa.transition.items():
+        if src not in shown:
+            continue
         for symbol, dst in transitions.items():
+            if dst in shown:
+                groups.setdefault((src, dst), []).append(symbol)
+
+    # Draw transitions (red + bold for highlighted edges)
+    for (src, dst), symbols in groups.items():
+        labels = [symbols] if merge_edges else [[symbol] for symbol in symbols]
+        for group in labels:
             edge_attrs = {}
-            if (src, symbol) in highlight_edges:
+            if any((src, symbol) in highlight_edges for symbol in group):
                 edge_attrs['color'] = 'red'
                 edge_attrs['penwidth'] = '2'
-            dot.edge(src, dst, label=symbol, **edge_attrs)
+            dot.edge(src, dst, label=format_symbols(group), **edge_attrs)
+    return dot
+
+
+def visualize_dfa(dfa, filename="dfa_graph", view=False, highlight_edges=None, highlight_nodes=None,
+                  large=None, focus=None, radius=None):
+    """
+    Render the given DFA to a PNG file using Graphviz.
+
+    Parameters:
+        dfa: instance of DFA with attributes states, transition, start_state, final_states
+        filename: output filename (without extension)
+        view: whether to open the image after rendering
+        highlight_edges: optional list of (src_state, symbol) tuples to draw in red
+        highlight_nodes: optional list of state names to fill with color
+        large: large-automaton mode (merged edges, hidden sinks, SVG via sfdp);
+            None switches it on above LARGE_STATES / LARGE_EDGES
+        focus, radius: optionally draw only the radius-hop neighbourhood of focus
+
+    Returns the path of the rendered file.
+    """
+    if large is None:
+        large = is_large(dfa)
+    dot = dfa_digraph(
+        dfa, highlight_edges, highlight_nodes,
+        merge_edges=large, hide_sinks=large, focus=focus, radius=radius,
+        engine="sfdp" if large else "dot",
+        output_format="svg" if large else "png"
+    )
 
     # Render to file
     output_path = dot.render(filename, cleanup=True, view=view)
     print(f"[✓] DFA graph rendered to: {output_path}")
+    return output_path
@@ -1,63 +1,164 @@
-import json
-from dfa.dfa import DFA
+import argparse
+import sys
+from dfa.batch import evaluate_batch
+from dfa.loader import load_automaton
 from nfa.nfa import NFA
-from dfa.from_nfa import nfa_to_dfa
+from dfa.from_nfa import ConversionAborted, nfa_to_dfa
+from dfa.search import search_file
+from dfa.stats import Stats, no_phase
+from dfa.store import cached_compiled
 from dfa.visualize import visualize_dfa
 from dfa.utils import print_dfa_table
 
 def load_dfa_from_json(path):
-    with open(path, "r") as f:
-        data = json.load(f)
-    return DFA(
-        states=set(data["states"]),
-        alphabet=set(data["alphabet"]),
-        transition=data["transition"],
-        start_state=data["start_state"],
-        final_states=set(data["final_states"])
-    )
+    return load_automaton(path, kind="dfa")
 
 def load_nfa_from_json(path):
-    with open(path, "r") as f:
-        data = json.load(f)
-    # Convert nested lists to sets for transitions
-    transition = {
-        state: {symbol: set(targets) for symbol, targets in trans.items()}
-        for state, trans in data["transition"].items()
-    }
-    return NFA(
-        states=set(data["states"]),
-        alphabet=set(data["alphabet"]),
-        transition=transition,
-        start_state=data["start_state"],
-        final_states=set(data["final_states"])
-    )
+    return load_automaton(path, kind="nfa")
 
 def is_probably_nfa(path):
     """Return True if the automaton JSON likely describes an NFA.
     Detection is based on the presence of epsilon transitions or any
     transition where a symbol leads to more than one possible state.
     """
-    with open(path, "r") as f:
-        data = json.load(f)
-    return any(
-        symbol == 'ε' or isinstance(targets, list)
-        for trans in data["transition"].values()
-        for symbol, targets in trans.items()
-    )
-
-def run_dfa(dfa):
+    return isinstance(load_automaton(path), NFA)
+
+def run_dfa(dfa, stats=None):
     print("Enter strings to test. Type 'exit' to quit.")
     while True:
         s = input("Input string: ").strip()
         if s.lower() == "exit":
             break
         try:
-            result = dfa.accepts(s)
+            result = dfa.accepts(s, stats=stats)
             print("✅ Accepted" if result else "❌ Rejected")
         except ValueError as e:
             print(f"Error: {e}")
 
+def report_progress(progress):
+    print(f"[INFO] {progress.subsets} subsets discovered, "
+          f"{progress.frontier} pending ({progress.elapsed:.1f}s)")
+
+def convert_nfa_from_json(path, use_cache=True, stats=None, minimize=False, reduce=False,
+                          **limits):
+    """Return the compiled DFA for an NFA file, via the on-disk compiled cache.
+
+    ``minimize`` and ``reduce`` are part of the cache key; ``limits`` go to
+    ``nfa_to_dfa`` and only matter on a cache miss.
+    """
+    built = []
+
+    def build():
+        built.append(True)
+        return nfa_to_dfa(load_nfa_from_json(path), minimize=minimize, reduce=reduce,
+                          stats=stats, **limits)
+    if not use_cache:
+        return build().compile()
+    compiled = cached_compiled(path, build, kind="nfa", minimize=minimize, reduce=reduce)
+    if stats is not None and not built:
+        stats.count("compiled_cache_hits")
+    return compiled
+
+def run_batch(automaton_path, inputs_path, output_path=None, workers=None,
+              use_cache=True, stats=None, **limits):
+    """Score every line of ``inputs_path`` against an automaton JSON file.
+
+    NFAs are converted to a DFA first, under the ``nfa_to_dfa`` budgets in
+    ``limits``, and the result is cached (see ``dfa.store``). One result per
+    input line is written
+    in input order as ``index<TAB>accept|reject`` or ``index<TAB>error<TAB>msg``.
+    """
+    phase = stats.phase if stats is not None else no_phase
+    with phase("load"):
+        nondeterministic = is_probably_nfa(automaton_path)
+    if nondeterministic:
+        dfa = convert_nfa_from_json(automaton_path, use_cache, stats, **limits)
+    else:
+        dfa = load_dfa_from_json(automaton_path)
+
+    with open(inputs_path, "r", encoding="utf-8") as f, phase("batch match"):
+        strings = (line.rstrip("\r\n") for line in f)
+        out = open(output_path, "w", encoding="utf-8") if output_path else sys.stdout
+        try:
+            scored = 0
+            for index, ok, error in evaluate_batch(dfa, strings, workers=workers):
+                scored += 1
+                if error is not None:
+                    out.write(f"{index}\terror\t{error}\n")
+                else:
+                    out.write(f"{index}\t{'accept' if ok else 'reject'}\n")
+            if stats is not None:
+                stats.count("batch_strings", scored)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+def run_search(automaton_path, text_path, mode="leftmost-longest", output_path=None,
+               stats=None):
+    """Write every match span of the automaton in ``text_path`` as ``start<TAB>end``.
+
+    Offsets are byte offsets; the file is memory-mapped and scanned without
+    converting an NFA to a DFA up front (see ``dfa.search``).
+    """
+    phase = stats.phase if stats is not None else no_phase
+    with phase("load"):
+        automaton = load_automaton(automaton_path)
+    out = open(output_path, "w", encoding="utf-8") if output_path else sys.stdout
+    try:
+        with phase("search"):
+            found = 0
+            for start, end in search_file(automaton, text_path, mode):
+                found += 1
+                out.write(f"{start}\t{end}\n")
+        if stats is not None:
+            stats.count("search_matches", found)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DFA/NFA simulator")
+    parser.add_argument("--batch", nargs=2, metavar=("AUTOMATON", "INPUTS"),
+                        help="score each line of INPUTS against AUTOMATON (JSON) and exit")
+    parser.add_argument("--search", nargs=2, metavar=("AUTOMATON", "TEXT"),
+                        help="print the start/end offsets of every match of AUTOMATON in TEXT and exit")
+    parser.add_argument("--all", action="store_true",
+                        help="with --search, report every (overlapping) match instead of "
+                             "leftmost-longest ones")
+    parser.add_argument("--output", help="write batch/search results here instead of stdout")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--max-states", type=int,
+                        help="abort NFA → DFA conversion beyond this many DFA states")
+    parser.add_argument("--timeout", type=float,
+                        help="abort NFA → DFA conversion after this many seconds")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always re-run NFA → DFA conversion instead of using the cache")
+    parser.add_argument("--stats", action="store_true",
+                        help="report conversion/matching counters and phase timings")
+    args = parser.parse_args()
+    limits = {"max_states": args.max_states, "max_seconds": args.timeout}
+    use_cache = not args.no_cache
+    stats = Stats() if args.stats else None
+    if args.search:
+        try:
+            run_search(args.search[0], args.search[1],
+                       "all" if args.all else "leftmost-longest", args.output, stats)
+        finally:
+            if stats is not None:
+                print(stats.report(), file=sys.stderr)
+        sys.exit(0)
+    if args.batch:
+        try:
+            run_batch(args.batch[0], args.batch[1], args.output, args.workers,
+                      use_cache, stats, **limits)
+        except ConversionAborted as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if stats is not None:
+                print(stats.report(), file=sys.stderr)
+        sys.exit(0)
+
     while True:
         print("Choose mode:")
         print("1. Run DFA")
@@ -73,13 +174,19 @@ if __name__ == "__main__":
             try:
                 if is_probably_nfa(path):
                     print("[WARNING] This file looks like an NFA. You may want to use mode 2.")
-                    proceed = input("Do you want to continue anyway? (y/n): ").strip().lower()
+                    proceed = input("Convert it to a DFA and continue? (y/n): ").strip().lower()
                     if proceed != 'y':
                         continue
-                dfa = load_dfa_from_json(path)
-                print(f"[INFO] DFA loaded from '{filename}'.")
+                    dfa = convert_nfa_from_json(path, use_cache, stats, progress=report_progress,
+                                                progress_every=10000, **limits).to_dfa()
+                    print(f"[INFO] NFA from '{filename}' converted to DFA.")
+                else:
+                    dfa = load_dfa_from_json(path)
+                    print(f"[INFO] DFA loaded from '{filename}'.")
                 print_dfa_table(dfa)
-                run_dfa(dfa)
+                run_dfa(dfa, stats)
+                if stats is not None:
+                    print(stats.report())
             except Exception as e:
                 print(f"[ERROR] Failed to load DFA: {e}")
 
@@ -92,13 +199,14 @@ if __name__ == "__main__":
                     proceed = input("Do you want to continue anyway? (y/n): ").strip().lower()
                     if proceed != 'y':
                         continue
-                nfa = load_nfa_from_json(path)
-                print(f"[INFO] NFA loaded from '{filename}'.")
-                dfa = nfa_to_dfa(nfa)
-                print("[INFO] NFA converted to DFA.")
+                dfa = convert_nfa_from_json(path, use_cache, stats, progress=report_progress,
+                                            progress_every=10000, **limits).to_dfa()
+                print(f"[INFO] NFA from '{filename}' converted to DFA.")
                 print_dfa_table(dfa)
                 visualize_dfa(dfa, view=False)
-                run_dfa(dfa)
+                run_dfa(dfa, stats)
+                if stats is not None:
+                    print(stats.report())
             except Exception as e:
                 print(f"[ERROR] Failed to load or convert NFA: {e}")
 
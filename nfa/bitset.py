@@ -0,0 +1,159 @@
+from dfa.symbols import SymbolClasses, has_ranges
+
+EPSILON = 'ε'
+
+
+class BitsetNFA:
+    """NFA simulation engine over integer bitmasks.
+
+    Every state gets an integer id and a set of states is one Python int with
+    bit ``i`` set for state ``i``. The ε-closure of each state and, for every
+    symbol, the ε-closed successor set of each state are precomputed once, so
+    advancing the current set is just OR-ing the masks of its members.
+
+    With range labels the successor rows are per alphabet equivalence class
+    (``classes``, a ``dfa.symbols.SymbolClasses``) rather than per symbol.
+    """
+
+    def __init__(self, state_names, symbols, closures, successors, start_mask, final_mask,
+                 classes=None):
+        self.state_names = state_names                  # List[state id] = state name
+        self.state_index = {s: i for i, s in enumerate(state_names)}
+        self.symbols = symbols
+        self.closures = closures                        # List[state id] = closure mask
+        self.successors = successors                    # Dict[symbol] = List[state id] = mask
+        self.start_mask = start_mask
+        self.final_mask = final_mask
+        self.classes = classes
+
+    @classmethod
+    def from_nfa(cls, nfa):
+        """Build the bitmask tables for ``nfa``."""
+        names = [nfa.start_state]
+        seen = {nfa.start_state}
+
+        def add(state):
+            if state not in seen:
+                seen.add(state)
+                names.append(state)
+
+        for state in sorted(nfa.states, key=str):
+            add(state)
+        for src in sorted(nfa.transition, key=str):
+            add(src)
+            for targets in nfa.transition[src].values():
+                for state in sorted(targets, key=str):
+                    add(state)
+
+        index = {s: i for i, s in enumerate(names)}
+        n = len(names)
+
+        def targets_mask(state, symbol):
+            mask = 0
+            for dst in nfa.transition.get(state, {}).get(symbol, ()):
+                mask |= 1 << index[dst]
+            return mask
+
+        # ε-closure of every single state, by iterating to a fixpoint per state
+        eps = [targets_mask(s, EPSILON) for s in names]
+        closures = []
+        for i in range(n):
+            closure = 1 << i
+            frontier = closure
+            while frontier:
+                low = frontier & -frontier
+                frontier ^= low
+                new = eps[low.bit_length() - 1] & ~closure
+                closure |= new
+                frontier |= new
+            closures.append(closure)
+
+        def close(mask):
+            result = 0
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                result |= closures[low.bit_length() - 1]
+            return result
+
+        labels = {s for s in nfa.alphabet if s != EPSILON}
+        for moves in nfa.transition.values():
+            labels.update(sym for sym in moves if sym != EPSILON)
+        classes = None
+        if has_ranges(labels):
+            classes = SymbolClasses.from_labels(labels)
+            symbols = classes.members
+            successors = {}
+            for cid, sym in enumerate(symbols):
+                row = []
+                for s in names:
+                    mask = 0
+                    for label in classes.covering[cid]:
+                        mask |= targets_mask(s, label)
+                    row.append(close(mask))
+                successors[sym] = row
+        else:
+            symbols = sorted((s for s in nfa.alphabet if s != EPSILON), key=str)
+            successors = {
+                sym: [close(targets_mask(s, sym)) for s in names]
+                for sym in symbols
+            }
+
+        final_mask = 0
+        for state in nfa.final_states:
+            if state in index:
+                final_mask |= 1 << index[state]
+
+        return cls(names, symbols, closures, successors,
+                   closures[0], final_mask, classes)
+
+    def _row(self, symbol):
+        row = self.successors.get(symbol)
+        if row is None and self.classes is not None:
+            cid = self.classes.classify(symbol)
+            if cid is not None:
+                row = self.successors[self.symbols[cid]]
+        if row is None:
+            raise ValueError(f"Symbol '{symbol}' not in NFA alphabet.")
+        return row
+
+    def initial(self):
+        """Return the ε-closed start set as a bitmask."""
+        return self.start_mask
+
+    def step(self, mask, symbol):
+        """Advance the state set ``mask`` on ``symbol`` (result is ε-closed)."""
+        row = self._row(symbol)
+        result = 0
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            result |= row[low.bit_length() - 1]
+        return result
+
+    def is_accepting(self, mask):
+        """Return True if the state set contains a final state."""
+        return bool(mask & self.final_mask)
+
+    def states_of(self, mask):
+        """Decode a bitmask back into a set of state names."""
+        names = set()
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            names.add(self.state_names[low.bit_length() - 1])
+        return names
+
+    def accepts(self, input_string):
+        """Return True if the NFA accepts the given string."""
+        successors = self.successors
+        mask = self.start_mask
+        for symbol in input_string:
+            row = successors.get(symbol) or self._row(symbol)
+            current = mask
+            mask = 0
+            while current:
+                low = current & -current
+                current ^= low
+                mask |= row[low.bit_length() - 1]
+        return bool(mask & self.final_mask)
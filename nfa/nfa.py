@@ -1,3 +1,8 @@
+from dfa.stats import no_phase
+from dfa.symbols import CharClass, has_ranges
+from nfa.bitset import BitsetNFA
+
+
 class NFA:
     def __init__(self, states, alphabet, transition, start_state, final_states):
         self.states = states                            # Set of states
@@ -14,6 +19,21 @@ class NFA:
                 result.update(self.transition[state][symbol])
         return result
 
+    def _move_ranged(self, state_set, symbol):
+        """``move`` where range labels (``CharClass``) also match the symbols they cover."""
+        result = set()
+        for state in state_set:
+            for label, targets in self.transition.get(state, {}).items():
+                if label == symbol or isinstance(label, CharClass) and label.covers(symbol):
+                    result.update(targets)
+        return result
+
+    def _in_alphabet(self, symbol, ranged):
+        if symbol in self.alphabet:
+            return True
+        return ranged and any(isinstance(label, CharClass) and label.covers(symbol)
+                              for label in self.alphabet)
+
     def lambda_closure(self, state_set):
         """Compute λ-closure (ε-closure) of a set of states"""
         stack = list(state_set)
@@ -27,12 +47,32 @@ class NFA:
                         stack.append(next_state)
         return closure
 
-    def accepts(self, input_string):
-        """Return True if the NFA accepts the given string."""
-        current_states = self.lambda_closure({self.start_state})
-        for symbol in input_string:
-            if symbol not in self.alphabet:
-                raise ValueError(f"Symbol '{symbol}' not in NFA alphabet.")
-            next_states = self.move(current_states, symbol)
-            current_states = self.lambda_closure(next_states)
-        return any(s in self.final_states for s in current_states)
+    def accepts(self, input_string, stats=None):
+        """Return True if the NFA accepts the given string.
+
+        ``stats`` (a ``dfa.stats.Stats``) records symbols processed,
+        closure calls, active states and match time.
+        """
+        phase = stats.phase if stats is not None else no_phase
+        with phase("nfa match"):
+            ranged = has_ranges(self.alphabet)
+            move = self._move_ranged if ranged else self.move
+            current_states = self.lambda_closure({self.start_state})
+            if stats is not None:
+                stats.count("nfa_strings")
+                stats.count("closure_calls")
+                stats.count("closure_states", len(current_states))
+            for symbol in input_string:
+                if not self._in_alphabet(symbol, ranged):
+                    raise ValueError(f"Symbol '{symbol}' not in NFA alphabet.")
+                next_states = move(current_states, symbol)
+                current_states = self.lambda_closure(next_states)
+                if stats is not None:
+                    stats.count("nfa_symbols")
+                    stats.count("closure_calls")
+                    stats.count("closure_states", len(current_states))
+            return any(s in self.final_states for s in current_states)
+
+    def compile(self):
+        """Return a bitmask-based simulation engine for this NFA."""
+        return BitsetNFA.from_nfa(self)
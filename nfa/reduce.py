@@ -0,0 +1,155 @@
+from nfa.nfa import NFA
+
+EPSILON = 'ε'
+
+
+def remove_epsilon(nfa):
+    """Return an equivalent NFA without ε-transitions.
+
+    A state moves on ``a`` to everything its ε-closure moves to on ``a``,
+    and is final if its closure holds a final state. States that were only
+    entered through ε-edges become unreachable and are left for ``trim``.
+    """
+    states = set(nfa.states) | set(nfa.transition)
+    transition = {}
+    final_states = set()
+    for state in states:
+        closure = nfa.lambda_closure({state})
+        if closure & set(nfa.final_states):
+            final_states.add(state)
+        moves = {}
+        for member in closure:
+            for symbol, targets in nfa.transition.get(member, {}).items():
+                if symbol != EPSILON and targets:
+                    moves.setdefault(symbol, set()).update(targets)
+        if moves:
+            transition[state] = moves
+    return NFA(
+        states=states,
+        alphabet={s for s in nfa.alphabet if s != EPSILON},
+        transition=transition,
+        start_state=nfa.start_state,
+        final_states=final_states
+    )
+
+
+def _restrict(nfa, keep):
+    transition = {}
+    for state, moves in nfa.transition.items():
+        if state not in keep:
+            continue
+        kept = {sym: set(t) & keep for sym, t in moves.items()}
+        kept = {sym: t for sym, t in kept.items() if t}
+        if kept:
+            transition[state] = kept
+    return NFA(
+        states=set(keep),
+        alphabet=set(nfa.alphabet),
+        transition=transition,
+        start_state=nfa.start_state,
+        final_states=set(nfa.final_states) & keep
+    )
+
+
+def trim_forward(nfa):
+    """Drop states not reachable from the start state."""
+    seen = {nfa.start_state}
+    stack = [nfa.start_state]
+    while stack:
+        state = stack.pop()
+        for targets in nfa.transition.get(state, {}).values():
+            for nxt in targets:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+    return _restrict(nfa, seen)
+
+
+def trim_backward(nfa):
+    """Drop states from which no final state can be reached (the start state stays)."""
+    reverse = {}
+    for src, moves in nfa.transition.items():
+        for targets in moves.values():
+            for dst in targets:
+                reverse.setdefault(dst, set()).add(src)
+    seen = set(nfa.final_states) & (set(nfa.states) | set(nfa.transition))
+    stack = list(seen)
+    while stack:
+        state = stack.pop()
+        for prev in reverse.get(state, ()):
+            if prev not in seen:
+                seen.add(prev)
+                stack.append(prev)
+    seen.add(nfa.start_state)
+    return _restrict(nfa, seen)
+
+
+def merge_bisimilar(nfa):
+    """Merge forward-bisimilar states of an ε-free NFA.
+
+    Starts from the final/non-final split and refines by each state's
+    signature (the blocks it can reach on every symbol) until stable. Each
+    merged state keeps the smallest member name, or the start state's name.
+    """
+    states = sorted(set(nfa.states) | set(nfa.transition), key=str)
+    block = {s: int(s in nfa.final_states) for s in states}
+    count = len(set(block.values()))
+    while True:
+        signatures = {}
+        new_block = {}
+        for s in states:
+            sig = (block[s], frozenset(
+                (sym, block[t])
+                for sym, targets in nfa.transition.get(s, {}).items()
+                for t in targets
+            ))
+            new_block[s] = signatures.setdefault(sig, len(signatures))
+        block = new_block
+        if len(signatures) == count:
+            break
+        count = len(signatures)
+
+    members = {}
+    for s in states:
+        members.setdefault(block[s], []).append(s)
+    rep = {}
+    for b, group in members.items():
+        name = nfa.start_state if nfa.start_state in group else group[0]
+        for s in group:
+            rep[s] = name
+
+    transition = {}
+    for s in set(rep.values()):
+        moves = {
+            sym: {rep[t] for t in targets}
+            for sym, targets in nfa.transition.get(s, {}).items()
+        }
+        if moves:
+            transition[s] = moves
+    return NFA(
+        states=set(rep.values()),
+        alphabet=set(nfa.alphabet),
+        transition=transition,
+        start_state=nfa.start_state,
+        final_states={rep[s] for s in nfa.final_states if s in rep}
+    )
+
+
+def reduce_nfa(nfa):
+    """Run the pre-determinization reduction passes on ``nfa``.
+
+    Returns ``(reduced_nfa, report)`` where ``report`` is a list of
+    ``(pass_name, states_removed)`` in the order the passes ran.
+    """
+    report = []
+    current = nfa
+    for name, pass_ in (
+        ("epsilon-removal", remove_epsilon),
+        ("forward-trim", trim_forward),
+        ("backward-trim", trim_backward),
+        ("bisimulation-merge", merge_bisimilar),
+    ):
+        before = len(set(current.states) | set(current.transition))
+        current = pass_(current)
+        report.append((name, before - len(current.states)))
+    return current, report
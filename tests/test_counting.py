@@ -0,0 +1,66 @@
+import io
+import json
+import random
+import sys
+from collections import Counter
+from itertools import islice
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from bench.generators import random_dfa
+from dfa.dfa import DFA
+from dfa.loader import parse_automaton
+from dfa.regex import regex_to_dfa
+from test_dfa import all_strings
+
+
+def shortlex(strings):
+    return sorted(strings, key=lambda s: (len(s), s))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_counts_and_enumeration_match_brute_force(seed):
+    dfa = random_dfa(10, alphabet_size=3, completeness=0.7, seed=seed)
+    accepted = [s for s in all_strings(dfa.alphabet, 6) if dfa.accepts(s)]
+    for n in range(7):
+        assert dfa.count_accepted(n) == sum(len(s) == n for s in accepted)
+    assert dfa.count_accepted(6, up_to=True) == len(accepted)
+    assert list(dfa.enumerate_accepted(6)) == shortlex(accepted)
+
+
+def test_finite_language_enumeration_terminates():
+    dfa = regex_to_dfa("ab|b|abc", minimize=True)
+    assert list(dfa.enumerate_accepted()) == ["b", "ab", "abc"]
+    empty = DFA({"q"}, {"a"}, {"q": {"a": "q"}}, "q", set())
+    assert list(empty.enumerate_accepted()) == []
+    assert empty.count_accepted(5) == 0 and empty.sample_accepted(5) is None
+
+
+def test_infinite_enumeration_is_lazy_and_counts_are_big_ints():
+    dfa = regex_to_dfa("(a|b)*")
+    assert list(islice(dfa.enumerate_accepted(), 4)) == ["", "a", "b", "aa"]
+    assert dfa.count_accepted(200) == 2 ** 200
+
+
+def test_sampling_is_uniform():
+    dfa = regex_to_dfa("a*b(a|b)*", alphabet="ab")
+    words = [s for s in all_strings(dfa.alphabet, 4) if len(s) == 4 and dfa.accepts(s)]
+    rng = random.Random(7)
+    draws = Counter(dfa.sample_accepted(4, rng) for _ in range(len(words) * 400))
+    assert set(draws) == set(words)
+    assert max(draws.values()) < 1.35 * min(draws.values())
+
+
+def test_range_labels_weigh_by_class_size():
+    doc = {"states": ["s", "t"], "alphabet": ["a-z", "0-9"], "start_state": "s",
+           "final_states": ["t"], "transition": {"s": {"a-z": "t"}, "t": {"0-9": "t"}}}
+    dfa = parse_automaton(io.StringIO(json.dumps(doc)))
+    assert dfa.count_accepted(3) == 26 * 10 * 10
+    assert list(islice(dfa.enumerate_accepted(), 3)) == ["a", "b", "c"]
+    sample = dfa.sample_accepted(3, random.Random(1))
+    assert dfa.accepts(sample) and len(sample) == 3
@@ -0,0 +1,153 @@
+import json
+import sys
+from itertools import product
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from dfa.batch import evaluate_batch
+from dfa.dfa import DFA
+
+EXAMPLES_DIR = ROOT_DIR / "examples"
+
+
+def load_example_dfa(name):
+    with open(EXAMPLES_DIR / name) as f:
+        data = json.load(f)
+    transition = {
+        s: {sym: tgt[0] if isinstance(tgt, list) else tgt for sym, tgt in m.items()}
+        for s, m in data["transition"].items()
+    }
+    return DFA(
+        states=set(data["states"]),
+        alphabet=set(data["alphabet"]),
+        transition=transition,
+        start_state=data["start_state"],
+        final_states=set(data["final_states"])
+    )
+
+
+def all_strings(alphabet, max_length):
+    for length in range(max_length + 1):
+        for prod in product(sorted(alphabet), repeat=length):
+            yield "".join(prod)
+
+
+def make_partial_dfa():
+    # Accepts a(b)* ; no transition out of q0 on 'b'
+    return DFA(
+        states={'q0', 'q1'},
+        alphabet={'a', 'b'},
+        transition={
+            'q0': {'a': 'q1'},
+            'q1': {'b': 'q1'},
+        },
+        start_state='q0',
+        final_states={'q1'}
+    )
+
+
+def test_compile_layout():
+    dfa = make_partial_dfa()
+    compiled = dfa.compile()
+    assert compiled.state_names[compiled.start] == 'q0'
+    assert compiled.n_states == 2 and compiled.n_symbols == 2
+    assert len(compiled.table) == 4
+    q1 = compiled.state_index['q1']
+    assert compiled.is_accepting(q1)
+    assert not compiled.is_accepting(compiled.start)
+    assert compiled.step(compiled.start, 'b') == compiled.MISSING
+
+
+def test_compiled_accepts_partial_table():
+    dfa = make_partial_dfa()
+    for s in ['a', 'ab', 'abbb']:
+        assert dfa.accepts(s)
+    for s in ['', 'b', 'aa', 'aba']:
+        assert not dfa.accepts(s)
+    with pytest.raises(ValueError):
+        dfa.accepts('ac')
+
+
+def test_accepts_many_matches_accepts():
+    dfa = make_partial_dfa()
+    strings = ['a', 'ab', 'abbb', '', 'b', 'aa', 'aba', 'abbbbbbbbbb']
+    result = dfa.accepts_many(strings, batch_size=3)
+    assert result.tolist() == [dfa.accepts(s) for s in strings]
+
+
+def test_accepts_many_invalid_rows():
+    dfa = make_partial_dfa()
+    accepted, invalid = dfa.accepts_many(['ab', 'ac', 'x', ''], return_invalid=True)
+    assert accepted.tolist() == [True, False, False, False]
+    assert invalid.tolist() == [False, True, True, False]
+    with pytest.raises(ValueError):
+        dfa.accepts_many(['ab', 'ac'], invalid="raise")
+
+
+def test_accepts_many_long_rows_are_not_padded():
+    dfa = make_partial_dfa()
+    long_ok = 'a' + 'b' * 1_000_000
+    long_bad = 'aa' + 'b' * 10_000 + 'x'
+    strings = ['ab', long_ok, '', 'abbb', long_bad, 'b' * 50, 'a' + 'b' * 300]
+    accepted, invalid = dfa.accepts_many(strings, return_invalid=True, batch_size=4)
+    assert accepted.tolist() == [True, True, False, True, False, False, True]
+    assert invalid.tolist() == [False, False, False, False, True, False, False]
+
+
+def test_minimize_drops_unreachable_states():
+    dfa = load_example_dfa("9_unreachable_states_dfa.json")
+    minimal = dfa.minimize()
+    assert minimal.states == {'s0', 's1', 's2'}
+    assert minimal.start_state == 's0'
+    for s in all_strings(dfa.alphabet, 5):
+        assert minimal.accepts(s) == dfa.accepts(s)
+
+
+def test_minimize_merges_equivalent_states():
+    # Parity of 1s, written with four states where two pairs are equivalent
+    dfa = DFA(
+        states={'e0', 'o0', 'e1', 'o1'},
+        alphabet={'0', '1'},
+        transition={
+            'e0': {'0': 'e1', '1': 'o0'},
+            'e1': {'0': 'e0', '1': 'o1'},
+            'o0': {'0': 'o1', '1': 'e1'},
+            'o1': {'0': 'o0', '1': 'e0'},
+        },
+        start_state='e0',
+        final_states={'o0', 'o1'}
+    )
+    minimal = dfa.minimize()
+    assert len(minimal.states) == 2
+    for s in all_strings(dfa.alphabet, 6):
+        assert minimal.accepts(s) == dfa.accepts(s)
+
+
+def test_minimize_keeps_partial_table_partial():
+    minimal = make_partial_dfa().minimize()
+    assert minimal.states == {'q0', 'q1'}
+    assert 'b' not in minimal.transition['q0']
+
+
+def test_evaluate_batch_parallel_matches_serial():
+    dfa = load_example_dfa("10_largest_test_dfa.json")
+    strings = list(all_strings(dfa.alphabet, 7)) + ['012', '']
+    serial = list(evaluate_batch(dfa, strings, workers=1))
+    parallel = list(evaluate_batch(dfa, strings, workers=2, shard_size=50))
+    assert parallel == serial
+    assert [i for i, _, _ in parallel] == list(range(len(strings)))
+    assert [ok for _, ok, _ in serial[:-2]] == [dfa.accepts(s) for s in strings[:-2]]
+    assert serial[-2][2] == "Symbol '2' not in DFA alphabet."
+
+
+def test_recompile_after_mutation():
+    dfa = make_partial_dfa()
+    assert not dfa.accepts('b')
+    dfa.transition['q0']['b'] = 'q1'
+    dfa.compile()
+    assert dfa.accepts('b')
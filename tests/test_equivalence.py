@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from bench.generators import nth_from_last, random_dfa, random_nfa
+from dfa.equivalence import (
+    dfa_counterexample,
+    dfa_equivalent,
+    equivalent,
+    inclusion_counterexample,
+    is_included,
+    is_universal,
+    universality_counterexample,
+)
+from dfa.from_nfa import nfa_to_dfa
+from dfa.regex import regex_to_dfa, regex_to_nfa
+from dfa.symbols import parse_label
+from nfa.nfa import NFA
+from test_dfa import all_strings
+
+
+def brute_force_shortest(a, b, alphabet, max_length=6):
+    for s in all_strings(alphabet, max_length):
+        if a.accepts(s) != b.accepts(s):
+            return s
+    return None
+
+
+def test_dfa_equivalence_of_conversions_and_minimization():
+    for seed in range(5):
+        nfa = random_nfa(8, alphabet_size=2, epsilon_ratio=0.3, seed=seed)
+        dfa = nfa_to_dfa(nfa)
+        assert dfa_equivalent(dfa, dfa.minimize())
+        assert dfa_equivalent(dfa, nfa_to_dfa(nfa, reduce=True))
+
+
+def test_dfa_counterexample_is_shortest():
+    for seed in range(20):
+        a = random_dfa(6, alphabet_size=2, completeness=0.8, seed=seed)
+        b = random_dfa(6, alphabet_size=2, completeness=0.8, seed=seed + 100)
+        witness = dfa_counterexample(a, b)
+        expected = brute_force_shortest(a, b, {"a", "b"})
+        if expected is None:
+            assert witness is None or len(witness) > 6
+        else:
+            assert witness is not None and len(witness) == len(expected)
+            assert a.accepts(witness) != b.accepts(witness)
+
+
+def test_partial_tables_and_alphabet_mismatch():
+    a = regex_to_dfa("ab*")
+    b = regex_to_dfa("ab*|c", alphabet={"a", "b", "c"})
+    assert dfa_counterexample(a, b) == "c"
+    assert dfa_equivalent(a, regex_to_dfa("a|ab+"))
+
+
+def test_scales_to_thousands_of_states():
+    dfa = nfa_to_dfa(nth_from_last(11))
+    assert len(dfa.states) >= 2048
+    assert dfa_equivalent(dfa, dfa.minimize())
+
+
+def test_nfa_inclusion_and_universality():
+    sub = regex_to_nfa("(a|b)*abb")
+    sup = regex_to_nfa("(a|b)*b")
+    assert is_included(sub, sup)
+    witness = inclusion_counterexample(sup, sub)
+    assert sup.accepts(witness) and not sub.accepts(witness)
+
+    assert is_universal(regex_to_nfa("(a|b)*"))
+    assert is_universal(regex_to_nfa("(a|b)*a|(a|b)*b|()"))
+    witness = universality_counterexample(regex_to_nfa("(a|b)*a|()"))
+    assert witness == "b"
+    assert universality_counterexample(regex_to_nfa("a*"), alphabet={"a", "b"}) == "b"
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_inclusion_matches_determinized_check(seed):
+    a = random_nfa(5, alphabet_size=2, density=1.0, epsilon_ratio=0.2, seed=seed)
+    b = random_nfa(5, alphabet_size=2, density=1.5, epsilon_ratio=0.2, seed=seed + 50)
+    witness = inclusion_counterexample(a, b)
+    brute = next((s for s in all_strings({"a", "b"}, 7)
+                  if a.accepts(s) and not b.accepts(s)), None)
+    assert (witness is None) == (brute is None)
+    if witness is not None:
+        assert a.accepts(witness) and not b.accepts(witness)
+    assert equivalent(a, nfa_to_dfa(a)) and equivalent(nfa_to_dfa(b), b)
+
+
+def test_mixed_range_labels():
+    az, am, nz, az_09 = (parse_label(label) for label in ("a-z", "a-m", "n-z", "[0-9a-z]"))
+    # Both accept one lowercase letter, with the alphabet cut differently
+    whole = NFA({"s", "t"}, {az}, {"s": {az: {"t"}}}, "s", {"t"})
+    halves = NFA({"s", "t", "u"}, {am, nz},
+                 {"s": {am: {"t"}, nz: {"t", "u"}}}, "s", {"t"})
+    assert is_included(whole, halves) and is_included(halves, whole)
+    assert equivalent(whole, halves)
+    assert equivalent(nfa_to_dfa(whole), halves)
+
+    first_half = NFA({"s", "t"}, {am}, {"s": {am: {"t"}}}, "s", {"t"})
+    assert is_included(first_half, whole)
+    assert inclusion_counterexample(whole, first_half) == "n"
+    assert not equivalent(nfa_to_dfa(whole), nfa_to_dfa(first_half))
+
+    loop = NFA({"s"}, {az}, {"s": {az: {"s"}}}, "s", {"s"})
+    assert is_universal(loop)
+    assert universality_counterexample(loop, alphabet={am, nz}) is None
+    assert universality_counterexample(loop, alphabet={az_09}) == "0"
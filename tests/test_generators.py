@@ -0,0 +1,41 @@
+import io
+import json
+import sys
+from pathlib import Path
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from bench import generators
+from bench.run import compare
+from dfa.from_nfa import nfa_to_dfa
+from dfa.loader import parse_automaton
+from test_dfa import all_strings
+
+
+def test_nth_from_last_blows_up_exponentially():
+    for n in range(1, 6):
+        nfa = generators.nth_from_last(n)
+        assert len(nfa_to_dfa(nfa, minimize=True).states) == 2 ** n
+        for s in all_strings({'a', 'b'}, n + 2):
+            assert nfa.accepts(s) == (len(s) >= n and s[-n] == 'a')
+
+
+def test_random_generators_are_seeded_and_round_trip_through_json():
+    a = generators.random_nfa(12, alphabet_size=3, epsilon_ratio=0.3, seed=9)
+    b = generators.random_nfa(12, alphabet_size=3, epsilon_ratio=0.3, seed=9)
+    assert a.transition == b.transition and a.final_states == b.final_states
+
+    dfa = generators.random_dfa(20, alphabet_size=3, completeness=0.7, seed=9)
+    loaded = parse_automaton(io.StringIO(json.dumps(generators.to_json(dfa))))
+    assert loaded.transition == dfa.transition
+    loaded_nfa = parse_automaton(io.StringIO(json.dumps(generators.to_json(a))), kind="nfa")
+    for s in all_strings(a.alphabet, 3):
+        assert loaded_nfa.accepts(s) == a.accepts(s)
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = {"x": {"seconds": 1.0}, "y": {"seconds": 1.0}}
+    results = {"x": {"seconds": 1.2}, "y": {"seconds": 1.3}, "new": {"seconds": 9.0}}
+    assert compare(results, baseline, 0.25) == [("y", 1.0, 1.3)]
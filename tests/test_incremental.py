@@ -0,0 +1,115 @@
+import io
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from bench.generators import nth_from_last, random_nfa
+from dfa.equivalence import dfa_equivalent
+from dfa.from_nfa import nfa_to_dfa
+from dfa.incremental import NO_CHANGE, EditableNFA
+from dfa.loader import parse_automaton
+from nfa.nfa import NFA
+
+
+def assert_matches_rebuild(editor):
+    dfa = editor.to_dfa()
+    ref = nfa_to_dfa(editor.to_nfa(), keep_subsets=True)
+    assert set(dfa.subsets.values()) == set(ref.subsets.values())
+    assert dfa_equivalent(dfa, ref)
+    for name in dfa.states:
+        assert (name in dfa.final_states) == bool(dfa.subsets[name] & editor.final_states)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_random_edits_match_full_conversion(seed):
+    rng = random.Random(seed)
+    editor = EditableNFA(random_nfa(8, alphabet_size=2, epsilon_ratio=0.2, seed=seed))
+    assert_matches_rebuild(editor)
+    symbols = sorted(editor.alphabet) + ["ε"]
+    for step in range(30):
+        states = sorted(editor.states)
+        op = rng.random()
+        if op < 0.4:
+            editor.add_transition(rng.choice(states), rng.choice(symbols), rng.choice(states))
+        elif op < 0.7:
+            edges = [(s, a, d) for s, moves in editor.transition.items()
+                     for a, targets in moves.items() for d in targets]
+            if edges:
+                editor.remove_transition(*rng.choice(edges))
+        elif op < 0.8:
+            editor.set_final(rng.choice(states), rng.random() < 0.5)
+        elif op < 0.9:
+            editor.add_state(f"n{step}")
+        else:
+            victims = [s for s in states if s != editor.start_state]
+            if victims:
+                editor.remove_state(rng.choice(victims))
+        assert_matches_rebuild(editor)
+
+
+def test_edit_reports_changed_states():
+    # 0 -a-> 1 -b-> 2; DFA {0} -a-> {1} -b-> {2}
+    nfa = NFA({"0", "1", "2"}, {"a", "b"},
+              {"0": {"a": {"1"}}, "1": {"b": {"2"}}}, "0", {"2"})
+    editor = EditableNFA(nfa)
+    names = {subset: name for name, subset in editor.to_dfa().subsets.items()}
+    one = names[frozenset({"1"})]
+
+    change = editor.add_transition("1", "b", "0")
+    assert change.changed == {one} and change.removed == {names[frozenset({"2"})]}
+    (added,) = change.added
+    assert editor.to_dfa().subsets[added] == {"0", "2"}
+    assert editor.to_dfa().accepts("abab")
+    assert editor.add_transition("1", "b", "0") is NO_CHANGE
+
+    # Names of untouched subsets survive the edit
+    assert editor.to_dfa().subsets[one] == {"1"}
+
+
+def test_set_final_rechecks_only_containing_subsets():
+    editor = EditableNFA(nth_from_last(6))
+    before = editor.to_dfa()
+    change = editor.set_final("q3")
+    assert not change.added and not change.removed
+    assert change.changed == {name for name, subset in before.subsets.items()
+                              if "q3" in subset and name not in before.final_states}
+    assert editor.to_dfa().states == before.states
+    assert_matches_rebuild(editor)
+
+
+def test_epsilon_edits_recompute_closures():
+    nfa = NFA({"s", "t", "u"}, {"a"}, {"s": {"a": {"t"}}}, "s", {"u"})
+    editor = EditableNFA(nfa)
+    assert not editor.to_dfa().accepts("a")
+    editor.add_transition("t", "ε", "u")
+    assert editor.to_dfa().accepts("a")
+    editor.add_transition("s", "ε", "u")
+    assert editor.to_dfa().accepts("")
+    editor.remove_transition("s", "ε", "u")
+    assert not editor.to_dfa().accepts("") and editor.to_dfa().accepts("a")
+    assert_matches_rebuild(editor)
+
+
+def test_invalid_edits():
+    nfa = NFA({"s", "t"}, {"a"}, {"s": {"a": {"t"}}}, "s", {"t"})
+    editor = EditableNFA(nfa)
+    with pytest.raises(ValueError):
+        editor.remove_state("s")
+    with pytest.raises(ValueError):
+        editor.remove_transition("t", "a", "s")
+    with pytest.raises(ValueError):
+        editor.add_transition("s", "a", "missing")
+    with pytest.raises(ValueError):
+        editor.add_state("t")
+
+    doc = {"states": ["s", "t"], "alphabet": ["a-z"], "start_state": "s",
+           "final_states": ["t"], "transition": {"s": {"a-z": "t"}}}
+    with pytest.raises(ValueError):
+        EditableNFA(parse_automaton(io.StringIO(json.dumps(doc))))
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from dfa.layout import DFALayout
+
+PLAIN = """graph 1 2.5 1.2
+node "" 0.27 0.6 0.75 0.5 "" solid none black lightgrey
+node q0 1.1 0.6 0.5 0.5 q0 solid circle black lightgrey
+node "q 1" 2.1 0.6 0.6 0.6 "q 1" solid doublecircle black lightgrey
+edge "" q0 4 0.54 0.6 0.62 0.6 0.7 0.6 0.79 0.6 solid black
+edge q0 "q 1" 4 1.35 0.6 1.5 0.6 1.65 0.6 1.8 0.6 a 1.6 0.7 solid black
+edge "q 1" "q 1" 4 2.1 0.9 2.2 1.1 2.0 1.1 2.1 0.9 b 2.1 1.15 solid black
+stop
+"""
+
+
+def test_plain_output_is_parsed_into_top_left_points():
+    layout = DFALayout.from_plain(PLAIN)
+    assert layout.width == pytest.approx(180)
+    assert layout.height == pytest.approx(86.4)
+    q0 = layout.nodes["q0"]
+    assert (q0.x, q0.y) == pytest.approx((79.2, 86.4 - 43.2))
+    assert layout.nodes["q 1"].shape == "doublecircle"
+    assert layout.nodes[""].shape == "none"
+
+    start, ab, loop = layout.edges
+    assert start.label is None and len(start.points) == 4
+    assert ab.label == "a"
+    assert ab.label_pos == pytest.approx((115.2, 86.4 - 50.4))
+    assert layout.edge_index == {("q0", "a"): 1, ("q 1", "b"): 2}
+
+
+def test_index_transitions_maps_symbols_to_merged_edges():
+    from dfa.dfa import DFA
+
+    layout = DFALayout.from_plain(PLAIN)
+    dfa = DFA(
+        states={"q0", "q 1"},
+        alphabet={"a", "c", "b"},
+        transition={"q0": {"a": "q 1", "c": "q 1"}, "q 1": {"b": "q 1"}},
+        start_state="q0",
+        final_states={"q 1"},
+    )
+    layout.index_transitions(dfa)
+    assert layout.edge_index == {("q0", "a"): 1, ("q0", "c"): 1, ("q 1", "b"): 2}
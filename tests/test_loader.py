@@ -0,0 +1,87 @@
+import io
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from dfa.dfa import DFA
+from dfa.loader import clear_cache, load_automaton, parse_automaton
+from nfa.nfa import NFA
+
+EXAMPLES_DIR = ROOT_DIR / "examples"
+
+
+def parse(doc, kind=None):
+    return parse_automaton(io.StringIO(json.dumps(doc)), kind)
+
+
+def doc(transition, final_states=("q1",)):
+    return {
+        "states": ["q0", "q1"],
+        "alphabet": ["a", "b"],
+        "transition": transition,
+        "start_state": "q0",
+        "final_states": list(final_states),
+    }
+
+
+def test_detects_kind_and_normalizes_targets():
+    dfa = parse(doc({"q0": {"a": ["q1"], "b": "q0"}, "q1": {"a": []}}))
+    assert isinstance(dfa, DFA)
+    assert dfa.transition == {"q0": {"a": "q1", "b": "q0"}, "q1": {}}
+
+    nfa = parse(doc({"q0": {"a": ["q0", "q1"], "b": "q0"}}))
+    assert isinstance(nfa, NFA)
+    assert nfa.transition == {"q0": {"a": {"q0", "q1"}, "b": {"q0"}}}
+    assert isinstance(parse(doc({"q0": {"ε": ["q1"]}})), NFA)
+
+
+def test_forced_kind():
+    forced = parse(doc({"q0": {"a": "q1"}}), kind="nfa")
+    assert isinstance(forced, NFA) and forced.transition == {"q0": {"a": {"q1"}}}
+    with pytest.raises(ValueError, match="nondeterministic"):
+        parse(doc({"q0": {"a": ["q0", "q1"]}}), kind="dfa")
+
+
+@pytest.mark.parametrize("bad, message", [
+    (doc({"q0": {"a": "q9"}}), "unknown state"),
+    (doc({"q0": {"c": "q1"}}), "not in alphabet"),
+    (doc({"q9": {"a": "q1"}}), "unknown state"),
+    (doc({}, final_states=["q7"]), "final states"),
+    ({"states": ["q0"]}, "missing"),
+])
+def test_rejects_invalid_documents(bad, message):
+    with pytest.raises(ValueError, match=message):
+        parse(bad)
+
+
+def test_examples_load_as_named():
+    for path in EXAMPLES_DIR.glob("*.json"):
+        if path.name == "malformed.json":
+            with pytest.raises(ValueError):
+                load_automaton(path)
+            continue
+        expected = NFA if "nfa" in path.name else DFA
+        assert isinstance(load_automaton(path), expected), path.name
+
+
+def test_cache_keyed_by_path_and_mtime(tmp_path):
+    clear_cache()
+    path = tmp_path / "a.json"
+    path.write_text(json.dumps(doc({"q0": {"a": "q1"}})))
+    first = load_automaton(path)
+    assert load_automaton(path) is first
+    assert load_automaton(path, kind="nfa") is not first
+
+    path.write_text(json.dumps(doc({"q0": {"a": "q1", "b": "q1"}})))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    reloaded = load_automaton(path)
+    assert reloaded is not first
+    assert reloaded.transition["q0"] == {"a": "q1", "b": "q1"}
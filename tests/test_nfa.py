@@ -0,0 +1,131 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from dfa.from_nfa import nfa_to_dfa
+from dfa.lazy import LazyDFA
+from dfa.stats import Stats
+from nfa.nfa import NFA
+from nfa.reduce import reduce_nfa
+from test_nfa_to_dfa import NFA_EXAMPLES, blowup_nfa, generate_strings, load_nfa
+
+
+@pytest.mark.parametrize("path", [str(p) for p in NFA_EXAMPLES])
+def test_bitset_matches_reference(path):
+    nfa = load_nfa(path)
+    engine = nfa.compile()
+    alphabet = [sym for sym in nfa.alphabet if sym != "ε"]
+    for s in generate_strings(alphabet, max_length=4):
+        assert engine.accepts(s) == nfa.accepts(s), f"{path}: mismatch for '{s}'"
+
+
+def test_bitset_epsilon_cycle_and_states_of():
+    nfa = NFA(
+        states={'A', 'B', 'C'},
+        alphabet={'0'},
+        transition={
+            'A': {'ε': {'B'}},
+            'B': {'ε': {'A', 'C'}},
+            'C': {'0': {'A'}},
+        },
+        start_state='A',
+        final_states={'C'}
+    )
+    engine = nfa.compile()
+    assert engine.states_of(engine.initial()) == {'A', 'B', 'C'}
+    assert engine.accepts('') and engine.accepts('000')
+    with pytest.raises(ValueError):
+        engine.accepts('01')
+
+
+@pytest.mark.parametrize("path", [str(p) for p in NFA_EXAMPLES])
+def test_reduced_nfa_is_equivalent(path):
+    nfa = load_nfa(path)
+    reduced, report = reduce_nfa(nfa)
+    assert [name for name, _ in report] == [
+        "epsilon-removal", "forward-trim", "backward-trim", "bisimulation-merge"
+    ]
+    assert len(reduced.states) <= len(nfa.states)
+    assert not any('ε' in moves for moves in reduced.transition.values())
+    alphabet = [sym for sym in nfa.alphabet if sym != "ε"]
+    for s in generate_strings(alphabet, max_length=4):
+        assert reduced.accepts(s) == nfa.accepts(s), f"{path}: mismatch for '{s}'"
+
+
+def test_reduce_reports_removed_states():
+    # 'X' is unreachable, 'D' cannot reach a final state, 'B' and 'C' are bisimilar
+    nfa = NFA(
+        states={'S', 'B', 'C', 'D', 'F', 'X'},
+        alphabet={'a', 'b'},
+        transition={
+            'S': {'a': {'B', 'C'}, 'b': {'D'}},
+            'B': {'b': {'F'}},
+            'C': {'b': {'F'}},
+            'D': {'a': {'D'}},
+            'X': {'a': {'F'}},
+        },
+        start_state='S',
+        final_states={'F'}
+    )
+    reduced, report = reduce_nfa(nfa)
+    assert dict(report) == {
+        "epsilon-removal": 0, "forward-trim": 1,
+        "backward-trim": 1, "bisimulation-merge": 1,
+    }
+    assert reduced.states == {'S', 'B', 'F'}
+
+    stats = Stats()
+    nfa_to_dfa(nfa, reduce=True, stats=stats)
+    assert stats.counters["reduced_states_before"] == 6
+    assert stats.counters["reduced_states_after"] == 3
+    assert stats.counters["reduce_forward_trim_removed"] == 1
+    assert stats.counters["reduce_bisimulation_merge_removed"] == 1
+
+
+@pytest.mark.parametrize("budget", [1 << 30, 20000, 1000])
+def test_lazy_dfa_matches_nfa_under_any_budget(budget):
+    nfa = blowup_nfa(12)
+    lazy = LazyDFA(nfa, max_cache_bytes=budget)
+    random.seed(budget)
+    for _ in range(100):
+        s = "".join(random.choice("01") for _ in range(random.randint(0, 80)))
+        assert lazy.accepts(s) == nfa.accepts(s), f"lazy mismatch for '{s}'"
+    if budget < 1 << 30:
+        assert lazy.flushes > 0
+
+
+def test_lazy_dfa_step_api():
+    lazy = LazyDFA(blowup_nfa(3))
+    mask = lazy.initial()
+    for sym in "1000":
+        mask = lazy.step(mask, sym)
+    assert not lazy.is_accepting(mask)
+    mask = lazy.initial()
+    for sym in "0100":
+        mask = lazy.step(mask, sym)
+    assert lazy.is_accepting(mask)
+    with pytest.raises(ValueError):
+        lazy.accepts("012")
+
+
+def test_bitset_random_fuzz():
+    random.seed(7)
+    for _ in range(10):
+        states = [f"q{i}" for i in range(5)]
+        alphabet = {'0', '1'}
+        transition = {
+            s: {sym: set(random.sample(states, random.randint(0, 2)))
+                for sym in alphabet | {'ε'}}
+            for s in states
+        }
+        finals = set(random.sample(states, 2))
+        nfa = NFA(set(states), alphabet, transition, states[0], finals)
+        engine = nfa.compile()
+        for s in generate_strings(sorted(alphabet), max_length=5):
+            assert engine.accepts(s) == nfa.accepts(s)
@@ -1,6 +1,7 @@
 import json
 import sys
 import random
+import threading
 from itertools import product
 from pathlib import Path
 
@@ -10,7 +11,11 @@ import pytest
 ROOT_DIR = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT_DIR))
 
-from dfa.from_nfa import nfa_to_dfa
+from dfa.from_nfa import (
+    ConversionAborted,
+    epsilon_closure_table,
+    nfa_to_dfa,
+)
 from nfa.nfa import NFA
 
 EXAMPLES_DIR = ROOT_DIR / "examples"
@@ -48,8 +53,12 @@ def test_nfa_conversion_matches_dfa(path, capsys):
     nfa = load_nfa(path)
     dfa = nfa_to_dfa(nfa)
     alphabet = [sym for sym in nfa.alphabet if sym != "ε"]
-    for s in generate_strings(alphabet):
-        assert nfa.accepts(s) == dfa.accepts(s), f"{path}: mismatch for '{s}'"
+    strings = list(generate_strings(alphabet))
+    for s, ok in zip(strings, dfa.accepts_many(strings)):
+        assert nfa.accepts(s) == ok, f"{path}: mismatch for '{s}'"
+    minimal = nfa_to_dfa(nfa, minimize=True)
+    assert len(minimal.states) <= len(dfa.states)
+    assert minimal.accepts_many(strings).tolist() == dfa.accepts_many(strings).tolist()
     with capsys.disabled():
         print(f"Verified {Path(path).name}")
 
@@ -174,6 +183,78 @@ def test_random_nfa_fuzz():
             assert nfa.accepts(s) == dfa.accepts(s), f"random NFA mismatch for '{s}'"
 
 
+def test_keep_subsets_records_provenance():
+    nfa = NFA(
+        states={'A', 'B', 'C'},
+        alphabet={'0'},
+        transition={'A': {'ε': {'B'}, '0': {'C'}}},
+        start_state='A',
+        final_states={'C'}
+    )
+    dfa = nfa_to_dfa(nfa, keep_subsets=True)
+    assert dfa.subsets[dfa.start_state] == frozenset({'A', 'B'})
+    assert dfa.subsets[dfa.transition[dfa.start_state]['0']] == frozenset({'C'})
+    assert not hasattr(nfa_to_dfa(nfa), "subsets")
+
+
+def blowup_nfa(n):
+    # "n-th symbol from the end is 1": 2^n reachable subsets
+    transition = {'q0': {'0': {'q0'}, '1': {'q0', 'q1'}}}
+    for i in range(1, n):
+        transition[f"q{i}"] = {'0': {f"q{i+1}"}, '1': {f"q{i+1}"}}
+    return NFA({f"q{i}" for i in range(n + 1)}, {'0', '1'}, transition,
+               'q0', {f"q{n}"})
+
+
+@pytest.mark.parametrize("limits, reason", [
+    ({"max_states": 100}, "states"),
+    ({"max_memory": 20000}, "memory"),
+    ({"max_seconds": 0.0}, "time"),
+])
+def test_conversion_budgets_abort_with_progress(limits, reason):
+    with pytest.raises(ConversionAborted) as info:
+        nfa_to_dfa(blowup_nfa(14), **limits)
+    assert info.value.reason == reason
+    assert info.value.progress.subsets < 2 ** 14
+
+
+def test_conversion_cancel_and_progress_callback():
+    reports = []
+    dfa = nfa_to_dfa(blowup_nfa(6), progress=reports.append, progress_every=10)
+    assert reports[-1].subsets == len(dfa.states) and reports[-1].frontier == 0
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(ConversionAborted, match="cancelled"):
+        nfa_to_dfa(blowup_nfa(6), cancel=cancel)
+
+
+def test_epsilon_closure_table_matches_closure():
+    # Random ε-graphs: cycles, self-loops and chains of every shape
+    random.seed(3)
+    states = [f"q{i}" for i in range(8)]
+    for _ in range(20):
+        transition = {
+            s: {'ε': set(random.sample(states, random.randint(0, 3)))}
+            for s in states
+        }
+        nfa = NFA(set(states), {'0'}, transition, states[0], {states[-1]})
+        table = epsilon_closure_table(nfa)
+        for s in states:
+            assert table[s] == nfa.lambda_closure({s}), f"closure mismatch for {s}"
+
+
+def test_undeclared_transition_targets():
+    # 'q1' and 'q2' only appear as targets, on a symbol and on ε
+    nfa = NFA({'q0'}, {'a'}, {'q0': {'a': {'q1'}}, 'q1': {'ε': {'q2'}}}, 'q0', {'q2'})
+    assert 'q1' in epsilon_closure_table(nfa)
+    dfa = nfa_to_dfa(nfa, keep_subsets=True)
+    assert dfa.accepts('a') == nfa.accepts('a') is True
+    assert not dfa.accepts('aa')
+    assert frozenset({'q1', 'q2'}) in dfa.subsets.values()
+    plain = NFA({'q0'}, {'a'}, {'q0': {'a': {'q1'}}}, 'q0', {'q1'})
+    assert nfa_to_dfa(plain, minimize=True).accepts('a')
+
+
 if __name__ == "__main__":
     # Print and run
     print("Found NFA example files:")
@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from bench.generators import random_dfa, random_nfa
+from dfa.dfa import DFA
+from dfa.from_nfa import ConversionAborted
+from dfa.product import complement, difference, intersection, symmetric_difference, union
+from dfa.regex import regex_to_dfa, regex_to_nfa
+from dfa.symbols import parse_label
+from nfa.nfa import NFA
+from test_dfa import all_strings
+
+OPS = [
+    (intersection, lambda a, b: a and b),
+    (union, lambda a, b: a or b),
+    (difference, lambda a, b: a and not b),
+    (symmetric_difference, lambda a, b: a != b),
+]
+
+
+@pytest.mark.parametrize("op, expected", OPS)
+def test_binary_operations_match_pointwise_semantics(op, expected):
+    left = random_dfa(12, alphabet_size=2, completeness=0.8, seed=1)
+    right = random_nfa(6, alphabet_size=2, epsilon_ratio=0.3, seed=2)
+    product = op(left, right)
+    materialized = product.to_dfa()
+    for s in all_strings(left.alphabet, 6):
+        want = expected(left.accepts(s), right.accepts(s))
+        assert product.accepts(s) == want, s
+        assert materialized.accepts(s) == want, s
+
+
+def test_complement_completes_partial_tables():
+    partial = DFA({"q0", "q1"}, {"a", "b"}, {"q0": {"a": "q1"}, "q1": {}}, "q0", {"q1"})
+    comp = complement(partial)
+    assert comp.accepts("") and not comp.accepts("a")
+    assert comp.accepts("b") and comp.accepts("ab") and comp.accepts("abba")
+    assert complement(partial, alphabet={"a", "b", "c"}).accepts("c")
+    assert comp.shortest_accepted() == ""
+
+
+def cycle(n, final):
+    states = [f"c{i}" for i in range(n)]
+    transition = {s: {"a": states[(i + 1) % n]} for i, s in enumerate(states)}
+    return DFA(set(states), {"a"}, transition, states[0], {states[final]})
+
+
+def test_only_reachable_pairs_are_built():
+    # Two 1000-cycles in lockstep: 10^6 pairs, but only the diagonal is reachable
+    product = union(cycle(1000, 3), cycle(1000, 7))
+    dfa = product.to_dfa()
+    assert len(dfa.states) == product.cache_states == 1000
+    assert dfa.accepts("aaa") and dfa.accepts("a" * 7) and not dfa.accepts("a" * 5)
+
+
+def test_nested_operations_and_emptiness():
+    even = regex_to_dfa("((a|b)(a|b))*")
+    has_abb = regex_to_nfa("(a|b)*abb(a|b)*")
+    both = intersection(even, has_abb)
+    witness = both.shortest_accepted()
+    assert len(witness) == 4 and both.accepts(witness)
+    assert intersection(even, complement(even)).is_empty()
+    nested = union(difference(even, has_abb), both)
+    for s in all_strings({"a", "b"}, 6):
+        assert nested.accepts(s) == even.accepts(s)
+
+
+def test_to_dfa_budget():
+    product = union(random_dfa(300, seed=4), random_dfa(300, seed=5))
+    with pytest.raises(ConversionAborted):
+        product.to_dfa(max_states=10)
+
+
+def test_products_of_range_labels():
+    az, am, nz, digits = (parse_label(label) for label in ("a-z", "a-m", "n-z", "0-9"))
+    words = DFA({"s"}, {az}, {"s": {az: "s"}}, "s", {"s"})                     # [a-z]*
+    first_half = DFA({"s", "t"}, {am}, {"s": {am: "t"}}, "s", {"t"})         # [a-m]
+    halves = NFA({"s", "t"}, {am, nz}, {"s": {am: {"t"}, nz: {"t"}}}, "s", {"t"})
+
+    comp = complement(words)
+    assert not comp.accepts("c") and not comp.accepts("")
+    assert complement(words, alphabet={az, digits}).accepts("ab7")
+
+    both = intersection(words, first_half)
+    assert not both.is_empty() and both.shortest_accepted() == "a"
+    assert both.accepts("m") and not both.accepts("n")
+    assert both.step(both.initial(), am) is not None
+    assert both.step(both.initial(), nz) is None
+    with pytest.raises(ValueError):
+        both.step(both.initial(), az)                                         # two classes
+
+    diff = difference(halves, first_half)
+    assert diff.shortest_accepted() == "n"
+    materialized = diff.to_dfa()
+    for s in ["", "a", "m", "n", "z", "nn"]:
+        assert materialized.accepts(s) == diff.accepts(s) == (s in set("nopqrstuvwxyz")), s
@@ -0,0 +1,72 @@
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from dfa.from_nfa import nfa_to_dfa
+from dfa.regex import parse_regex, regex_to_dfa, regex_to_nfa
+from test_dfa import all_strings
+
+PATTERNS = [
+    "",
+    "a",
+    "ab|c",
+    "(a|b)*abb",
+    "a+b?",
+    "(ab)*|c*",
+    "a(b|)c",
+    "[a-c]x[^a]",
+    "(.a)*",
+    "((a|b)(a|b))*",
+    "(a*)*",
+    "\\*a",
+    "((a+)+)+",
+    "(a?)+b",
+    "(ab+|c)+x",
+]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_nfa_and_direct_dfa_agree_with_re(pattern):
+    alphabet = {"a", "b", "c", "x", "*"}
+    nfa = regex_to_nfa(pattern, alphabet)
+    dfa = regex_to_dfa(pattern, alphabet)
+    compiled = re.compile(pattern)
+    for s in all_strings(alphabet, 4):
+        expected = compiled.fullmatch(s) is not None
+        assert nfa.accepts(s) == expected, (pattern, s)
+        assert dfa.accepts(s) == expected, (pattern, s)
+
+
+def test_direct_construction_is_small():
+    # (a|b)*a(a|b)^3: position automaton has 2^4 states, Thompson far more
+    pattern = "(a|b)*a(a|b)(a|b)(a|b)"
+    dfa = regex_to_dfa(pattern)
+    assert len(dfa.states) == 16
+    assert len(dfa.minimize().states) == 16
+    assert len(nfa_to_dfa(regex_to_nfa(pattern), minimize=True).states) == 16
+
+
+def test_nested_plus_is_not_duplicated():
+    # Each + adds one node: two states per level, one position in total
+    for depth in range(1, 12):
+        pattern = "(" * depth + "a" + "+)" * depth
+        assert len(regex_to_nfa(pattern).states) == 2 * depth + 2
+        dfa = regex_to_dfa(pattern)
+        assert dfa.accepts("a" * 5) and not dfa.accepts("")
+        assert len(dfa.states) == 2
+
+
+def test_alphabet_inference_and_errors():
+    _, alphabet = parse_regex("a(b|c)*")
+    assert alphabet == {"a", "b", "c"}
+    for bad in ["(a", "a)", "*a", "[a", "[c-a]"]:
+        with pytest.raises(ValueError):
+            parse_regex(bad)
+    with pytest.raises(ValueError, match="not in alphabet"):
+        parse_regex("ab", alphabet={"a"})
@@ -0,0 +1,90 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from dfa.regex import regex_to_dfa, regex_to_nfa
+from dfa.search import Searcher, search, search_file
+
+
+def brute_all(automaton, text):
+    spans = []
+    for start in range(len(text) + 1):
+        for end in range(start, len(text) + 1):
+            piece = text[start:end]
+            if all(ch in automaton.alphabet for ch in piece) and automaton.accepts(piece):
+                spans.append((start, end))
+    return spans
+
+
+def brute_leftmost_longest(automaton, text):
+    spans = brute_all(automaton, text)
+    result, pos = [], 0
+    for start in sorted({s for s, _ in spans}):
+        if start < pos:
+            continue
+        end = max(e for s, e in spans if s == start)
+        result.append((start, end))
+        pos = end if end > start else start + 1
+    return result
+
+
+PATTERNS = ["ab", "a(b|c)*", "(ab|b)c", "a*b", "b?", "(a|ab)(c|bcd)", "(a|b)*c|a"]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+@pytest.mark.parametrize("build", [regex_to_nfa, regex_to_dfa])
+def test_search_matches_brute_force(pattern, build):
+    automaton = build(pattern, alphabet="abcd")
+    rng = random.Random(pattern)
+    for _ in range(30):
+        text = "".join(rng.choice("abcdx") for _ in range(rng.randint(0, 14)))
+        assert search(automaton, text, "all") == \
+            sorted(brute_all(automaton, text)), text
+        assert search(automaton, text) == brute_leftmost_longest(automaton, text), text
+
+
+def test_leftmost_beats_earliest_end():
+    automaton = regex_to_nfa("abc|b")
+    assert search(automaton, "xabcb") == [(1, 4), (4, 5)]
+    assert search(automaton, "xabcb", "all") == [(1, 4), (2, 3), (4, 5)]
+
+
+def test_anchored_scans_stop_when_no_end_is_reachable():
+    # After "ab" the (a|b)*c branch is still alive but no c follows: each
+    # anchored scan must stop there instead of running to the end of the text
+    searcher = Searcher(regex_to_nfa("(a|b)*c|a", alphabet="abc"))
+    steps = []
+    step = searcher.anchored.step
+    searcher.anchored.step = lambda mask, sym: steps.append(sym) or step(mask, sym)
+    text = "ab" * 500
+    assert list(searcher.finditer(text)) == [(i, i + 1) for i in range(0, len(text), 2)]
+    assert len(steps) <= len(text)
+
+
+def test_chunk_boundaries_and_bytes():
+    searcher = Searcher(regex_to_dfa("ab+a"), chunk_size=3)
+    text = "xxabbbbaxabaab"
+    expected = [(2, 8), (9, 12)]
+    assert list(searcher.finditer(text)) == expected
+    assert list(searcher.finditer(text.encode())) == expected
+
+
+def test_search_file(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_bytes(b"error: disk\nok\nerror: net\n")
+    automaton = regex_to_nfa("error")
+    assert list(search_file(automaton, path, chunk_size=4)) == [(0, 5), (15, 20)]
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    assert list(search_file(automaton, empty)) == []
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        search(regex_to_nfa("a"), "a", "first")
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from bench.generators import nth_from_last
+from dfa.from_nfa import nfa_to_dfa
+from dfa.stats import Stats
+from test_nfa_to_dfa import EXAMPLES_DIR, load_nfa
+
+
+def test_conversion_counters_and_phases():
+    stats = Stats()
+    dfa = nfa_to_dfa(nth_from_last(4), minimize=True, stats=stats)
+    assert len(dfa.states) == 16
+    c = stats.counters
+    assert c["subsets_created"] == c["subsets_expanded"] == 16
+    assert c["step_cache_misses"] <= c["nfa_states"] * 2
+    assert c["step_cache_hits"] > 0
+    assert {"closure table", "subset construction", "build DFA", "minimize"} <= set(stats.phases)
+    assert "subsets_created=16" in stats.summary()
+
+
+def test_matching_counters_accumulate():
+    nfa = load_nfa(EXAMPLES_DIR / "7_epsilon_nfa.json")
+    dfa = nfa_to_dfa(nfa)
+    phases = []
+    stats = Stats(on_phase=lambda name, seconds: phases.append(name))
+    for s in ["ab", "b", "aab"]:
+        assert nfa.accepts(s, stats=stats) == dfa.accepts(s, stats=stats) == nfa.accepts(s)
+    assert stats.counters["nfa_symbols"] == stats.counters["dfa_symbols"] == 6
+    assert stats.counters["dfa_strings"] == stats.counters["nfa_strings"] == 3
+    assert stats.counters["closure_calls"] == 6 + 3
+    assert phases.count("nfa match") == phases.count("dfa match") == 3
+
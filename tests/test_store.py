@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from dfa.from_nfa import nfa_to_dfa
+from dfa import store
+from dfa.store import FormatError, cache_key, cached_compiled, load_compiled, save_compiled
+from test_dfa import all_strings
+from test_nfa_to_dfa import EXAMPLES_DIR, load_nfa
+
+
+def test_binary_round_trip_preserves_language(tmp_path):
+    dfa = nfa_to_dfa(load_nfa(EXAMPLES_DIR / "complex_epsilon_nfa.json"))
+    path = tmp_path / "complex.dfa"
+    save_compiled(dfa.compile(), path)
+
+    loaded = load_compiled(path)
+    assert loaded.state_names == dfa._compiled.state_names
+    assert loaded.symbols == dfa._compiled.symbols
+    rebuilt = loaded.to_dfa()
+    assert rebuilt.states == dfa.states and rebuilt.final_states == dfa.final_states
+    for s in all_strings(dfa.alphabet, 5):
+        assert loaded.accepts(s) == dfa.accepts(s) == rebuilt.accepts(s)
+
+
+def test_cache_builds_once_per_source_and_options(tmp_path):
+    source = EXAMPLES_DIR / "6_sample_nfa.json"
+    calls = []
+
+    def build():
+        calls.append(1)
+        return nfa_to_dfa(load_nfa(source))
+
+    first = cached_compiled(source, build, cache_dir=tmp_path)
+    second = cached_compiled(source, build, cache_dir=tmp_path)
+    assert len(calls) == 1
+    assert second.state_names == first.state_names
+    cached_compiled(source, build, cache_dir=tmp_path, minimize=True)
+    assert len(calls) == 2
+    cached_compiled(source, build, cache_dir=tmp_path, minimize=True, reduce=True)
+    assert len(calls) == 3
+
+
+def test_cache_key_tracks_converter_version(monkeypatch):
+    key = cache_key(b"{}", kind="nfa")
+    assert cache_key(b"{}", kind="nfa") == key
+    assert cache_key(b"{}", kind="nfa", reduce=True) != key
+    monkeypatch.setattr(store, "CONVERTER_VERSION", store.CONVERTER_VERSION + 1)
+    assert cache_key(b"{}", kind="nfa") != key
+
+
+def test_rejects_truncated_and_foreign_files(tmp_path):
+    dfa = nfa_to_dfa(load_nfa(EXAMPLES_DIR / "6_sample_nfa.json"))
+    path = tmp_path / "a.dfa"
+    save_compiled(dfa.compile(), path)
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(FormatError):
+        load_compiled(path)
+    path.write_bytes(b"not an automaton at all, just text")
+    with pytest.raises(FormatError):
+        load_compiled(path)
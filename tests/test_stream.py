@@ -0,0 +1,60 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from dfa.dfa import DFA
+from dfa.stream import StreamMatcher, match_file
+from test_nfa_to_dfa import EXAMPLES_DIR, load_nfa
+
+
+def parity_dfa():
+    # Odd number of 1s
+    return DFA(
+        states={'e', 'o'},
+        alphabet={'0', '1'},
+        transition={'e': {'0': 'e', '1': 'o'}, 'o': {'0': 'o', '1': 'e'}},
+        start_state='e',
+        final_states={'o'}
+    )
+
+
+def test_feed_in_chunks_matches_accepts():
+    dfa = parity_dfa()
+    text = "0110100111"
+    matcher = StreamMatcher(dfa)
+    for i in range(0, len(text), 3):
+        matcher.feed(text[i:i + 3])
+    assert matcher.is_accepting() == dfa.accepts(text)
+    assert matcher.consumed == len(text)
+    matcher.reset()
+    assert not matcher.is_accepting() and matcher.consumed == 0
+
+
+def test_snapshot_round_trip_through_json():
+    nfa = load_nfa(EXAMPLES_DIR / "6_sample_nfa.json")
+    matcher = StreamMatcher(nfa).feed("0").feed(b"0")
+    snap = json.loads(json.dumps(matcher.snapshot()))
+    resumed = StreamMatcher(nfa).restore(snap).feed("1")
+    assert resumed.is_accepting() == nfa.accepts("001")
+    with pytest.raises(ValueError):
+        StreamMatcher(parity_dfa()).restore(snap)
+
+
+def test_invalid_symbol_reports_offset():
+    matcher = StreamMatcher(parity_dfa()).feed("01")
+    with pytest.raises(ValueError, match="offset 3"):
+        matcher.feed(b"1x")
+
+
+def test_match_file_uses_memory_map(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"01" * 5000 + b"1")
+    assert match_file(parity_dfa(), path, chunk_size=777)
+    path.write_bytes(b"")
+    assert not match_file(parity_dfa(), path)
@@ -0,0 +1,117 @@
+import io
+import json
+import pickle
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from dfa.dfa import DFA
+from dfa.from_nfa import nfa_to_dfa
+from dfa.loader import parse_automaton
+from dfa.stats import Stats
+from dfa.store import load_compiled, save_compiled
+from dfa.symbols import CharClass, SymbolClasses, parse_label
+from nfa.nfa import NFA
+
+
+def parse(doc):
+    return parse_automaton(io.StringIO(json.dumps(doc)))
+
+
+IDENTIFIER = {
+    "states": ["s", "id", "num"],
+    "alphabet": ["a-z", "0-9", "_"],
+    "start_state": "s",
+    "final_states": ["id", "num"],
+    "transition": {
+        "s": {"a-z": "id", "_": "id", "0-9": "num"},
+        "id": {"a-z": "id", "0-9": "id", "_": "id"},
+        "num": {"0-9": "num"},
+    },
+}
+
+# Σ+ · [a-z] over all byte values: two or more bytes, the last one a lowercase letter
+ENDS_LOWER = {
+    "states": ["p", "q", "r"],
+    "alphabet": ["\u0000-ÿ"],
+    "start_state": "p",
+    "final_states": ["r"],
+    "transition": {"p": {"\u0000-ÿ": ["p", "q"]}, "q": {"a-z": ["r"]}},
+}
+
+
+def test_labels_round_trip():
+    assert parse_label("a") == "a" and not isinstance(parse_label("a"), CharClass)
+    assert parse_label("a-z").intervals == ((97, 122),)
+    both = CharClass.union([parse_label("x-z"), "a", "b", "-"])
+    assert parse_label(str(both)).intervals == both.intervals
+    assert pickle.loads(pickle.dumps(both)).intervals == both.intervals
+    assert both.covers("-") and both.covers("y") and not both.covers("c")
+    with pytest.raises(ValueError):
+        parse_label("z-a")
+
+
+def test_minimal_classes():
+    classes = SymbolClasses.from_labels([parse_label("a-z"), "e", parse_label("x-~"), "10"])
+    assert classes.n_classes == 5                    # a-z∖{e,x-z}, e, x-z, {-~, "10"
+    assert classes.classify("a") == classes.classify("q")
+    assert classes.classify("e") != classes.classify("a")
+    assert classes.classify("y") != classes.classify("~")
+    assert classes.classify("!") is None and classes.classify("10") is not None
+
+
+def test_ranged_dfa_from_json():
+    dfa = parse(IDENTIFIER)
+    assert isinstance(dfa, DFA)
+    assert dfa.accepts("ab_9") and dfa.accepts("42") and not dfa.accepts("4a")
+    with pytest.raises(ValueError):
+        dfa.accepts("A")
+    compiled = dfa.compile()
+    assert compiled.n_symbols == 2                   # [_a-z] and 0-9 share nothing else
+    assert dfa.minimize().accepts("x1")
+
+
+def test_labels_must_be_in_alphabet_and_overlaps_are_nondeterministic():
+    bad = dict(IDENTIFIER, transition={"s": {"A-Z": "id"}})
+    with pytest.raises(ValueError):
+        parse(bad)
+    overlap = dict(IDENTIFIER, transition={"s": {"a-z": "id", "x": "num"}})
+    assert isinstance(parse(overlap), NFA)
+
+
+def test_conversion_runs_over_classes():
+    nfa = parse(ENDS_LOWER)
+    stats = Stats()
+    dfa = nfa_to_dfa(nfa, stats=stats)
+    assert stats.counters["symbol_columns"] == 2     # not 256
+    rng = random.Random(0)
+    for _ in range(200):
+        s = "".join(chr(rng.randrange(256)) for _ in range(rng.randint(0, 6)))
+        assert dfa.accepts(s) == nfa.accepts(s) == nfa.compile().accepts(s), s
+    minimal = dfa.minimize()
+    assert len(minimal.states) == 3
+
+
+def test_plain_alphabet_columns_are_merged():
+    nfa = NFA({"0", "1"}, {"a", "b", "c"},
+              {"0": {"a": {"0", "1"}, "b": {"0", "1"}, "c": {"0"}}}, "0", {"1"})
+    stats = Stats()
+    dfa = nfa_to_dfa(nfa, stats=stats)
+    assert stats.counters["symbol_columns"] == 2
+    assert dfa.alphabet == {"a", "b", "c"}
+    assert dfa.accepts("cb") and not dfa.accepts("ac")
+
+
+def test_ranged_compiled_store_round_trip(tmp_path):
+    compiled = nfa_to_dfa(parse(ENDS_LOWER), minimize=True).compile()
+    path = tmp_path / "lower.dfa"
+    save_compiled(compiled, path)
+    loaded = load_compiled(path)
+    assert loaded.symbols == compiled.symbols
+    assert loaded.accepts("ÿq") and not loaded.accepts("qÿ")
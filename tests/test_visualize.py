@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on the path for imports
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from graphviz import Digraph
+
+from dfa import visualize
+from dfa.dfa import DFA
+from dfa.symbols import parse_label
+from dfa.visualize import (
+    LARGE_EDGES, LARGE_STATES, dfa_digraph, format_symbols, is_large,
+    neighbourhood, sink_states, visualize_dfa,
+)
+
+
+def chain(n, alphabet=("a",)):
+    """q0 -> q1 -> ... -> q{n-1} on every symbol, last state accepting."""
+    states = [f"q{i}" for i in range(n)]
+    transition = {states[i]: {sym: states[i + 1] for sym in alphabet} for i in range(n - 1)}
+    return DFA(set(states), set(alphabet), transition, states[0], {states[-1]})
+
+
+def with_dead():
+    # s -a-> f, s -b-> DEAD, f -a,b,c,d-> DEAD, DEAD loops
+    return DFA(
+        {"s", "f", "DEAD"}, {"a", "b", "c", "d"},
+        {"s": {"a": "f", "b": "DEAD"},
+         "f": {sym: "DEAD" for sym in "abcd"},
+         "DEAD": {sym: "DEAD" for sym in "abcd"}},
+        "s", {"f"}
+    )
+
+
+def test_format_symbols_collapses_runs():
+    assert format_symbols(["d", "b", "a", "c"]) == "a-d"
+    assert format_symbols(["a", "b"]) == "a,b"
+    assert format_symbols(["a", "b", "c", "x", "0", "1", "2", "3"]) == "0-3,a-c,x"
+    assert format_symbols([parse_label("a-z"), "0", "1", "2"]) == "0-2,a-z"
+
+
+def test_sinks_are_hidden():
+    dfa = with_dead()
+    assert sink_states(dfa) == {"DEAD"}
+    source = dfa_digraph(dfa, hide_sinks=True).source
+    assert "DEAD" not in source
+    assert "DEAD" in dfa_digraph(dfa).source
+
+
+def test_merged_edges_carry_collapsed_labels():
+    source = dfa_digraph(with_dead(), merge_edges=True).source
+    assert source.count("f -> DEAD") == 1
+    assert 'f -> DEAD [label="a-d"]' in source
+    assert dfa_digraph(with_dead()).source.count("f -> DEAD") == 4
+
+
+def test_focus_draws_k_hop_neighbourhood():
+    dfa = chain(8)
+    assert neighbourhood(dfa, "q4", 2) == {"q2", "q3", "q4", "q5", "q6"}
+    assert neighbourhood(dfa, "q0", 0) == {"q0"}
+    source = dfa_digraph(dfa, focus="q4", radius=1).source
+    assert "q3 -> q4" in source and "q4 -> q5" in source
+    assert "q2" not in source and "q6" not in source
+
+
+def test_large_thresholds():
+    assert not is_large(chain(LARGE_STATES))
+    assert is_large(chain(LARGE_STATES + 1))
+    symbols = [chr(0x100 + i) for i in range(LARGE_EDGES // 2)]
+    assert not is_large(chain(3, symbols))                  # exactly LARGE_EDGES edges
+    assert is_large(chain(3, symbols + ["a"]))
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Capture the Digraph ``visualize_dfa`` would render, without calling ``dot``."""
+    graphs = []
+
+    def render(self, filename, cleanup=False, view=False):
+        graphs.append(self)
+        return f"{filename}.{self.format}"
+
+    monkeypatch.setattr(Digraph, "render", render)
+    monkeypatch.setattr(visualize, "print", lambda *args: None, raising=False)
+    return graphs
+
+
+def test_large_mode_defaults_and_overrides(rendered):
+    small = with_dead()
+    big = chain(LARGE_STATES + 1)
+    assert visualize_dfa(small, "g") == "g.png"
+    assert visualize_dfa(big, "g") == "g.svg"
+    assert rendered[-1].engine == "sfdp"
+
+    assert visualize_dfa(big, "g", large=False) == "g.png"
+    assert rendered[-1].engine == "dot"
+    visualize_dfa(small, "g", large=True)
+    assert rendered[-1].format == "svg" and "DEAD" not in rendered[-1].source
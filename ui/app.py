@@ -1,11 +1,11 @@
 import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import HORIZONTAL, LEFT, VERTICAL
-from tkinter import Listbox, messagebox, scrolledtext
-from PIL import Image, ImageTk
-import json
+from tkinter import Listbox, filedialog, messagebox, scrolledtext
+from concurrent.futures import ThreadPoolExecutor
 import os
 import sys
+import threading
 
 if __name__ == "__main__" and __package__ is None:
     sys.path.insert(
@@ -14,14 +14,27 @@ if __name__ == "__main__" and __package__ is None:
     )
 
 
-from dfa.dfa import DFA
-from dfa.from_nfa import nfa_to_dfa
+from dfa.from_nfa import ConversionAborted, nfa_to_dfa
+from dfa.incremental import EditableNFA
+from dfa.layout import DFALayout
+from dfa.loader import load_automaton
+from dfa.stats import Stats
+from dfa.store import cached_compiled
+from dfa.symbols import matching_label
 from dfa.utils import print_dfa_table
 from dfa.visualize import visualize_dfa
 from nfa.nfa import NFA
-from main import is_probably_nfa
 
 class AutomataApp:
+    # Conversion budgets: reject pathological NFAs instead of hanging the UI
+    MAX_DFA_STATES = 20000
+    MAX_CONVERSION_SECONDS = 10
+    # Conversion options; they are also part of the compiled-cache key
+    CONVERSION_OPTIONS = {"minimize": False, "reduce": False}
+    # How often (ms) the Tk thread polls the background worker
+    POLL_MS = 50
+    BATCH_CHUNK = 65536
+
     def __init__(self, root):
         self.root = root
         self.root.title("Automata Simulator")
@@ -35,6 +48,15 @@ class AutomataApp:
         self.graph_path = os.path.join(self.base_dir, 'dfa_graph.png')
 
         # ---- outer horizontal pane: controls | right_pane ----
+        # status bar: instrumentation readout of the last load / test
+        self.stats_label = ttk.Label(
+            root,
+            text="",
+            font=("Arial", 9),
+            anchor="w"
+        )
+        self.stats_label.pack(side="bottom", fill="x", padx=5, pady=(0, 2))
+
         self.h_pane = ttk.PanedWindow(root, orient=HORIZONTAL)
         self.h_pane.pack(fill="both", expand=True)
 
@@ -56,12 +78,32 @@ class AutomataApp:
 
         # automaton state
         self.dfa = None
+        self.compiled = None
+        self.automaton = None           # the loaded DFA/NFA, source for edits
+        self.editor = None              # EditableNFA, created on the first edit
         self.input_string = ""
         self.current_index = 0
         self.current_state = None
         self.highlight_edges = None
         self.highlight_nodes = None
 
+        # background work: loads, batch tests and renders run on worker
+        # threads and their results are picked up on the Tk thread via
+        # root.after polling (one job and one render at a time)
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.cancel_event = threading.Event()
+        self.job_future = None          # load / batch job in flight
+        self.render_future = None       # layout / PNG export in flight
+        self.pending_render = None      # newest render request not yet started
+
+        # graph canvas: layout is computed once per DFA, steps only recolor
+        self.layout = None
+        self.layout_dfa = None
+        self.node_items = {}            # state → canvas oval ids
+        self.edge_items = []            # edge position → (line id, label id)
+        self.highlighted = ([], [])     # (edge positions, states) drawn in color
+        self.progress_text = ""         # written by the worker, shown by the poller
+
         self.build_gui()
 
     def build_gui(self):
@@ -116,6 +158,55 @@ class AutomataApp:
             bootstyle="primary",
             command=self.render_graph
         ).pack(fill="x", pady=(0, 8))
+        ttk.Button(
+            self.ctrl_frame,
+            text="Test Strings File",
+            bootstyle="primary",
+            command=self.test_file
+        ).pack(fill="x", pady=(0, 8))
+
+        # --- Edit the loaded automaton; the DFA is updated incrementally ---
+        ef = ttk.LabelFrame(self.ctrl_frame, text="Edit NFA")
+        ef.pack(fill="x", pady=(0, 8))
+        self.edit_entries = {}
+        for row, name in enumerate(("From", "Symbol", "To")):
+            ttk.Label(ef, text=f"{name}:").grid(row=row, column=0, sticky="w", padx=5)
+            entry = ttk.Entry(ef, width=12)
+            entry.grid(row=row, column=1, sticky="ew", padx=5, pady=1)
+            self.edit_entries[name] = entry
+        ef.columnconfigure(1, weight=1)
+        for row, (text, command) in enumerate((
+            ("Add Transition", self.edit_add_transition),
+            ("Remove Transition", self.edit_remove_transition),
+            ("Toggle Final (From)", self.edit_toggle_final),
+        ), start=3):
+            ttk.Button(
+                ef,
+                text=text,
+                bootstyle="secondary",
+                command=command
+            ).grid(row=row, column=0, columnspan=2, sticky="ew", padx=5, pady=1)
+
+        # --- Background job status ---
+        self.progress_bar = ttk.Progressbar(
+            self.ctrl_frame,
+            mode="indeterminate"
+        )
+        self.progress_bar.pack(fill="x", pady=(8, 2))
+        self.status_label = ttk.Label(
+            self.ctrl_frame,
+            text="",
+            font=("Arial", 9)
+        )
+        self.status_label.pack(anchor="w")
+        self.cancel_button = ttk.Button(
+            self.ctrl_frame,
+            text="Cancel",
+            bootstyle="warning",
+            state="disabled",
+            command=self.cancel_job
+        )
+        self.cancel_button.pack(fill="x", pady=(2, 8))
 
         # --- Logs & Table (in log_frame) ---
         ttk.Label(
@@ -152,8 +243,8 @@ class AutomataApp:
         ).pack(anchor="e", padx=5, pady=(0, 5))
 
         # --- Graph (in graph_frame) ---
-        self.image_label = ttk.Label(self.graph_frame)
-        self.image_label.pack(fill="both", expand=True, padx=5, pady=5)
+        self.canvas = tk.Canvas(self.graph_frame, bg="#fff", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True, padx=5, pady=5)
 
     def populate_file_list(self):
         self.file_list.delete(0, tk.END)
@@ -161,6 +252,57 @@ class AutomataApp:
             if f.endswith(".json"):
                 self.file_list.insert(tk.END, f)
 
+    # ---- background jobs ----
+
+    def _start_job(self, label, work, on_done):
+        """Run ``work(cancel)`` on the worker thread; ``on_done(result)`` runs on Tk."""
+        if self.job_future is not None:
+            messagebox.showwarning("Warning", "Another job is still running.")
+            return
+        self.cancel_event = threading.Event()
+        self.progress_text = label
+        self.status_label.config(text=label)
+        self.cancel_button.config(state="normal")
+        self.progress_bar.start(10)
+        self.job_future = self.executor.submit(work, self.cancel_event)
+        self.root.after(self.POLL_MS, self._poll_job, on_done)
+
+    def _poll_job(self, on_done):
+        future = self.job_future
+        if future is None:
+            return
+        if not future.done():
+            self.status_label.config(text=self.progress_text)
+            self.root.after(self.POLL_MS, self._poll_job, on_done)
+            return
+        self.job_future = None
+        self.progress_bar.stop()
+        self.cancel_button.config(state="disabled")
+        self.status_label.config(text="")
+        try:
+            result = future.result()
+        except ConversionAborted as e:
+            if e.reason == "cancelled":
+                self.status_label.config(text="Cancelled.")
+            else:
+                messagebox.showerror("Error", f"Failed to load: {e}")
+            return
+        except Exception as e:
+            messagebox.showerror("Error", f"Job failed: {e}")
+            return
+        on_done(result)
+
+    def cancel_job(self):
+        self.cancel_event.set()
+        self.status_label.config(text="Cancelling…")
+
+    def _report_progress(self, progress):
+        # Called on the worker thread; the poller copies it into the label
+        self.progress_text = (
+            f"{progress.subsets} subsets, {progress.frontier} pending "
+            f"({progress.elapsed:.1f}s)"
+        )
+
     def load_selected_file(self):
         sel = self.file_list.curselection()
         if not sel:
@@ -168,58 +310,156 @@ class AutomataApp:
             return
         fname = self.file_list.get(sel[0])
         path = os.path.join(self.examples_dir, fname)
-        try:
-            with open(path) as f:
-                data = json.load(f)
-            # build transition
-            trans = {
-                s: {
-                    sym: set(tgt if isinstance(tgt, list) else [tgt])
-                    for sym, tgt in m.items()
-                }
-                for s, m in data["transition"].items()
-            }
-            # detect NFA
-            if is_probably_nfa(path):
-                nfa = NFA(
-                    states=set(data["states"]),
-                    alphabet=set(data["alphabet"]),
-                    transition=trans,
-                    start_state=data["start_state"],
-                    final_states=set(data["final_states"])
-                )
-                self.dfa = nfa_to_dfa(nfa)
-                messagebox.showinfo(
-                    "Info",
-                    f"NFA → DFA loaded from '{fname}'."
-                )
+
+        def work(cancel):
+            stats = Stats()
+            with stats.phase("load"):
+                automaton = load_automaton(path)
+            if isinstance(automaton, NFA):
+                dfa = cached_compiled(
+                    path,
+                    lambda: nfa_to_dfa(
+                        automaton,
+                        max_states=self.MAX_DFA_STATES,
+                        max_seconds=self.MAX_CONVERSION_SECONDS,
+                        progress=self._report_progress,
+                        cancel=cancel,
+                        stats=stats,
+                        **self.CONVERSION_OPTIONS
+                    ),
+                    kind="nfa",
+                    **self.CONVERSION_OPTIONS
+                ).to_dfa()
+                message = f"NFA → DFA loaded from '{fname}'."
             else:
-                dfa_trans = {
-                    s: {sym: list(tgt)[0] for sym, tgt in m.items()}
-                    for s, m in trans.items()
-                }
-                self.dfa = DFA(
-                    states=set(data["states"]),
-                    alphabet=set(data["alphabet"]),
-                    transition=dfa_trans,
-                    start_state=data["start_state"],
-                    final_states=set(data["final_states"])
-                )
-                messagebox.showinfo("Info", f"DFA loaded from '{fname}'.")
-            # reset state
-            self.current_index = 0
-            self.current_state = self.dfa.start_state
-            self.highlight_edges = None
-            self.highlight_nodes = None
-            self.alphabet_label.config(
-                text=f"Valid alphabet: {', '.join(self.dfa.alphabet)}"
-            )
-            self.result_label.config(text="")
-            self.log_text.delete("1.0", tk.END)
-            self.table_text.delete("1.0", tk.END)
-            self.capture_transition_table()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load: {e}")
+                dfa = automaton
+                message = f"DFA loaded from '{fname}'."
+            return automaton, dfa, dfa._compiled or dfa.compile(), message, stats
+
+        self._start_job(f"Loading {fname}…", work, self._on_loaded)
+
+    def _on_loaded(self, result):
+        self.automaton, self.dfa, self.compiled, message, stats = result
+        self.editor = None
+        self.stats_label.config(text=stats.summary())
+        # reset state
+        self.current_index = 0
+        self.current_state = self.dfa.start_state
+        self.highlight_edges = None
+        self.highlight_nodes = None
+        self.alphabet_label.config(
+            text=f"Valid alphabet: {', '.join(self.dfa.alphabet)}"
+        )
+        self.result_label.config(text="")
+        self.log_text.delete("1.0", tk.END)
+        self.table_text.delete("1.0", tk.END)
+        self.capture_transition_table()
+        # Drop the previous DFA's drawing and lay the new one out once, now
+        self.canvas.delete("all")
+        self.layout = None
+        self.layout_dfa = None
+        self.node_items = {}
+        self.edge_items = []
+        self.highlighted = ([], [])
+        self._request_render(None, [self.current_state])
+        messagebox.showinfo("Info", message)
+
+    def test_file(self):
+        if not self.dfa:
+            messagebox.showwarning("Warning", "Load an automaton first.")
+            return
+        path = filedialog.askopenfilename(
+            title="Select input strings (one per line)",
+            filetypes=[("Text files", "*.txt"), ("All files", "*")]
+        )
+        if not path:
+            return
+        compiled = self.compiled
+        chunk_size = self.BATCH_CHUNK
+
+        def work(cancel):
+            accepted = rejected = invalid = 0
+            with open(path, "r", encoding="utf-8") as f:
+                while True:
+                    if cancel.is_set():
+                        return None
+                    chunk = [line.rstrip("\r\n")
+                             for _, line in zip(range(chunk_size), f)]
+                    if not chunk:
+                        break
+                    ok, bad = compiled.accepts_many(chunk, return_invalid=True)
+                    n_ok = int(ok.sum())
+                    n_bad = int(bad.sum())
+                    accepted += n_ok
+                    invalid += n_bad
+                    rejected += len(chunk) - n_ok - n_bad
+                    self.progress_text = (
+                        f"{accepted + rejected + invalid} strings tested"
+                    )
+            return accepted, rejected, invalid
+
+        self._start_job(
+            f"Testing {os.path.basename(path)}…", work, self._on_file_tested
+        )
+
+    def _on_file_tested(self, counts):
+        if counts is None:
+            self.status_label.config(text="Cancelled.")
+            return
+        accepted, rejected, invalid = counts
+        self.log_text.insert(
+            tk.END,
+            f"[BATCH] {accepted} accepted, {rejected} rejected, "
+            f"{invalid} invalid\n"
+        )
+
+    # ---- editing ----
+
+    def _edit(self, apply):
+        """Run ``apply(editor)`` and show the incrementally updated DFA."""
+        if not self.automaton:
+            messagebox.showwarning("Warning", "Load an automaton first.")
+            return
+        try:
+            if self.editor is None:
+                self.editor = EditableNFA(self.automaton)
+            change = apply(self.editor)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.dfa = self.editor.to_dfa()
+        self.compiled = self.dfa.compile()
+        self.current_index = 0
+        self.current_state = self.dfa.start_state
+        self.highlight_edges = None
+        self.highlight_nodes = sorted(change.added | change.changed)
+        self.alphabet_label.config(
+            text=f"Valid alphabet: {', '.join(self.dfa.alphabet)}"
+        )
+        self.log_text.insert(
+            tk.END,
+            f"[EDIT] +{len(change.added)} -{len(change.removed)} "
+            f"~{len(change.changed)} DFA states\n"
+        )
+        self.table_text.delete("1.0", tk.END)
+        self.capture_transition_table()
+        if self.layout is not None:
+            self._request_render(None, self.highlight_nodes)
+
+    def _edit_fields(self):
+        return tuple(self.edit_entries[name].get().strip() for name in ("From", "Symbol", "To"))
+
+    def edit_add_transition(self):
+        src, symbol, dst = self._edit_fields()
+        self._edit(lambda editor: editor.add_transition(src, symbol or "ε", dst))
+
+    def edit_remove_transition(self):
+        src, symbol, dst = self._edit_fields()
+        self._edit(lambda editor: editor.remove_transition(src, symbol or "ε", dst))
+
+    def edit_toggle_final(self):
+        src, _, _ = self._edit_fields()
+        self._edit(lambda editor: editor.set_final(src, src not in editor.final_states))
 
     def capture_transition_table(self):
         import io
@@ -236,8 +476,9 @@ class AutomataApp:
         self.result_label.config(text="")
         self.log_text.delete("1.0", tk.END)
         self.table_text.delete("1.0", tk.END)
-        self.image_label.config(image='')
-        self.image_label.image = None
+        self.canvas.delete("all")
+        self.layout = None
+        self.layout_dfa = None
         self.current_index = 0
         self.current_state = self.dfa.start_state if self.dfa else None
         self.highlight_edges = None
@@ -250,14 +491,16 @@ class AutomataApp:
         s = self.input_entry.get().strip()
         # invalid-symbol check
         for ch in s:
-            if ch not in self.dfa.alphabet:
+            if self.compiled.column(ch) is None:
                 self.result_label.config(
                     text=f"Error: '{ch}' not in alphabet",
                     foreground="orange"
                 )
                 return
         try:
-            ok = self.dfa.accepts(s)
+            stats = Stats()
+            ok = self.dfa.accepts(s, stats=stats)
+            self.stats_label.config(text=stats.summary())
             self.result_label.config(
                 text="✅ Accepted" if ok else "❌ Rejected",
                 foreground="green" if ok else "red"
@@ -276,17 +519,11 @@ class AutomataApp:
         if self.current_index < len(self.input_string):
             sym = self.input_string[self.current_index]
             try:
-                nxt = self.dfa.transition[self.current_state][sym]
-                self.highlight_edges = [(self.current_state, sym)]
+                label = matching_label(self.dfa.transition[self.current_state], sym)
+                nxt = self.dfa.transition[self.current_state][label]
+                self.highlight_edges = [(self.current_state, label)]
                 self.highlight_nodes = [nxt]
-                visualize_dfa(
-                    self.dfa,
-                    view=False,
-                    filename=self.graph_path[:-4],
-                    highlight_edges=self.highlight_edges,
-                    highlight_nodes=self.highlight_nodes
-                )
-                self._load_graph_image()
+                self._request_render(self.highlight_edges, self.highlight_nodes)
                 self.log_text.insert(
                     tk.END,
                     f"Step {self.current_index+1}: "
@@ -312,42 +549,164 @@ class AutomataApp:
         )
         self.log_text.insert(tk.END, f"[CURRENT STATE] {self.current_state}\n")
         self.current_index = 0
-        self.render_graph()
+        # Recolor the cached layout; dfa_graph.png is only written by render_graph
+        self._request_render(self.highlight_edges, [self.current_state])
 
     def render_graph(self):
         if not self.dfa:
             messagebox.showwarning("Warning", "No DFA to render.")
             return
-        
-        visualize_dfa(
-            self.dfa,
-            view=False,
-            filename=self.graph_path[:-4],
-            highlight_edges=self.highlight_edges,
-            highlight_nodes=(
-                [self.current_state] if self.current_state else None
-            )
+        self._request_render(
+            self.highlight_edges,
+            [self.current_state] if self.current_state else None,
+            export=True
         )
-        self._load_graph_image()
 
-    def _load_graph_image(self):
+    def _request_render(self, highlight_edges, highlight_nodes, export=False):
+        """Show highlights on the graph canvas.
+
+        With a cached layout for the current DFA this only recolors canvas
+        items. Otherwise the layout (and, with ``export``, ``dfa_graph.png``)
+        is produced on the worker; requests made meanwhile collapse to the
+        newest.
+        """
+        if self.layout is not None and self.layout_dfa is self.dfa and not export:
+            self._apply_highlight(highlight_edges, highlight_nodes)
+            return
+        pending = self.pending_render
+        export = export or (pending is not None and pending[3])
+        self.pending_render = (self.dfa, highlight_edges, highlight_nodes, export)
+        if self.render_future is None:
+            self._start_render()
+
+    def _start_render(self):
+        dfa, highlight_edges, highlight_nodes, export = self.pending_render
+        self.pending_render = None
+        layout = self.layout if self.layout_dfa is dfa else None
+        self.render_future = self.executor.submit(
+            self._render_layout, dfa, layout, export,
+            highlight_edges, highlight_nodes
+        )
+        self.root.after(self.POLL_MS, self._poll_render, dfa,
+                        highlight_edges, highlight_nodes)
+
+    def _render_layout(self, dfa, layout, export, highlight_edges, highlight_nodes):
+        # Worker thread: Graphviz subprocesses only
+        if export:
+            visualize_dfa(
+                dfa,
+                view=False,
+                filename=self.graph_path[:-4],
+                highlight_edges=highlight_edges,
+                highlight_nodes=highlight_nodes
+            )
+        return layout or DFALayout.from_dfa(dfa)
+
+    def _poll_render(self, dfa, highlight_edges, highlight_nodes):
+        future = self.render_future
+        if not future.done():
+            self.root.after(self.POLL_MS, self._poll_render, dfa,
+                            highlight_edges, highlight_nodes)
+            return
+        self.render_future = None
         try:
-            img = Image.open(self.graph_path)
-            img.thumbnail((800, 400), Image.Resampling.LANCZOS)
-            tkimg = ImageTk.PhotoImage(img)
-            self.image_label.config(image=tkimg)
-            self.image_label.image = tkimg
+            layout = future.result()
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load image: {e}")
+            self.pending_render = None
+            messagebox.showerror("Error", f"Failed to render graph: {e}")
+            return
+        if dfa is self.dfa and self.layout_dfa is not dfa:
+            self.layout = layout
+            self.layout_dfa = dfa
+            self._draw_layout()
+        if self.pending_render is not None:
+            # Newer request arrived meanwhile; it wins over this one
+            dfa, highlight_edges, highlight_nodes, export = self.pending_render
+            if export or self.layout_dfa is not dfa:
+                self._start_render()
+                return
+            self.pending_render = None
+        if dfa is self.dfa and self.layout_dfa is dfa:
+            self._apply_highlight(highlight_edges, highlight_nodes)
+
+    def _draw_layout(self):
+        """Create one canvas item per node, edge and label of the cached layout."""
+        layout = self.layout
+        self.canvas.delete("all")
+        self.node_items = {}
+        self.edge_items = []
+        self.highlighted = ([], [])
+        self.canvas.update_idletasks()
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        scale = min(1.0, width / max(layout.width, 1), height / max(layout.height, 1))
+
+        for edge in layout.edges:
+            coords = [c * scale for point in edge.points for c in point]
+            line = self.canvas.create_line(
+                *coords, smooth=True, arrow=tk.LAST, fill="black", width=1
+            )
+            text = None
+            if edge.label is not None:
+                lx, ly = edge.label_pos
+                text = self.canvas.create_text(
+                    lx * scale, ly * scale, text=edge.label, fill="black"
+                )
+            self.edge_items.append((line, text))
+
+        for name, node in layout.nodes.items():
+            if node.shape == "none":
+                continue
+            x, y = node.x * scale, node.y * scale
+            rx, ry = node.width * scale / 2, node.height * scale / 2
+            ovals = [self.canvas.create_oval(
+                x - rx, y - ry, x + rx, y + ry, fill="white", outline="black"
+            )]
+            if node.shape == "doublecircle":
+                inset = 4 * scale
+                ovals.append(self.canvas.create_oval(
+                    x - rx + inset, y - ry + inset, x + rx - inset, y + ry - inset,
+                    outline="black"
+                ))
+            self.canvas.create_text(x, y, text=name)
+            self.node_items[name] = ovals
+
+    def _apply_highlight(self, highlight_edges, highlight_nodes):
+        """Recolor only the items whose highlight changed; no layout or raster work."""
+        old_edges, old_nodes = self.highlighted
+        for i in old_edges:
+            line, text = self.edge_items[i]
+            self.canvas.itemconfig(line, fill="black", width=1)
+            if text is not None:
+                self.canvas.itemconfig(text, fill="black")
+        for name in old_nodes:
+            self.canvas.itemconfig(self.node_items[name][0], fill="white")
+
+        edges = []
+        for key in highlight_edges or ():
+            i = self.layout.edge_index.get(tuple(key))
+            if i is None:
+                continue
+            line, text = self.edge_items[i]
+            self.canvas.itemconfig(line, fill="red", width=2)
+            if text is not None:
+                self.canvas.itemconfig(text, fill="red")
+            edges.append(i)
+        nodes = [name for name in highlight_nodes or () if name in self.node_items]
+        for name in nodes:
+            self.canvas.itemconfig(self.node_items[name][0], fill="lightpink")
+        self.highlighted = (edges, nodes)
 
 
 def main():
     root = ttk.Window(themename="flatly")
-    AutomataApp(root)
+    app = AutomataApp(root)
     root.protocol("WM_DELETE_WINDOW", root.quit)
     try:
         root.mainloop()
     finally:
+        app.cancel_event.set()
+        app.executor.shutdown(wait=False)
         root.destroy()
 
 